@@ -17,7 +17,7 @@ def create_app(config_name='default'):
     migrate.init_app(app, db)
     
     # Importar modelos para que o Flask-Migrate os reconheça
-    from app.infrastructure.database.models import PublicacaoModel
+    from app.infrastructure.database.models import PublicacaoModel, ScrapeRunModel
     
     api = Api(
         app,
@@ -31,6 +31,16 @@ def create_app(config_name='default'):
     from app.presentation.routes import register_namespaces
     register_namespaces(api)
     
+    if app.config.get('METRICS_ENABLED', True):
+        from app.infrastructure.metrics import render_latest
+        
+        def metrics_endpoint():
+            body, content_type = render_latest()
+            return body, 200, {'Content-Type': content_type}
+        
+        # Fora do prefixo /api e da documentação Swagger: é consumido pelo Prometheus
+        app.add_url_rule('/metrics', 'metrics', metrics_endpoint)
+    
     return app
 
 def make_celery(app):
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+@dataclass
+class ScrapeRun:
+    data_inicio: datetime
+    data_fim: datetime
+    status: str = "em_andamento"
+    caderno: Optional[str] = None
+    consulta: Optional[str] = None
+    total_extraido: int = 0
+    novas: int = 0
+    existentes: int = 0
+    erros: int = 0
+    paginas_com_falha: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    id: Optional[int] = None
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+from app.domain.entities.publicacao import Publicacao
+
+@dataclass
+class PublicacaoSearchHit:
+    publicacao: Publicacao
+    rank: float
+    trecho: str
@@ -0,0 +1,10 @@
+from dataclasses import dataclass, field
+from typing import List
+from app.domain.entities.publicacao import Publicacao
+
+@dataclass
+class UpsertResult:
+    novas: List[Publicacao] = field(default_factory=list)
+    atualizadas: List[Publicacao] = field(default_factory=list)
+    existentes: int = 0
+    erros: int = 0
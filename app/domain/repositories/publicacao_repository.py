@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 from app.domain.entities.publicacao import Publicacao
+from app.domain.entities.upsert_result import UpsertResult
+from app.domain.entities.search_hit import PublicacaoSearchHit
 
 class PublicacaoRepository(ABC):
     
@@ -8,14 +11,44 @@ class PublicacaoRepository(ABC):
     def create(self, publicacao: Publicacao) -> Publicacao:
         pass
     
+    @abstractmethod
+    def create_many(self, publicacoes: List[Publicacao]) -> UpsertResult:
+        """Insere o lote em uma transação, ignorando processos já existentes"""
+        pass
+    
+    @abstractmethod
+    def upsert_many(self, publicacoes: List[Publicacao]) -> UpsertResult:
+        """Insere o lote em uma transação, atualizando processos já existentes"""
+        pass
+    
     @abstractmethod
     def find_by_id(self, id: int) -> Optional[Publicacao]:
         pass
     
+    @abstractmethod
+    def find_updated_at(self, id: int) -> Optional[datetime]:
+        """updated_at da publicação, sem carregar a linha inteira (None se não existir)"""
+        pass
+    
+    @abstractmethod
+    def collection_version(self, status: str = None) -> str:
+        """Identificador que muda sempre que as publicações do status (ou todas) mudam"""
+        pass
+    
     @abstractmethod
     def find_by_numero_processo(self, numero_processo: str) -> Optional[Publicacao]:
         pass
     
+    @abstractmethod
+    def find_existing_numeros_processo(self, numeros_processo: Iterable[str]) -> Set[str]:
+        """Subconjunto dos números de processo que já estão armazenados"""
+        pass
+    
+    @abstractmethod
+    def iter_numeros_processo(self, batch_size: int = 10000) -> Iterator[str]:
+        """Percorre todos os números de processo armazenados, sem carregar as publicações"""
+        pass
+    
     @abstractmethod
     def find_all(self) -> List[Publicacao]:
         pass
@@ -24,6 +57,22 @@ class PublicacaoRepository(ABC):
     def find_by_status(self, status: str) -> List[Publicacao]:
         pass
     
+    @abstractmethod
+    def find_page(self, status: str = None, limit: int = 50, cursor: str = None) -> Tuple[List[Publicacao], Optional[str]]:
+        """Página ordenada por (created_at, id) decrescente e o cursor da próxima (None na última)"""
+        pass
+    
+    @abstractmethod
+    def find_projection(self, columns: Sequence[str], status: str = None, search: str = None,
+                        limit: int = None, offset: int = None, cursor: str = None) -> Tuple[List[Any], Optional[str]]:
+        """Lista só as colunas pedidas, como linhas leves; retorna (linhas, próximo cursor)"""
+        pass
+    
+    @abstractmethod
+    def search(self, search_term: str, status: str = None, limit: int = 50) -> List[PublicacaoSearchHit]:
+        """Busca textual ordenada por relevância, com trechos destacados"""
+        pass
+    
     @abstractmethod
     def update(self, publicacao: Publicacao) -> Publicacao:
         pass
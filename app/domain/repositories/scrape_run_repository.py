@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Tuple
+from app.domain.entities.scrape_run import ScrapeRun
+
+class ScrapeRunRepository(ABC):
+    
+    @abstractmethod
+    def start(self, data_inicio: datetime, data_fim: datetime, caderno: str = None, consulta: str = None) -> ScrapeRun:
+        pass
+    
+    @abstractmethod
+    def finish(self, run_id: int, status: str, resumo: dict, paginas_com_falha: int = 0) -> ScrapeRun:
+        pass
+    
+    @abstractmethod
+    def find_completed_ranges(self, data_inicio: datetime, data_fim: datetime, caderno: str = None,
+                              consulta: str = None) -> List[Tuple[datetime, datetime]]:
+        """Intervalos concluídos; com caderno/consulta, só os daquela pesquisa"""
+        pass
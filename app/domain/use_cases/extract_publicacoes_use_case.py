@@ -1,47 +1,135 @@
-from typing import List
+from typing import List, Dict, Any
 import logging
 from datetime import datetime
 from app.domain.entities.publicacao import Publicacao
 from app.domain.repositories.publicacao_repository import PublicacaoRepository
+from app.domain.repositories.scrape_run_repository import ScrapeRunRepository
 from app.infrastructure.scraping.dje_scraper import DJEScraper
+from app.infrastructure.scraping.scraper_factory import create_dje_scraper
+from app.infrastructure.scraping.checkpoint_store import CheckpointStore
+from app.infrastructure.repositories.cached_publicacao_repository import PublicacaoReadCache
+from app.infrastructure import metrics
 
 class ExtractPublicacoesUseCase:
     
-    def __init__(self, publicacao_repository: PublicacaoRepository, dje_scraper: DJEScraper):
+    def __init__(self, publicacao_repository: PublicacaoRepository, dje_scraper: DJEScraper = None,
+                 checkpoint_store: CheckpointStore = None, scrape_run_repository: ScrapeRunRepository = None,
+                 read_cache: PublicacaoReadCache = None, registrar_processos: bool = False):
         self.publicacao_repository = publicacao_repository
-        self.dje_scraper = dje_scraper
+        # Sem scraper explícito, usa o motor definido em SCRAPER_ENGINE
+        self.dje_scraper = dje_scraper or create_dje_scraper()
+        self.checkpoint_store = checkpoint_store
+        self.scrape_run_repository = scrape_run_repository
+        self.read_cache = read_cache
+        # Guardar os números de processo vistos é opcional: numa janela longa o conjunto cresce com ela
+        self.registrar_processos = registrar_processos
+        self.resumo = {}
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     
-    def execute(self, data_inicio: datetime, data_fim: datetime) -> List[Publicacao]:
+    def execute(self, data_inicio: datetime, data_fim: datetime) -> Dict[str, int]:
+        """
+        Extrai e persiste página a página, sem acumular as publicações em
+        memória. Retorna o resumo (total_extraido, novas, existentes, erros).
+        """
         logging.info(f"Iniciando extração de publicações de {data_inicio.strftime('%d/%m/%Y')} até {data_fim.strftime('%d/%m/%Y')}")
         
-        publicacoes_extraidas = self.dje_scraper.extrair_publicacoes(data_inicio, data_fim)
-        logging.info(f"Total de publicações extraídas: {len(publicacoes_extraidas)}")
+        self._novas = 0
+        self.numeros_processo = set()
+        self._total_extraido = 0
+        self._publicacoes_existentes = 0
+        self._erros_salvamento = 0
         
-        publicacoes_salvas = []
-        publicacoes_existentes = 0
-        erros_salvamento = 0
+        run = None
+        if self.scrape_run_repository:
+            run = self.scrape_run_repository.start(data_inicio, data_fim, *self._consulta())
         
+        try:
+            with metrics.stage('extracao'):
+                if self.checkpoint_store is None:
+                    # Cada página é persistida assim que chega, sem esperar o período inteiro
+                    for _, publicacoes in self.dje_scraper.iterar_paginas(data_inicio, data_fim):
+                        self._persistir(publicacoes)
+                    logging.info(f"Total de publicações extraídas: {self._total_extraido}")
+                else:
+                    self._executar_com_checkpoint(data_inicio, data_fim)
+        except Exception:
+            if run:
+                self.scrape_run_repository.finish(run.id, 'falha', self._montar_resumo(), self._paginas_com_falha())
+            raise
+        
+        self.resumo = self._montar_resumo()
+        metrics.count_publicacoes('conhecida', self._processos_conhecidos())
+        logging.info(self.formatar_resumo(self.resumo))
+        
+        if run:
+            # Só períodos sem páginas nem salvamentos com falha contam como ingeridos
+            paginas_com_falha = self._paginas_com_falha()
+            status = 'completo' if not paginas_com_falha and not self._erros_salvamento else 'incompleto'
+            self.scrape_run_repository.finish(run.id, status, self.resumo, paginas_com_falha)
+        
+        return self.resumo
+    
+    def _montar_resumo(self) -> dict:
+        # Processos que o scraper já reconheceu como armazenados nem chegam a _persistir
+        conhecidos = self._processos_conhecidos()
+        return {
+            'total_extraido': self._total_extraido + conhecidos,
+            'novas': self._novas,
+            'existentes': self._publicacoes_existentes + conhecidos,
+            'erros': self._erros_salvamento
+        }
+    
+    def _paginas_com_falha(self) -> int:
+        return len(getattr(self.dje_scraper, 'paginas_com_falha', None) or [])
+    
+    def _processos_conhecidos(self) -> int:
+        conhecidos = getattr(self.dje_scraper, 'processos_conhecidos', None)
+        if not isinstance(conhecidos, list):
+            return 0
+        if self.registrar_processos:
+            self.numeros_processo.update(conhecidos)
+        return len(conhecidos)
+    
+    def _consulta(self) -> tuple:
+        """(caderno, consulta) que o scraper vai pesquisar"""
+        return getattr(self.dje_scraper, 'caderno', ''), getattr(self.dje_scraper, 'query', '')
+    
+    def _executar_com_checkpoint(self, data_inicio: datetime, data_fim: datetime):
+        """Persiste página a página e retoma a partir da última página persistida"""
+        key = CheckpointStore.make_key(data_inicio, data_fim, *self._consulta())
+        pagina_inicial = self.checkpoint_store.last_page(key) + 1
+        if pagina_inicial > 1:
+            logging.info(f"Checkpoint encontrado: retomando a extração a partir da página {pagina_inicial}")
+        
+        # O checkpoint só avança sobre páginas contíguas, para que uma página
+        # com falha no meio do caminho seja refeita no próximo retry
+        proxima_pagina = pagina_inicial
+        
+        for page_num, publicacoes in self.dje_scraper.iterar_paginas(data_inicio, data_fim, pagina_inicial=pagina_inicial):
+            self._persistir(publicacoes)
+            if page_num == proxima_pagina:
+                self.checkpoint_store.save_page(key, page_num)
+                proxima_pagina += 1
+        logging.info(f"Total de publicações extraídas: {self._total_extraido}")
+        
+        if getattr(self.dje_scraper, 'paginas_com_falha', None):
+            logging.warning(f"Extração incompleta, checkpoint mantido na página {proxima_pagina - 1}")
+        else:
+            self.checkpoint_store.clear(key)
+    
+    def _persistir(self, publicacoes_extraidas: List[Dict[str, Any]]):
+        """Persiste a página inteira com um único INSERT ... ON CONFLICT DO NOTHING"""
+        self._total_extraido += len(publicacoes_extraidas)
+        
+        publicacoes = []
         for idx, publicacao_data in enumerate(publicacoes_extraidas, 1):
+            if not publicacao_data.get('numero_processo'):
+                logging.warning(f"Publicação {idx} ignorada: número do processo não encontrado")
+                continue
+            if self.registrar_processos:
+                self.numeros_processo.add(publicacao_data['numero_processo'])
             try:
-                logging.info(f"Processando publicação {idx}/{len(publicacoes_extraidas)}")
-                
-                if not publicacao_data.get('numero_processo'):
-                    logging.warning(f"Publicação {idx} ignorada: número do processo não encontrado")
-                    continue
-                
-                publicacao_existente = self.publicacao_repository.find_by_numero_processo(
-                    publicacao_data['numero_processo']
-                )
-                
-                if publicacao_existente:
-                    logging.info(f"Publicação já existe no banco: {publicacao_data['numero_processo']}")
-                    publicacoes_existentes += 1
-                    continue
-                
-                logging.info(f"Criando nova publicação: {publicacao_data['numero_processo']}")
-                
-                publicacao = Publicacao(
+                publicacoes.append(Publicacao(
                     numero_processo=publicacao_data['numero_processo'],
                     data_disponibilizacao=publicacao_data['data_disponibilizacao'],
                     autores=publicacao_data['autores'],
@@ -51,26 +139,41 @@ class ExtractPublicacoesUseCase:
                     valor_principal_liquido=publicacao_data.get('valor_principal_liquido'),
                     valor_juros_moratorios=publicacao_data.get('valor_juros_moratorios'),
                     honorarios_advocaticios=publicacao_data.get('honorarios_advocaticios')
-                )
-                
-                try:
-                    publicacao_salva = self.publicacao_repository.create(publicacao)
-                    publicacoes_salvas.append(publicacao_salva)
-                    logging.info(f"✅ Publicação salva com sucesso: {publicacao_data['numero_processo']}")
-                except Exception as e:
-                    erros_salvamento += 1
-                    logging.error(f"❌ Erro ao salvar publicação {publicacao_data['numero_processo']}: {str(e)}")
-                
+                ))
             except Exception as e:
-                erros_salvamento += 1
+                self._erros_salvamento += 1
+                metrics.count_publicacoes('erro')
                 logging.error(f"❌ Erro ao processar publicação {idx}: {str(e)}")
         
-        logging.info(f"""
-Resumo da extração:
-- Total extraído: {len(publicacoes_extraidas)}
-- Novas publicações salvas: {len(publicacoes_salvas)}
-- Publicações já existentes: {publicacoes_existentes}
-- Erros de salvamento: {erros_salvamento}
-""")
+        if not publicacoes:
+            return
+        
+        try:
+            with metrics.stage('persistencia'):
+                resultado = self.publicacao_repository.create_many(publicacoes)
+        except Exception as e:
+            self._erros_salvamento += len(publicacoes)
+            metrics.count_publicacoes('erro', len(publicacoes))
+            logging.error(f"❌ Erro ao salvar lote de {len(publicacoes)} publicações: {str(e)}")
+            return
         
-        return publicacoes_salvas 
\ No newline at end of file
+        self._novas += len(resultado.novas)
+        if self.read_cache and resultado.novas:
+            # Novas entram como 'nova': a API passa a ver cada lote assim que ele é salvo
+            self.read_cache.invalidate({pub.status for pub in resultado.novas})
+        self._publicacoes_existentes += resultado.existentes
+        self._erros_salvamento += resultado.erros
+        metrics.count_publicacoes('nova', len(resultado.novas))
+        metrics.count_publicacoes('existente', resultado.existentes)
+        metrics.count_publicacoes('erro', resultado.erros)
+        logging.info(f"✅ Lote salvo: {len(resultado.novas)} novas, {resultado.existentes} existentes, {resultado.erros} erros")
+    
+    @staticmethod
+    def formatar_resumo(resumo: dict) -> str:
+        return f"""
+Resumo da extração:
+- Total extraído: {resumo['total_extraido']}
+- Novas publicações salvas: {resumo['novas']}
+- Publicações já existentes: {resumo['existentes']}
+- Erros de salvamento: {resumo['erros']}
+"""
@@ -0,0 +1,33 @@
+from sqlalchemy import DDL, event
+
+# Configuração de busca textual: dicionário português com remoção de acentos
+TS_CONFIG = 'juscash_pt'
+
+# Número do processo pesa mais que as partes, que pesam mais que o corpo da publicação
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{TS_CONFIG}'::regconfig, coalesce(numero_processo, '')), 'A') || "
+    f"setweight(to_tsvector('{TS_CONFIG}'::regconfig, coalesce(autores, '') || ' ' || coalesce(advogados, '')), 'B') || "
+    f"setweight(to_tsvector('{TS_CONFIG}'::regconfig, coalesce(conteudo_completo, '')), 'C')"
+)
+
+# Com regconfig explícito o to_tsvector é imutável e pode alimentar uma coluna gerada,
+# o que não acontece chamando unaccent() direto na expressão
+CREATE_TS_CONFIG_SQL = f"""
+CREATE EXTENSION IF NOT EXISTS unaccent;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{TS_CONFIG}') THEN
+        CREATE TEXT SEARCH CONFIGURATION {TS_CONFIG} (COPY = portuguese);
+        ALTER TEXT SEARCH CONFIGURATION {TS_CONFIG}
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+    END IF;
+END
+$$;
+"""
+
+# Opções do ts_headline para os trechos destacados da busca
+HEADLINE_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=" … "'
+
+def register_ddl(table):
+    """Garante a configuração de busca antes do db.create_all() criar a tabela (testes e setup-database)"""
+    event.listen(table, 'before_create', DDL(CREATE_TS_CONFIG_SQL).execute_if(dialect='postgresql'))
@@ -1,7 +1,9 @@
 from app import db
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy import text
+from sqlalchemy.orm import deferred
+from app.infrastructure.database.full_text import SEARCH_VECTOR_SQL, register_ddl
 import uuid
 import os
 
@@ -21,12 +23,18 @@ class PublicacaoModel(db.Model):
     honorarios_advocaticios = db.Column(db.Numeric(12, 2), nullable=True)
     reu = db.Column(db.String(255), nullable=False, default="Instituto Nacional do Seguro Social - INSS", index=True)
     status = db.Column(db.String(20), nullable=False, default="nova", index=True)
-    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow, index=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Gerada pelo banco e só lida nas buscas; deferred para não trafegar nas demais consultas
+    search_vector = deferred(db.Column(TSVECTOR, db.Computed(SEARCH_VECTOR_SQL, persisted=True)))
     
     # Apenas índices básicos no modelo - GIN será criado separadamente pelo create-tables.py
     __table_args__ = (
         db.Index('idx_publicacoes_status_data', 'status', 'data_disponibilizacao'),
+        # Paginação por cursor (created_at, id), com e sem filtro de status
+        db.Index('idx_publicacoes_created_at_id', 'created_at', 'id'),
+        db.Index('idx_publicacoes_status_created_at_id', 'status', 'created_at', 'id'),
+        db.Index('idx_publicacoes_search_vector', 'search_vector', postgresql_using='gin'),
         db.CheckConstraint("status IN ('nova', 'lida', 'processada')", name='chk_status'),
     )
     
@@ -51,4 +59,31 @@ class PublicacaoModel(db.Model):
             'status': self.status,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
-        } 
\ No newline at end of file
+        } 
+
+register_ddl(PublicacaoModel.__table__)
+
+class ScrapeRunModel(db.Model):
+    __tablename__ = 'scrape_runs'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    data_inicio = db.Column(db.DateTime, nullable=False)
+    data_fim = db.Column(db.DateTime, nullable=False)
+    caderno = db.Column(db.String(10), nullable=True)
+    consulta = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default="em_andamento", index=True)
+    total_extraido = db.Column(db.Integer, nullable=False, default=0)
+    novas = db.Column(db.Integer, nullable=False, default=0)
+    existentes = db.Column(db.Integer, nullable=False, default=0)
+    erros = db.Column(db.Integer, nullable=False, default=0)
+    paginas_com_falha = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        db.Index('idx_scrape_runs_status_periodo', 'status', 'data_inicio', 'data_fim'),
+        db.CheckConstraint("status IN ('em_andamento', 'completo', 'incompleto', 'falha')", name='chk_scrape_runs_status'),
+    )
+    
+    def __repr__(self):
+        return f'<ScrapeRun {self.data_inicio} - {self.data_fim} ({self.status})>'
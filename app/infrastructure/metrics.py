@@ -0,0 +1,148 @@
+import os
+import time
+import logging
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+        multiprocess, start_http_server
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:  # prometheus_client é opcional: sem ele as métricas viram no-op
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Etapas lentas do DJE (driver, esperas, PDF) passam de minutos; as de parsing ficam em milissegundos
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+LABELS = ('stage', 'task', 'shard')
+
+if PROMETHEUS_AVAILABLE:
+    STAGE_SECONDS = Histogram(
+        'juscash_scraping_stage_seconds', 'Duração de cada etapa do scraping', LABELS, buckets=STAGE_BUCKETS
+    )
+    STAGE_ERRORS = Counter(
+        'juscash_scraping_stage_errors_total', 'Etapas do scraping que terminaram em erro ou timeout', LABELS
+    )
+    PUBLICACOES = Counter(
+        'juscash_scraping_publicacoes_total', 'Publicações processadas por resultado', ('resultado', 'task', 'shard')
+    )
+    PAGINAS = Counter(
+        'juscash_scraping_paginas_total', 'Páginas de resultados processadas', ('status', 'task', 'shard')
+    )
+    DRIVER_LEASES = Counter(
+        'juscash_driver_pool_leases_total', 'Empréstimos do pool de drivers do Chrome por resultado', ('resultado',)
+    )
+    DRIVER_EVENTS = Counter(
+        'juscash_driver_pool_drivers_total', 'Drivers do Chrome criados, reciclados ou descartados pelo pool', ('evento',)
+    )
+    DRIVER_STARTUP_SECONDS = Histogram(
+        'juscash_driver_pool_startup_seconds', 'Tempo de inicialização de um driver do Chrome',
+        buckets=(0.5, 1, 2, 3, 5, 10, 20, 30, 60, 120)
+    )
+    # Taxa de acerto: rate(...{resultado="hit"}) / rate(...) por leitura
+    CACHE = Counter(
+        'juscash_cache_requests_total', 'Leituras do cache de publicações por resultado', ('leitura', 'resultado')
+    )
+
+# Rótulos da extração em execução, por contexto: extrações concorrentes no mesmo
+# processo (threads da API, worker com pool de threads) não se misturam. Os pools
+# de páginas e de PDFs copiam o contexto de quem submete o trabalho.
+_current = contextvars.ContextVar('juscash_metric_labels', default={'task': '', 'shard': ''})
+
+def current_labels() -> Dict[str, str]:
+    return dict(_current.get())
+
+def shard_label(data_inicio, data_fim) -> str:
+    """Rótulo da fatia de datas: um dia ('2024-10-01') ou intervalo ('2024-10-01_2024-10-07')"""
+    inicio, fim = data_inicio.strftime('%Y-%m-%d'), data_fim.strftime('%Y-%m-%d')
+    return inicio if inicio == fim else f"{inicio}_{fim}"
+
+@contextmanager
+def task_labels(task: str, shard: str = ''):
+    """Rotula as métricas emitidas dentro do bloco com a task e a fatia de datas"""
+    token = _current.set({'task': task, 'shard': shard or ''})
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+def observe_stage(stage: str, seconds: float, erro: bool = False):
+    if not PROMETHEUS_AVAILABLE:
+        return
+    labels = current_labels()
+    STAGE_SECONDS.labels(stage=stage, **labels).observe(seconds)
+    if erro:
+        STAGE_ERRORS.labels(stage=stage, **labels).inc()
+
+@contextmanager
+def stage(name: str):
+    """Mede a duração de uma etapa; exceções contam como erro da etapa e são propagadas"""
+    inicio = time.perf_counter()
+    erro = False
+    try:
+        yield
+    except BaseException:
+        erro = True
+        raise
+    finally:
+        observe_stage(name, time.perf_counter() - inicio, erro)
+
+def count_publicacoes(resultado: str, quantidade: int = 1):
+    if PROMETHEUS_AVAILABLE and quantidade:
+        PUBLICACOES.labels(resultado=resultado, **current_labels()).inc(quantidade)
+
+def count_pagina(status: str = 'ok'):
+    if PROMETHEUS_AVAILABLE:
+        PAGINAS.labels(status=status, **current_labels()).inc()
+
+def count_driver_lease(resultado: str):
+    """resultado: hit (driver ocioso reaproveitado) ou miss (driver novo)"""
+    if PROMETHEUS_AVAILABLE:
+        DRIVER_LEASES.labels(resultado=resultado).inc()
+
+def count_driver(evento: str):
+    if PROMETHEUS_AVAILABLE:
+        DRIVER_EVENTS.labels(evento=evento).inc()
+
+def observe_driver_startup(seconds: float):
+    if PROMETHEUS_AVAILABLE:
+        DRIVER_STARTUP_SECONDS.observe(seconds)
+
+def count_cache(leitura: str, resultado: str):
+    """resultado: hit, miss ou erro (Redis indisponível, leitura feita no banco)"""
+    if PROMETHEUS_AVAILABLE:
+        CACHE.labels(leitura=leitura, resultado=resultado).inc()
+
+def _registry():
+    # Com PROMETHEUS_MULTIPROC_DIR, agrega os arquivos de todos os processos (gunicorn/prefork)
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+def render_latest():
+    """(corpo, content-type) no formato texto do Prometheus"""
+    if not PROMETHEUS_AVAILABLE:
+        return b'# prometheus_client nao instalado\n', CONTENT_TYPE_LATEST
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+def start_exporter(port: int, addr: str = '0.0.0.0') -> bool:
+    """Servidor HTTP de métricas para processos sem Flask (workers do Celery)"""
+    if not PROMETHEUS_AVAILABLE:
+        logging.info("prometheus_client não instalado: exporter de métricas desabilitado")
+        return False
+    try:
+        start_http_server(port, addr=addr, registry=_registry())
+    except OSError as e:
+        logging.warning(f"Não foi possível iniciar o exporter de métricas na porta {port}: {e}")
+        return False
+    logging.info(f"Exporter de métricas ouvindo em {addr}:{port}")
+    return True
+
+def mark_process_dead(pid: Optional[int] = None):
+    if PROMETHEUS_AVAILABLE and os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid or os.getpid())
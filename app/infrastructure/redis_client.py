@@ -0,0 +1,20 @@
+import os
+import threading
+import redis
+from flask import current_app, has_app_context
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_redis_url() -> str:
+    if has_app_context() and current_app.config.get('REDIS_URL'):
+        return current_app.config['REDIS_URL']
+    return os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+
+def get_redis(url: str = None) -> redis.Redis:
+    """Cliente Redis compartilhado por URL (o pool de conexões é reaproveitado)"""
+    url = url or get_redis_url()
+    with _clients_lock:
+        if url not in _clients:
+            _clients[url] = redis.from_url(url, socket_connect_timeout=5, socket_timeout=5)
+        return _clients[url]
@@ -0,0 +1,274 @@
+import json
+import time
+import zlib
+import hashlib
+import logging
+from dataclasses import asdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import redis
+from flask import current_app, has_app_context
+from app.domain.entities.publicacao import Publicacao
+from app.domain.entities.search_hit import PublicacaoSearchHit
+from app.domain.entities.upsert_result import UpsertResult
+from app.domain.repositories.publicacao_repository import PublicacaoRepository
+from app.infrastructure import metrics
+
+# Escopo das listagens sem filtro de status e das estatísticas
+TODAS = 'todas'
+
+class PublicacaoReadCache:
+    """
+    Cache de leitura das publicações no Redis. Listagens e estatísticas são
+    gravadas sob a versão do seu escopo (um status ou 'todas'): uma escrita
+    só incrementa a versão dos escopos que afetou e as chaves antigas expiram
+    pelo TTL. Publicações individuais são apagadas pelo id.
+    """
+
+    KEY_PREFIX = 'juscash:cache:publicacoes'
+    # Valores maiores que isso são gravados comprimidos (listas com conteúdo completo)
+    COMPRESS_MIN_BYTES = 1024
+    DATETIME_FIELDS = frozenset(('data_disponibilizacao', 'created_at', 'updated_at'))
+    DECIMAL_FIELDS = frozenset(('valor_principal_bruto', 'valor_principal_liquido', 'valor_juros_moratorios', 'honorarios_advocaticios'))
+
+    def __init__(self, redis_client: redis.Redis, ttl: int = 300):
+        self.redis = redis_client
+        self.ttl = ttl
+
+    def _version_key(self, scope: str) -> str:
+        return f"{self.KEY_PREFIX}:versao:{scope}"
+
+    def _id_key(self, id: int) -> str:
+        return f"{self.KEY_PREFIX}:id:{id}"
+
+    def scope_version(self, scope: str) -> Optional[int]:
+        """Versão atual do escopo (None se o Redis falhar)"""
+        key = self._version_key(scope)
+        try:
+            versao = self.redis.get(key)
+            if versao is None:
+                # Começa do relógio, não do zero: após um flush do Redis as versões não se repetem
+                self.redis.set(key, time.time_ns(), nx=True)
+                versao = self.redis.get(key)
+            return int(versao)
+        except redis.RedisError as e:
+            logging.warning(f"Cache de publicações indisponível: {e}")
+            return None
+
+    def _versioned_key(self, kind: str, scope: str, shape: Any = None) -> Optional[str]:
+        """Chave com a versão atual do escopo e um hash do formato da consulta (None se o Redis falhar)"""
+        versao = self.scope_version(scope)
+        if versao is None:
+            return None
+        digest = hashlib.blake2b(json.dumps(shape, separators=(',', ':')).encode('utf-8'), digest_size=8).hexdigest()
+        return f"{self.KEY_PREFIX}:{kind}:{scope}:{versao}:{digest}"
+
+    def _dumps(self, value) -> bytes:
+        raw = json.dumps(value, separators=(',', ':'), default=self._encode_value).encode('utf-8')
+        # Primeiro byte indica o formato: 'z' comprimido, 'j' JSON puro
+        if len(raw) >= self.COMPRESS_MIN_BYTES:
+            return b'z' + zlib.compress(raw)
+        return b'j' + raw
+
+    @staticmethod
+    def _loads(raw: bytes):
+        if raw[:1] == b'z':
+            return json.loads(zlib.decompress(raw[1:]))
+        return json.loads(raw[1:])
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        raise TypeError(f"Tipo não serializável no cache: {type(value).__name__}")
+
+    def _decode_value(self, field: str, value):
+        if value is None:
+            return None
+        if field in self.DATETIME_FIELDS:
+            return datetime.fromisoformat(value)
+        if field in self.DECIMAL_FIELDS and isinstance(value, str):
+            return Decimal(value)
+        return value
+
+    def read(self, leitura: str, key: Optional[str], loader: Callable, encode: Callable, decode: Callable):
+        """Read-through: devolve do cache ou carrega do banco e grava; falhas do Redis caem no banco"""
+        if key is None:
+            metrics.count_cache(leitura, 'erro')
+            return loader()
+        try:
+            raw = self.redis.get(key)
+        except redis.RedisError as e:
+            logging.warning(f"Cache de publicações indisponível: {e}")
+            metrics.count_cache(leitura, 'erro')
+            return loader()
+        if raw is not None:
+            metrics.count_cache(leitura, 'hit')
+            return decode(self._loads(raw))
+
+        metrics.count_cache(leitura, 'miss')
+        value = loader()
+        if value is not None:
+            try:
+                self.redis.set(key, self._dumps(encode(value)), ex=self.ttl)
+            except redis.RedisError as e:
+                logging.warning(f"Não foi possível gravar no cache de publicações: {e}")
+        return value
+
+    def get_publicacao(self, id: int, loader: Callable[[], Optional[Publicacao]]) -> Optional[Publicacao]:
+        return self.read('publicacao', self._id_key(id), loader, asdict, lambda data: Publicacao(**{
+            field: self._decode_value(field, value) for field, value in data.items()
+        }))
+
+    def get_stats(self, loader: Callable[[], dict]) -> dict:
+        return self.read('stats', self._versioned_key('stats', TODAS), loader, dict, dict)
+
+    def get_projection(self, shape: dict, loader: Callable[[], Tuple[List[Any], Optional[str]]]) -> Tuple[List[Any], Optional[str]]:
+        # Colunas gravadas uma vez por lista, não em cada linha
+        columns = list(shape['columns'])
+
+        def encode(result):
+            rows, next_cursor = result
+            nomes = list(rows[0].keys()) if rows else columns
+            return {'c': nomes, 'r': [[row[nome] for nome in nomes] for row in rows], 'n': next_cursor}
+
+        def decode(data):
+            rows = [
+                {nome: self._decode_value(nome, value) for nome, value in zip(data['c'], valores)}
+                for valores in data['r']
+            ]
+            return rows, data['n']
+
+        key = self._versioned_key('lista', shape.get('status') or TODAS, shape)
+        return self.read('lista', key, loader, encode, decode)
+
+    def invalidate(self, statuses: Iterable[str] = (), ids: Iterable[int] = ()):
+        """Invalida as listagens dos status afetados (e as sem filtro, e as estatísticas) e as publicações dos ids"""
+        scopes = {status for status in statuses if status} | {TODAS}
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for scope in sorted(scopes):
+                pipe.set(self._version_key(scope), time.time_ns(), nx=True)
+                pipe.incr(self._version_key(scope))
+            for id in ids:
+                if id is not None:
+                    pipe.delete(self._id_key(id))
+            pipe.execute()
+        except redis.RedisError as e:
+            logging.warning(f"Falha ao invalidar o cache de publicações (dados antigos até o TTL de {self.ttl}s): {e}")
+
+
+class CachedPublicacaoRepository(PublicacaoRepository):
+    """Repositório com leituras da API (por id, estatísticas e listagem) servidas pelo cache e escritas que o invalidam"""
+
+    def __init__(self, repository: PublicacaoRepository, cache: PublicacaoReadCache):
+        self.repository = repository
+        self.cache = cache
+        # Versões do banco já lidas nesta requisição, por status
+        self._collection_versions = {}
+
+    def find_by_id(self, id: int) -> Optional[Publicacao]:
+        return self.cache.get_publicacao(id, lambda: self.repository.find_by_id(id))
+
+    def count_by_status(self) -> dict:
+        return self.cache.get_stats(self.repository.count_by_status)
+
+    def find_updated_at(self, id: int) -> Optional[datetime]:
+        return self.repository.find_updated_at(id)
+
+    def collection_version(self, status: str = None) -> str:
+        # Sempre do banco: escritas que não passam por este repositório também mudam a versão
+        self._collection_versions[status] = self.repository.collection_version(status)
+        return self._collection_versions[status]
+
+    def find_projection(self, columns: Sequence[str], status: str = None, search: str = None,
+                        limit: int = None, offset: int = None, cursor: str = None) -> Tuple[List[Any], Optional[str]]:
+        # A versão do banco entra na chave: a lista em cache corresponde ao ETag enviado junto
+        versao = self._collection_versions.get(status)
+        if versao is None:
+            versao = self.collection_version(status)
+        shape = {
+            'columns': list(columns), 'status': status, 'search': search,
+            'limit': limit, 'offset': offset, 'cursor': cursor, 'versao': versao
+        }
+        return self.cache.get_projection(shape, lambda: self.repository.find_projection(
+            columns, status=status, search=search, limit=limit, offset=offset, cursor=cursor
+        ))
+
+    def create(self, publicacao: Publicacao) -> Publicacao:
+        criada = self.repository.create(publicacao)
+        self.cache.invalidate([criada.status], [criada.id])
+        return criada
+
+    def create_many(self, publicacoes: List[Publicacao]) -> UpsertResult:
+        return self._invalidate_result(self.repository.create_many(publicacoes))
+
+    def upsert_many(self, publicacoes: List[Publicacao]) -> UpsertResult:
+        return self._invalidate_result(self.repository.upsert_many(publicacoes))
+
+    def _invalidate_result(self, resultado: UpsertResult) -> UpsertResult:
+        alteradas = resultado.novas + resultado.atualizadas
+        if alteradas:
+            self.cache.invalidate({pub.status for pub in alteradas}, [pub.id for pub in resultado.atualizadas])
+        return resultado
+
+    def update(self, publicacao: Publicacao) -> Publicacao:
+        # O status anterior sai do banco: a entidade recebida já vem alterada
+        anterior = self.repository.find_by_id(publicacao.id)
+        atualizada = self.repository.update(publicacao)
+        self.cache.invalidate([anterior.status if anterior else None, atualizada.status], [atualizada.id])
+        return atualizada
+
+    def delete(self, id: int) -> bool:
+        anterior = self.repository.find_by_id(id)
+        removida = self.repository.delete(id)
+        if removida:
+            self.cache.invalidate([anterior.status if anterior else None], [id])
+        return removida
+
+    def find_by_numero_processo(self, numero_processo: str) -> Optional[Publicacao]:
+        return self.repository.find_by_numero_processo(numero_processo)
+
+    def find_existing_numeros_processo(self, numeros_processo: Iterable[str]) -> Set[str]:
+        return self.repository.find_existing_numeros_processo(numeros_processo)
+
+    def iter_numeros_processo(self, batch_size: int = 10000) -> Iterator[str]:
+        return self.repository.iter_numeros_processo(batch_size)
+
+    def find_all(self, limit: int = None, offset: int = None) -> List[Publicacao]:
+        return self.repository.find_all(limit, offset)
+
+    def find_by_status(self, status: str, limit: int = None, offset: int = None) -> List[Publicacao]:
+        return self.repository.find_by_status(status, limit, offset)
+
+    def find_page(self, status: str = None, limit: int = 50, cursor: str = None) -> Tuple[List[Publicacao], Optional[str]]:
+        return self.repository.find_page(status, limit, cursor)
+
+    def search(self, search_term: str, status: str = None, limit: int = 50) -> List[PublicacaoSearchHit]:
+        return self.repository.search(search_term, status, limit)
+
+    def search_by_content(self, search_term: str, limit: int = 50) -> List[Publicacao]:
+        return self.repository.search_by_content(search_term, limit)
+
+    def find_by_date_range(self, data_inicio, data_fim, status: str = None) -> List[Publicacao]:
+        return self.repository.find_by_date_range(data_inicio, data_fim, status)
+
+
+def _config_value(key: str, default=None):
+    if has_app_context() and current_app.config.get(key) is not None:
+        return current_app.config.get(key)
+    return default
+
+def get_read_cache() -> Optional[PublicacaoReadCache]:
+    """Cache de leitura das publicações no Redis (None se desabilitado)"""
+    if not _config_value('PUBLICACAO_CACHE_ENABLED', False):
+        return None
+    from app.infrastructure.redis_client import get_redis
+    return PublicacaoReadCache(get_redis(), ttl=int(_config_value('PUBLICACAO_CACHE_TTL', 300)))
+
+def with_read_cache(repository: PublicacaoRepository) -> PublicacaoRepository:
+    cache = get_read_cache()
+    return CachedPublicacaoRepository(repository, cache) if cache else repository
@@ -0,0 +1,21 @@
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou adulterado"""
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Cursor opaco com a chave (created_at, id) da última linha entregue"""
+    raw = json.dumps([created_at.isoformat(), id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Cursor inválido: {cursor!r}") from e
@@ -1,12 +1,36 @@
-from typing import List, Optional
-from sqlalchemy import or_, and_, text
+import uuid
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import or_, and_, text, tuple_, func, literal
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 from app.domain.entities.publicacao import Publicacao
+from app.domain.entities.upsert_result import UpsertResult
+from app.domain.entities.search_hit import PublicacaoSearchHit
 from app.domain.repositories.publicacao_repository import PublicacaoRepository
 from app.infrastructure.database.models import PublicacaoModel
+from app.infrastructure.database.full_text import HEADLINE_OPTIONS, TS_CONFIG
+from app.infrastructure.repositories.keyset_cursor import decode_cursor, encode_cursor
 from app import db
 
 class SQLAlchemyPublicacaoRepository(PublicacaoRepository):
     
+    # Colunas sobrescritas no upsert; status fica de fora para não desfazer o andamento (lida, processada)
+    UPSERT_COLUMNS = (
+        'data_disponibilizacao', 'autores', 'advogados', 'conteudo_completo',
+        'valor_principal_bruto', 'valor_principal_liquido', 'valor_juros_moratorios',
+        'honorarios_advocaticios', 'reu', 'updated_at'
+    )
+    # Mantém cada INSERT bem abaixo do limite de 65535 parâmetros do PostgreSQL
+    BATCH_SIZE = 1000
+    # Colunas que podem ser pedidas em find_projection
+    PROJECTION_COLUMNS = (
+        'id', 'numero_processo', 'data_disponibilizacao', 'autores', 'advogados', 'conteudo_completo',
+        'valor_principal_bruto', 'valor_principal_liquido', 'valor_juros_moratorios',
+        'honorarios_advocaticios', 'reu', 'status', 'created_at', 'updated_at'
+    )
+    
     def create(self, publicacao: Publicacao) -> Publicacao:
         model = PublicacaoModel(
             numero_processo=publicacao.numero_processo,
@@ -27,16 +51,129 @@ class SQLAlchemyPublicacaoRepository(PublicacaoRepository):
         
         return self._model_to_entity(model)
     
+    def create_many(self, publicacoes: List[Publicacao]) -> UpsertResult:
+        return self._insert_many(publicacoes, atualizar=False)
+    
+    def upsert_many(self, publicacoes: List[Publicacao]) -> UpsertResult:
+        return self._insert_many(publicacoes, atualizar=True)
+    
+    def _insert_many(self, publicacoes: List[Publicacao], atualizar: bool) -> UpsertResult:
+        """
+        INSERT ... ON CONFLICT (numero_processo) ... RETURNING em uma única
+        transação. Se o lote falhar, refaz linha a linha em savepoints para
+        isolar as linhas com erro sem perder as demais.
+        """
+        resultado = UpsertResult()
+        if not publicacoes:
+            return resultado
+        
+        # O mesmo processo duas vezes no lote quebraria o ON CONFLICT DO UPDATE
+        agora = datetime.utcnow()
+        rows = {}
+        for publicacao in publicacoes:
+            rows[publicacao.numero_processo] = self._entity_to_row(publicacao, agora)
+        rows = list(rows.values())
+        resultado.existentes = len(publicacoes) - len(rows)
+        
+        try:
+            linhas = []
+            for inicio in range(0, len(rows), self.BATCH_SIZE):
+                linhas.extend(db.session.execute(self._insert_statement(rows[inicio:inicio + self.BATCH_SIZE], atualizar)).fetchall())
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.warning(f"Falha no insert em lote de {len(rows)} publicações, refazendo linha a linha: {e}")
+            linhas = []
+            for row in rows:
+                try:
+                    with db.session.begin_nested():
+                        linhas.extend(db.session.execute(self._insert_statement([row], atualizar)).fetchall())
+                except SQLAlchemyError as e:
+                    resultado.erros += 1
+                    logging.error(f"Erro ao salvar publicação {row['numero_processo']}: {e}")
+            db.session.commit()
+        
+        for linha in linhas:
+            # Linhas inseridas agora têm created_at == updated_at; no upsert, as atualizadas não
+            if linha.created_at == linha.updated_at:
+                resultado.novas.append(self._model_to_entity(linha))
+            else:
+                resultado.atualizadas.append(self._model_to_entity(linha))
+        resultado.existentes += len(rows) - resultado.erros - len(linhas)
+        return resultado
+    
+    def _insert_statement(self, rows: List[Dict[str, Any]], atualizar: bool):
+        table = PublicacaoModel.__table__
+        stmt = pg_insert(table).values(rows)
+        if atualizar:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['numero_processo'],
+                set_={coluna: stmt.excluded[coluna] for coluna in self.UPSERT_COLUMNS}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=['numero_processo'])
+        # search_vector é gerado pelo banco e não é usado na resposta
+        return stmt.returning(*(coluna for coluna in table.c if coluna.name != 'search_vector'))
+    
+    def _entity_to_row(self, publicacao: Publicacao, agora: datetime) -> Dict[str, Any]:
+        return {
+            'uuid': uuid.uuid4(),
+            'numero_processo': publicacao.numero_processo,
+            'data_disponibilizacao': publicacao.data_disponibilizacao,
+            'autores': publicacao.autores,
+            'advogados': publicacao.advogados,
+            'conteudo_completo': publicacao.conteudo_completo,
+            'valor_principal_bruto': publicacao.valor_principal_bruto,
+            'valor_principal_liquido': publicacao.valor_principal_liquido,
+            'valor_juros_moratorios': publicacao.valor_juros_moratorios,
+            'honorarios_advocaticios': publicacao.honorarios_advocaticios,
+            'reu': publicacao.reu,
+            'status': publicacao.status,
+            'created_at': agora,
+            'updated_at': agora,
+        }
+    
     def find_by_id(self, id: int) -> Optional[Publicacao]:
         model = PublicacaoModel.query.get(id)
         return self._model_to_entity(model) if model else None
     
+    def find_updated_at(self, id: int) -> Optional[datetime]:
+        """Só o updated_at, pela chave primária, sem carregar o conteúdo"""
+        return db.session.execute(
+            db.select(PublicacaoModel.updated_at).where(PublicacaoModel.id == id)
+        ).scalar_one_or_none()
+    
+    def collection_version(self, status: str = None) -> str:
+        """Total e último updated_at do status: mudam com inserção, alteração ou remoção"""
+        query = db.session.query(func.count(PublicacaoModel.id), func.max(PublicacaoModel.updated_at))
+        if status:
+            query = query.filter(PublicacaoModel.status == status)
+        total, ultima = query.one()
+        return f"{total}:{ultima.isoformat() if ultima else ''}"
+    
     def find_by_numero_processo(self, numero_processo: str) -> Optional[Publicacao]:
         model = PublicacaoModel.query.filter_by(numero_processo=numero_processo).first()
         return self._model_to_entity(model) if model else None
     
+    def find_existing_numeros_processo(self, numeros_processo: Iterable[str]) -> Set[str]:
+        numeros = list(set(numeros_processo))
+        if not numeros:
+            return set()
+        rows = db.session.query(PublicacaoModel.numero_processo).filter(
+            PublicacaoModel.numero_processo.in_(numeros)
+        ).all()
+        return {row.numero_processo for row in rows}
+    
+    def iter_numeros_processo(self, batch_size: int = 10000) -> Iterator[str]:
+        # Cursor do lado do servidor: só a coluna indexada trafega, em lotes
+        result = db.session.execute(
+            db.select(PublicacaoModel.numero_processo).execution_options(yield_per=batch_size)
+        )
+        for numero_processo in result.scalars():
+            yield numero_processo
+    
     def find_all(self, limit: int = None, offset: int = None) -> List[Publicacao]:
-        query = PublicacaoModel.query.order_by(PublicacaoModel.created_at.desc())
+        query = PublicacaoModel.query.order_by(PublicacaoModel.created_at.desc(), PublicacaoModel.id.desc())
         if limit:
             query = query.limit(limit)
         if offset:
@@ -45,7 +182,9 @@ class SQLAlchemyPublicacaoRepository(PublicacaoRepository):
         return [self._model_to_entity(model) for model in models]
     
     def find_by_status(self, status: str, limit: int = None, offset: int = None) -> List[Publicacao]:
-        query = PublicacaoModel.query.filter_by(status=status).order_by(PublicacaoModel.created_at.desc())
+        query = PublicacaoModel.query.filter_by(status=status).order_by(
+            PublicacaoModel.created_at.desc(), PublicacaoModel.id.desc()
+        )
         if limit:
             query = query.limit(limit)
         if offset:
@@ -53,18 +192,111 @@ class SQLAlchemyPublicacaoRepository(PublicacaoRepository):
         models = query.all()
         return [self._model_to_entity(model) for model in models]
     
+    def find_page(self, status: str = None, limit: int = 50, cursor: str = None) -> Tuple[List[Publicacao], Optional[str]]:
+        """
+        Paginação por chave (created_at, id): cada página parte da última
+        linha da anterior pelo índice composto, sem OFFSET, e não se desloca
+        com inserções no meio da rolagem. Retorna (publicações, próximo cursor).
+        """
+        query = PublicacaoModel.query
+        if status:
+            query = query.filter_by(status=status)
+        if cursor:
+            created_at, id = decode_cursor(cursor)
+            query = query.filter(tuple_(PublicacaoModel.created_at, PublicacaoModel.id) < tuple_(created_at, id))
+        
+        # Uma linha a mais indica se existe próxima página
+        models = query.order_by(PublicacaoModel.created_at.desc(), PublicacaoModel.id.desc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(models) > limit:
+            models = models[:limit]
+            next_cursor = encode_cursor(models[-1].created_at, models[-1].id)
+        return [self._model_to_entity(model) for model in models], next_cursor
+    
+    def find_projection(self, columns: Sequence[str], status: str = None, search: str = None,
+                        limit: int = None, offset: int = None, cursor: str = None) -> Tuple[List[Any], Optional[str]]:
+        """
+        Listagem que seleciona só as colunas pedidas e devolve linhas leves
+        (RowMapping), sem montar models nem entidades. Aceita os mesmos filtros
+        da listagem; com cursor, pagina por (created_at, id) como find_page.
+        """
+        desconhecidas = set(columns) - set(self.PROJECTION_COLUMNS)
+        if desconhecidas:
+            raise ValueError(f"Colunas inválidas: {', '.join(sorted(desconhecidas))}")
+        
+        table = PublicacaoModel.__table__
+        # id e created_at entram sempre: são a chave da ordenação e do cursor
+        nomes = list(dict.fromkeys(['id', 'created_at', *columns]))
+        query = db.select(*(table.c[nome] for nome in nomes))
+        if status:
+            query = query.where(table.c.status == status)
+        if search:
+            consulta = self._tsquery(search)
+            query = query.where(self._match(search, consulta)).order_by(self._rank(consulta).desc(), table.c.id.desc())
+        else:
+            query = query.order_by(table.c.created_at.desc(), table.c.id.desc())
+        if cursor is not None:
+            if cursor:
+                created_at, id = decode_cursor(cursor)
+                query = query.where(tuple_(table.c.created_at, table.c.id) < tuple_(created_at, id))
+            limit = limit or 50
+            rows = db.session.execute(query.limit(limit + 1)).mappings().all()
+            if len(rows) > limit:
+                rows = rows[:limit]
+                return rows, encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+            return rows, None
+        
+        if limit:
+            query = query.limit(limit)
+        if offset:
+            query = query.offset(offset)
+        return db.session.execute(query).mappings().all(), None
+    
     def search_by_content(self, search_term: str, limit: int = 50) -> List[Publicacao]:
-        """Busca por termo no conteúdo usando busca textual do PostgreSQL"""
-        models = PublicacaoModel.query.filter(
-            or_(
-                PublicacaoModel.conteudo_completo.ilike(f'%{search_term}%'),
-                PublicacaoModel.autores.ilike(f'%{search_term}%'),
-                PublicacaoModel.advogados.ilike(f'%{search_term}%'),
-                PublicacaoModel.numero_processo.ilike(f'%{search_term}%')
-            )
-        ).order_by(PublicacaoModel.created_at.desc()).limit(limit).all()
+        """Busca textual em conteúdo, partes e número do processo, da mais para a menos relevante"""
+        consulta = self._tsquery(search_term)
+        models = PublicacaoModel.query.filter(self._match(search_term, consulta)).order_by(
+            self._rank(consulta).desc(), PublicacaoModel.id.desc()
+        ).limit(limit).all()
         return [self._model_to_entity(model) for model in models]
     
+    def search(self, search_term: str, status: str = None, limit: int = 50) -> List[PublicacaoSearchHit]:
+        """
+        Busca com a sintaxe do websearch_to_tsquery ("frase exata", OR, -termo),
+        ordenada por ts_rank, com trechos destacados pelo ts_headline.
+        """
+        consulta = self._tsquery(search_term)
+        rank = self._rank(consulta).label('rank')
+        melhores = db.session.query(PublicacaoModel.id, rank).filter(self._match(search_term, consulta))
+        if status:
+            melhores = melhores.filter(PublicacaoModel.status == status)
+        melhores = melhores.order_by(rank.desc(), PublicacaoModel.id.desc()).limit(limit).subquery()
+        
+        # O ts_headline reprocessa o texto inteiro: só roda para as linhas que vão na resposta
+        trecho = func.ts_headline(
+            literal(TS_CONFIG).cast(REGCONFIG), PublicacaoModel.conteudo_completo, consulta, HEADLINE_OPTIONS
+        ).label('trecho')
+        rows = db.session.query(PublicacaoModel, melhores.c.rank, trecho).join(
+            melhores, melhores.c.id == PublicacaoModel.id
+        ).order_by(melhores.c.rank.desc(), PublicacaoModel.id.desc()).all()
+        return [
+            PublicacaoSearchHit(publicacao=self._model_to_entity(model), rank=float(rank), trecho=trecho)
+            for model, rank, trecho in rows
+        ]
+    
+    @staticmethod
+    def _tsquery(search_term: str):
+        return func.websearch_to_tsquery(literal(TS_CONFIG).cast(REGCONFIG), search_term)
+    
+    @staticmethod
+    def _match(search_term: str, consulta):
+        # O parser separa o número do processo em pedaços; a igualdade exata usa o índice único
+        return or_(PublicacaoModel.search_vector.op('@@')(consulta), PublicacaoModel.numero_processo == search_term.strip())
+    
+    @staticmethod
+    def _rank(consulta):
+        return func.ts_rank(PublicacaoModel.search_vector, consulta)
+    
     def find_by_date_range(self, data_inicio, data_fim, status: str = None) -> List[Publicacao]:
         """Busca publicações por intervalo de datas"""
         query = PublicacaoModel.query.filter(
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import List, Tuple
+from sqlalchemy import and_
+from app.domain.entities.scrape_run import ScrapeRun
+from app.domain.repositories.scrape_run_repository import ScrapeRunRepository
+from app.infrastructure.database.models import ScrapeRunModel
+from app import db
+
+class SQLAlchemyScrapeRunRepository(ScrapeRunRepository):
+    
+    def start(self, data_inicio: datetime, data_fim: datetime, caderno: str = None, consulta: str = None) -> ScrapeRun:
+        model = ScrapeRunModel(
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            caderno=caderno,
+            consulta=consulta,
+            status='em_andamento'
+        )
+        
+        db.session.add(model)
+        db.session.commit()
+        
+        return self._model_to_entity(model)
+    
+    def finish(self, run_id: int, status: str, resumo: dict, paginas_com_falha: int = 0) -> ScrapeRun:
+        model = ScrapeRunModel.query.get(run_id)
+        if not model:
+            raise ValueError(f"ScrapeRun with id {run_id} not found")
+        
+        model.status = status
+        model.total_extraido = resumo.get('total_extraido', 0)
+        model.novas = resumo.get('novas', 0)
+        model.existentes = resumo.get('existentes', 0)
+        model.erros = resumo.get('erros', 0)
+        model.paginas_com_falha = paginas_com_falha
+        model.finished_at = datetime.utcnow()
+        
+        db.session.commit()
+        return self._model_to_entity(model)
+    
+    def find_completed_ranges(self, data_inicio: datetime, data_fim: datetime, caderno: str = None,
+                              consulta: str = None) -> List[Tuple[datetime, datetime]]:
+        """Intervalos concluídos com sucesso que se sobrepõem a [data_inicio, data_fim]"""
+        query = db.session.query(ScrapeRunModel.data_inicio, ScrapeRunModel.data_fim).filter(
+            and_(
+                ScrapeRunModel.status == 'completo',
+                ScrapeRunModel.data_inicio <= data_fim,
+                ScrapeRunModel.data_fim >= data_inicio
+            )
+        )
+        if caderno is not None:
+            query = query.filter(ScrapeRunModel.caderno == caderno)
+        if consulta is not None:
+            query = query.filter(ScrapeRunModel.consulta == consulta)
+        rows = query.all()
+        return [(inicio, fim) for inicio, fim in rows]
+    
+    def _model_to_entity(self, model: ScrapeRunModel) -> ScrapeRun:
+        return ScrapeRun(
+            id=model.id,
+            data_inicio=model.data_inicio,
+            data_fim=model.data_fim,
+            caderno=model.caderno,
+            consulta=model.consulta,
+            status=model.status,
+            total_extraido=model.total_extraido,
+            novas=model.novas,
+            existentes=model.existentes,
+            erros=model.erros,
+            paginas_com_falha=model.paginas_com_falha,
+            started_at=model.started_at,
+            finished_at=model.finished_at
+        )
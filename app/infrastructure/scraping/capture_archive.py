@@ -0,0 +1,119 @@
+import os
+import gzip
+import json
+import uuid
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+CAPTURE_KINDS = ('result_page', 'detail_page', 'pdf')
+
+class CaptureArchive:
+    """
+    Arquivo append-only das capturas brutas do DJE no estilo WARC: cada
+    registro é um membro gzip independente (cabeçalhos WARC + corpo) em
+    segmentos .warc.gz, e o index.jsonl guarda segmento, offset e tamanho
+    de cada registro para leitura direta na reprodução offline.
+    """
+
+    INDEX_FILE = 'index.jsonl'
+    SEGMENT_PREFIX = 'captures-'
+    SEGMENT_SUFFIX = '.warc.gz'
+
+    def __init__(self, directory: str, max_segment_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self._lock = threading.Lock()
+        self._segment = None
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, kind: str, uri: str, content: Union[str, bytes], content_type: str = 'text/html',
+              meta: Dict[str, Any] = None) -> Optional[str]:
+        """Anexa uma captura ao arquivo e retorna o id do registro (None em caso de erro)"""
+        if kind not in CAPTURE_KINDS:
+            raise ValueError(f"Tipo de captura inválido: {kind}")
+
+        body = content.encode('utf-8') if isinstance(content, str) else content
+        record_id = str(uuid.uuid4())
+        capturado_em = datetime.utcnow().isoformat() + 'Z'
+        headers = [
+            'WARC/1.0',
+            'WARC-Type: resource',
+            f'WARC-Record-ID: <urn:uuid:{record_id}>',
+            f'WARC-Date: {capturado_em}',
+            f'WARC-Target-URI: {uri}',
+            f'Content-Type: {content_type}',
+            f'Content-Length: {len(body)}',
+            f'X-Capture-Kind: {kind}',
+        ]
+        record = gzip.compress('\r\n'.join(headers).encode('utf-8') + b'\r\n\r\n' + body + b'\r\n\r\n')
+
+        try:
+            with self._lock:
+                segment = self._current_segment(len(record))
+                path = os.path.join(self.directory, segment)
+                with open(path, 'ab') as f:
+                    offset = f.tell()
+                    f.write(record)
+                entry = {
+                    'id': record_id,
+                    'kind': kind,
+                    'uri': uri,
+                    'content_type': content_type,
+                    'segment': segment,
+                    'offset': offset,
+                    'length': len(record),
+                    'size': len(body),
+                    'sha1': hashlib.sha1(body).hexdigest(),
+                    'captured_at': capturado_em,
+                    'meta': meta or {},
+                }
+                with open(os.path.join(self.directory, self.INDEX_FILE), 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+            return record_id
+        except OSError as e:
+            logging.warning(f"Não foi possível arquivar captura de {uri}: {e}")
+            return None
+
+    def entries(self, kind: str = None) -> List[Dict[str, Any]]:
+        """Entradas do índice, na ordem de captura"""
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return []
+
+        entries = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Linha truncada por uma escrita interrompida
+                    continue
+                if kind is None or entry.get('kind') == kind:
+                    entries.append(entry)
+        return entries
+
+    def read(self, entry: Dict[str, Any]) -> bytes:
+        """Lê o corpo de um registro a partir do offset indicado no índice"""
+        with open(os.path.join(self.directory, entry['segment']), 'rb') as f:
+            f.seek(entry['offset'])
+            record = gzip.decompress(f.read(entry['length']))
+        _, _, body = record.partition(b'\r\n\r\n')
+        return body[:entry['size']]
+
+    def iter_records(self, kind: str = None) -> Iterator[Tuple[Dict[str, Any], bytes]]:
+        for entry in self.entries(kind):
+            yield entry, self.read(entry)
+
+    def _current_segment(self, record_size: int) -> str:
+        if self._segment:
+            path = os.path.join(self.directory, self._segment)
+            if not os.path.exists(path) or os.path.getsize(path) + record_size <= self.max_segment_bytes:
+                return self._segment
+        self._segment = f"{self.SEGMENT_PREFIX}{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}{self.SEGMENT_SUFFIX}"
+        return self._segment
@@ -0,0 +1,68 @@
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional, Set, Union
+import redis
+
+class CheckpointStore:
+    """
+    Checkpoints de extração em hashes do Redis, identificados por
+    (período, caderno, consulta). Guarda a última página já persistida
+    e as fatias de data concluídas para que retries retomem de onde pararam.
+    """
+
+    KEY_PREFIX = 'juscash:checkpoint:'
+
+    def __init__(self, redis_client: redis.Redis, ttl_seconds: int = 7 * 24 * 3600):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def make_key(cls, data_inicio: datetime, data_fim: datetime, caderno: str, query: str) -> str:
+        raw = f"{data_inicio.isoformat()}|{data_fim.isoformat()}|{caderno}|{query}"
+        return cls.KEY_PREFIX + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def last_page(self, key: str) -> int:
+        """Última página completamente persistida (0 se não houver checkpoint)"""
+        try:
+            value = self.redis.hget(key, 'last_page')
+            return int(value) if value else 0
+        except redis.RedisError as e:
+            logging.warning(f"Checkpoint indisponível, iniciando do começo: {e}")
+            return 0
+
+    def save_page(self, key: str, page_num: int):
+        self._hset(key, {'last_page': page_num, 'updated_at': datetime.utcnow().isoformat()})
+
+    def completed_shards(self, key: str) -> Set[str]:
+        try:
+            fields = self.redis.hkeys(key)
+        except redis.RedisError as e:
+            logging.warning(f"Checkpoint indisponível, nenhuma fatia será pulada: {e}")
+            return set()
+        shards = set()
+        for field in fields:
+            field = field.decode() if isinstance(field, bytes) else field
+            if field.startswith('shard:'):
+                shards.add(field[len('shard:'):])
+        return shards
+
+    def save_shard(self, key: str, shard: Union[datetime, str]):
+        """Marca uma fatia (pelo início) ou uma unidade de plano (pelo id) como concluída"""
+        shard_id = shard.isoformat() if isinstance(shard, datetime) else shard
+        self._hset(key, {f'shard:{shard_id}': 'done', 'updated_at': datetime.utcnow().isoformat()})
+
+    def clear(self, key: str):
+        try:
+            self.redis.delete(key)
+        except redis.RedisError as e:
+            logging.warning(f"Não foi possível remover checkpoint {key}: {e}")
+
+    def _hset(self, key: str, mapping: dict):
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+        except redis.RedisError as e:
+            logging.warning(f"Não foi possível gravar checkpoint {key}: {e}")
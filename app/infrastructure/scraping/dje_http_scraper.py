@@ -0,0 +1,235 @@
+import time
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Tuple
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+import requests
+from app.infrastructure.scraping.dje_scraper import DJEScraper
+from app.infrastructure.scraping.page_fanout import PageFanout, calcular_ultima_pagina
+from app.infrastructure.scraping.result_page_parser import ResultPage, parse_result_page
+from app.infrastructure import metrics
+
+class DJEHttpScraper(DJEScraper):
+    """
+    Motor de scraping do DJE que dispensa o Chrome: submete o formulário
+    consultaAvancadaForm e percorre a paginação diretamente via HTTP.
+    Reaproveita os métodos de parsing do DJEScraper.
+    """
+
+    FORM_NAME = 'consultaAvancadaForm'
+    DEFAULT_ACTION = 'consultaAvancada.do'
+
+    # Nomes padrão dos campos caso o formulário não possa ser lido da página inicial
+    DEFAULT_FIELD_NAMES = {
+        'dtInicioString': 'dadosConsulta.dtInicio',
+        'dtFimString': 'dadosConsulta.dtFim',
+        'procura': 'dadosConsulta.pesquisaLivre',
+    }
+    CADERNO_FIELD = 'dadosConsulta.cdCaderno'
+    PAGE_FIELD = 'pagina'
+
+    def __init__(self, base_url: str = "https://dje.tjsp.jus.br/cdje/index.do", timeout: int = 30,
+                 max_workers: int = 4, max_per_host: int = 2, capture_archive=None, seen_set=None,
+                 scheduler=None, caderno: str = None, query: str = None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.paginas_com_falha = []
+        self.capture_archive = capture_archive
+        self.seen_set = seen_set
+        self.scheduler = scheduler
+        self.caderno = caderno or self.DEFAULT_CADERNO
+        self.query = query or self.DEFAULT_QUERY
+        self.processos_conhecidos = []
+        self._periodo = None
+        self._action_url = None
+        self.max_retries = 3
+        self.driver = None
+        self.wait = None
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            'Accept-Language': 'pt-BR,pt;q=0.9',
+        })
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    def iterar_paginas(self, data_inicio: datetime, data_fim: datetime,
+                       pagina_inicial: int = 1) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        logging.info(f"[HTTP] Iniciando extração de {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}")
+        self.paginas_com_falha = []
+        self.processos_conhecidos = []
+        self._periodo = (data_inicio, data_fim)
+        # Página em andamento, para registrar a falha se a extração for interrompida
+        pagina_atual = pagina_inicial
+
+        try:
+            action_url, payload = self._montar_formulario(data_inicio, data_fim)
+            self._action_url = action_url
+
+            try:
+                html = self._post_pagina(action_url, payload, pagina_inicial)
+            except Exception as e:
+                logging.error(f"[HTTP] Erro ao buscar página {pagina_inicial}: {e}")
+                metrics.count_pagina('falha')
+                self.paginas_com_falha.append({'pagina': pagina_inicial, 'erro': str(e)})
+                return
+
+            publicacoes, pagina = self._extrair_pagina(html, pagina_inicial)
+            if not publicacoes and not pagina.rows:
+                logging.info("[HTTP] Nenhuma publicação encontrada para os critérios definidos.")
+                return
+            total_publicacoes = len(publicacoes)
+            yield pagina_inicial, publicacoes
+            pagina_atual = pagina_inicial + 1
+
+            ultima_pagina = calcular_ultima_pagina(html, pagina_inicial)
+            if ultima_pagina is not None:
+                logging.info(f"[HTTP] Resultados em {ultima_pagina} páginas")
+                paginas = self._buscar_paginas_em_paralelo(action_url, payload, range(pagina_inicial + 1, ultima_pagina + 1))
+            else:
+                paginas = self._buscar_paginas_em_sequencia(action_url, payload, pagina, pagina_inicial)
+
+            for page_num, page_publicacoes in paginas:
+                total_publicacoes += len(page_publicacoes)
+                yield page_num, page_publicacoes
+                pagina_atual = page_num + 1
+
+            if self.paginas_com_falha:
+                logging.warning(f"[HTTP] Páginas com falha: {[f['pagina'] for f in self.paginas_com_falha]}")
+            logging.info(f"[HTTP] Extração concluída. Total de publicações extraídas: {total_publicacoes}")
+
+        except Exception as e:
+            logging.error(f"[HTTP] Erro fatal durante a extração: {e}")
+            self.paginas_com_falha.append({'pagina': pagina_atual, 'erro': str(e)})
+
+    def _buscar_paginas_em_paralelo(self, action_url: str, payload: Dict[str, str],
+                                    pages) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Busca as páginas restantes em paralelo e entrega na ordem das páginas"""
+        # Com o agendador, o teto por host vem do AIMD compartilhado e não do semáforo local
+        max_per_host = self.max_workers if self.scheduler is not None else self.max_per_host
+        fanout = PageFanout(action_url, max_workers=self.max_workers, max_per_host=max_per_host)
+
+        # As threads do fanout só baixam o HTML: a extração consulta o seen-set (banco),
+        # que precisa do contexto da aplicação presente só na thread do consumidor
+        def _fetch(page_num: int) -> str:
+            return self._post_pagina(action_url, payload, page_num)
+
+        for page_num, html, erro in fanout.iter_fetch(pages, _fetch):
+            if erro is None:
+                try:
+                    publicacoes, _ = self._extrair_pagina(html, page_num)
+                except Exception as e:
+                    logging.error(f"[HTTP] Erro ao extrair página {page_num}: {e}")
+                    erro = str(e)
+            if erro is not None:
+                metrics.count_pagina('falha')
+                self.paginas_com_falha.append({'pagina': page_num, 'erro': erro})
+                continue
+            yield page_num, publicacoes
+
+    def _buscar_paginas_em_sequencia(self, action_url: str, payload: Dict[str, str], pagina: ResultPage,
+                                     page_num: int = 1) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Percorre a paginação pelo link 'Próximo>' quando o total não é conhecido"""
+        while True:
+            next_page = pagina.proxima_pagina
+            if not next_page:
+                logging.info("[HTTP] Fim da paginação alcançado.")
+                break
+            page_num = next_page
+
+            try:
+                html = self._post_pagina(action_url, payload, page_num)
+            except Exception as e:
+                logging.error(f"[HTTP] Erro ao buscar página {page_num}: {e}")
+                metrics.count_pagina('falha')
+                self.paginas_com_falha.append({'pagina': page_num, 'erro': str(e)})
+                break
+
+            page_publicacoes, pagina = self._extrair_pagina(html, page_num)
+            # Uma página só com processos já armazenados não encerra a paginação
+            if not pagina.rows:
+                logging.info(f"[HTTP] Fim dos resultados na página {page_num}")
+                break
+            yield page_num, page_publicacoes
+
+    def _extrair_pagina(self, html: str, page_num: int):
+        """Converte o HTML de uma página de resultados em publicações"""
+        self._capturar('result_page', self._action_url or self.base_url, html, pagina=page_num)
+        with metrics.stage('parse_pagina'):
+            pagina = parse_result_page(html, page_num)
+        metrics.count_pagina('ok')
+        publicacoes_elements = pagina.rows
+        logging.info(f"[HTTP] Encontradas {len(publicacoes_elements)} publicações na página {page_num}")
+
+        publicacoes = []
+        for idx, element in enumerate(self._descartar_conhecidas(publicacoes_elements, page_num), 1):
+            with metrics.stage('extracao_publicacao'):
+                publicacao_data = self._extrair_dados_publicacao(element)
+            if publicacao_data:
+                publicacoes.append(publicacao_data)
+            else:
+                logging.warning(f"[HTTP] Falha ao extrair dados da publicação {idx} na página {page_num}")
+        return publicacoes, pagina
+
+    def _montar_formulario(self, data_inicio: datetime, data_fim: datetime):
+        """Lê o consultaAvancadaForm da página inicial e devolve (action, payload)"""
+        field_names = dict(self.DEFAULT_FIELD_NAMES)
+        action_url = urljoin(self.base_url, self.DEFAULT_ACTION)
+        hidden_fields = {}
+
+        try:
+            response = self._request('GET', self.base_url)
+            soup = BeautifulSoup(response.text, 'html.parser')
+            form = soup.find('form', attrs={'name': self.FORM_NAME})
+            if form:
+                if form.get('action'):
+                    action_url = urljoin(self.base_url, form['action'])
+                for field_id in field_names:
+                    field = form.find(id=field_id)
+                    if field and field.get('name'):
+                        field_names[field_id] = field['name']
+                for hidden in form.find_all('input', attrs={'type': 'hidden'}):
+                    if hidden.get('name'):
+                        hidden_fields[hidden['name']] = hidden.get('value', '')
+            else:
+                logging.warning("[HTTP] Formulário consultaAvancadaForm não encontrado, usando campos padrão")
+        except Exception as e:
+            logging.warning(f"[HTTP] Não foi possível ler o formulário ({e}), usando campos padrão")
+
+        payload = dict(hidden_fields)
+        payload.update({
+            field_names['dtInicioString']: data_inicio.strftime("%d/%m/%Y"),
+            field_names['dtFimString']: data_fim.strftime("%d/%m/%Y"),
+            self.CADERNO_FIELD: self.caderno,
+            field_names['procura']: self.query,
+        })
+        return action_url, payload
+
+    def _post_pagina(self, action_url: str, payload: Dict[str, str], page_num: int) -> str:
+        data = dict(payload)
+        if page_num > 1:
+            data[self.PAGE_FIELD] = str(page_num)
+        response = self._request('POST', action_url, data=data)
+        return response.text
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Requisição HTTP com retry e backoff simples, no ritmo do agendador"""
+        for attempt in range(self.max_retries):
+            try:
+                with self._agendar(url), metrics.stage('requisicao_http'):
+                    response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                    response.raise_for_status()
+                return response
+            except requests.RequestException as e:
+                logging.warning(f"[HTTP] Tentativa {attempt + 1} falhou para {url}: {e}")
+                if attempt == self.max_retries - 1:
+                    raise
+                time.sleep(2 ** attempt)
+
+    def close(self):
+        try:
+            self.session.close()
+        except Exception as e:
+            logging.warning(f"Erro ao fechar sessão HTTP: {e}")
@@ -1,103 +1,135 @@
 import re
 import time
 import logging
+from contextlib import nullcontext
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterator, Tuple
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 import requests
+from app.infrastructure.scraping.wait_engine import WaitEngine
+from app.infrastructure.scraping.result_page_parser import ResultRow, parse_result_page
+from app.infrastructure import metrics
+
+def get_chrome_options():
+    """Configurações otimizadas do Chrome para Docker/Railway"""
+    chrome_options = Options()
+
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-web-security")
+    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-images")
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-features=TranslateUI")
+    chrome_options.add_argument("--disable-ipc-flooding-protection")
+    chrome_options.add_argument("--memory-pressure-off")
+    chrome_options.add_argument("--max_old_space_size=4096")
+    chrome_options.add_argument("--single-process")
+    chrome_options.add_argument("--no-zygote")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--disable-popup-blocking")
+    chrome_options.add_argument("--aggressive-cache-discard")
+    chrome_options.add_argument("--disable-background-networking")
+
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_experimental_option('detach', True)
+
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+    return chrome_options
+
+def build_chrome_driver(max_retries: int = 3):
+    """Inicializa o driver com retry e múltiplas estratégias"""
+    chrome_options = get_chrome_options()
+    driver = None
+    
+    for attempt in range(max_retries):
+        try:
+            logging.info(f"Tentativa {attempt + 1} de inicializar Chrome driver...")
+            
+            try:
+                service = Service(ChromeDriverManager().install())
+                driver = webdriver.Chrome(service=service, options=chrome_options)
+                logging.info("✅ Driver inicializado com webdriver-manager")
+                break
+            except Exception as e:
+                logging.warning(f"Webdriver-manager falhou, tentando com o Chrome do sistema: {e}")
+                driver = webdriver.Chrome(options=chrome_options)
+                logging.info("✅ Driver inicializado com Chrome do sistema")
+                break
+        
+        except Exception as e:
+            logging.error(f"Erro na tentativa {attempt + 1}: {e}")
+            if driver:
+                try:
+                    driver.quit()
+                except:
+                    pass
+                driver = None
+            
+            if attempt == max_retries - 1:
+                raise Exception(f"Falha crítica ao inicializar Chrome após {max_retries} tentativas: {e}")
+            
+            time.sleep(2)
+    
+    driver.set_page_load_timeout(45)
+    # Sem espera implícita: toda espera é explícita, pelo WaitEngine
+    driver.implicitly_wait(0)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
 
 class DJEScraper:
     
-    def __init__(self, base_url: str = "https://dje.tjsp.jus.br/cdje/index.do"):
+    DEFAULT_CADERNO = '-11'
+    DEFAULT_QUERY = '"instituto nacional do seguro social" E inss'
+    
+    def __init__(self, base_url: str = "https://dje.tjsp.jus.br/cdje/index.do", driver_pool=None, capture_archive=None,
+                 seen_set=None, scheduler=None, caderno: str = None, query: str = None):
         self.base_url = base_url
         self.session = requests.Session()
         self.driver = None
         self.wait = None
         self.max_retries = 3
+        self.driver_pool = driver_pool
+        self.waits = WaitEngine()
+        self.paginas_com_falha = []
+        self.capture_archive = capture_archive
+        self.seen_set = seen_set
+        self.scheduler = scheduler
+        self.caderno = caderno or self.DEFAULT_CADERNO
+        self.query = query or self.DEFAULT_QUERY
+        self.processos_conhecidos = []
+        self._periodo = None
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self._initialize_driver()
     
     def _get_chrome_options(self):
         """Configurações otimizadas do Chrome para Docker/Railway"""
-        chrome_options = Options()
-        
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")
-        chrome_options.add_argument("--disable-background-timer-throttling")
-        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-        chrome_options.add_argument("--disable-renderer-backgrounding")
-        chrome_options.add_argument("--disable-features=TranslateUI")
-        chrome_options.add_argument("--disable-ipc-flooding-protection")
-        chrome_options.add_argument("--memory-pressure-off")
-        chrome_options.add_argument("--max_old_space_size=4096")
-        chrome_options.add_argument("--single-process")
-        chrome_options.add_argument("--no-zygote")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--disable-popup-blocking")
-        chrome_options.add_argument("--aggressive-cache-discard")
-        chrome_options.add_argument("--disable-background-networking")
-        
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_experimental_option('detach', True)
-        
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        return chrome_options
+        return get_chrome_options()
     
     def _initialize_driver(self):
-        """Inicializa o driver com retry e múltiplas estratégias"""
-        chrome_options = self._get_chrome_options()
-        
-        for attempt in range(self.max_retries):
-            try:
-                logging.info(f"Tentativa {attempt + 1} de inicializar Chrome driver...")
-                
-                try:
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    logging.info("✅ Driver inicializado com webdriver-manager")
-                    break
-                except Exception as e:
-                    logging.warning(f"Webdriver-manager falhou, tentando com o Chrome do sistema: {e}")
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                    logging.info("✅ Driver inicializado com Chrome do sistema")
-                    break
-            
-            except Exception as e:
-                logging.error(f"Erro na tentativa {attempt + 1}: {e}")
-                if self.driver:
-                    try:
-                        self.driver.quit()
-                    except:
-                        pass
-                    self.driver = None
-                
-                if attempt == self.max_retries - 1:
-                    raise Exception(f"Falha crítica ao inicializar Chrome após {self.max_retries} tentativas: {e}")
-                
-                time.sleep(2)
-        
-        if self.driver:
-            self.driver.set_page_load_timeout(45)
-            self.driver.implicitly_wait(15)
-            self.wait = WebDriverWait(self.driver, 30)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        """Obtém um driver do pool (se configurado) ou inicia um Chrome próprio"""
+        with metrics.stage('driver'):
+            if self.driver_pool is not None:
+                self.driver = self.driver_pool.acquire()
+            else:
+                self.driver = build_chrome_driver(self.max_retries)
+        self.wait = WebDriverWait(self.driver, 30)
     
     def _restart_driver_if_needed(self):
         """Reinicia o driver se não estiver respondendo."""
@@ -106,70 +138,112 @@ class DJEScraper:
             return True
         except Exception:
             logging.warning("Driver não responsivo. Reiniciando...")
-            try:
-                if self.driver:
-                    self.driver.quit()
-            except:
-                pass
+            if self.driver_pool is not None:
+                self.driver_pool.discard(self.driver)
+            else:
+                try:
+                    if self.driver:
+                        self.driver.quit()
+                except:
+                    pass
+            self.driver = None
             self._initialize_driver()
             return self.driver is not None
     
-    def extrair_publicacoes(self, data_inicio: datetime, data_fim: datetime) -> List[Dict[str, Any]]:
+    def extrair_publicacoes(self, data_inicio: datetime, data_fim: datetime, pagina_inicial: int = 1,
+                            on_page: Callable[[int, List[Dict[str, Any]]], None] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Gera as publicações do período, uma a uma, sobre iterar_paginas. pagina_inicial
+        permite retomar a partir de um checkpoint e on_page(page_num, publicacoes) é
+        chamado após cada página.
+        """
+        for page_num, page_publicacoes in self.iterar_paginas(data_inicio, data_fim, pagina_inicial):
+            yield from page_publicacoes
+            if on_page:
+                on_page(page_num, page_publicacoes)
+    
+    def iterar_paginas(self, data_inicio: datetime, data_fim: datetime,
+                       pagina_inicial: int = 1) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Gera (page_num, publicacoes) assim que cada página de resultados é
+        processada, sem acumular o período inteiro em memória.
+        """
+        self.paginas_com_falha = []
+        self.processos_conhecidos = []
+        self._periodo = (data_inicio, data_fim)
         if not self._restart_driver_if_needed():
             logging.error("Driver não está operacional. Abortando extração.")
-            return []
+            self.paginas_com_falha.append({'pagina': pagina_inicial, 'erro': 'Driver não operacional'})
+            return
 
         logging.info(f"Iniciando extração de {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}")
-        self.driver.get(self.base_url)
+        with self._agendar(), metrics.stage('navegacao'):
+            self.driver.get(self.base_url)
 
         try:
             logging.info("Preenchendo formulário de busca...")
-            self.wait.until(EC.visibility_of_element_located((By.ID, "dtInicioString"))).send_keys(data_inicio.strftime("%d/%m/%Y"))
+            self.waits.wait_for(self.driver, EC.visibility_of_element_located((By.ID, "dtInicioString")), 'formulario').send_keys(data_inicio.strftime("%d/%m/%Y"))
             self.driver.find_element(By.ID, "dtFimString").send_keys(data_fim.strftime("%d/%m/%Y"))
             
             select_caderno = Select(self.driver.find_element(By.NAME, "dadosConsulta.cdCaderno"))
-            select_caderno.select_by_value("-11")
-            logging.info("Caderno selecionado: -11")
+            select_caderno.select_by_value(self.caderno)
+            logging.info(f"Caderno selecionado: {self.caderno}")
 
-            self.driver.find_element(By.ID, "procura").send_keys('"instituto nacional do seguro social" E inss')
+            self.driver.find_element(By.ID, "procura").send_keys(self.query)
             logging.info("Termos de busca inseridos")
             
             logging.info("Submetendo formulário...")
-            self.driver.find_element(By.CSS_SELECTOR, "form[name='consultaAvancadaForm'] input[type='submit']").click()
+            with self._agendar(), metrics.stage('formulario'):
+                self.driver.find_element(By.CSS_SELECTOR, "form[name='consultaAvancadaForm'] input[type='submit']").click()
 
-            all_publicacoes = []
+            total_publicacoes = 0
             page_num = 1
+            if pagina_inicial > 1:
+                page_num = self._ir_para_pagina(pagina_inicial)
             while True:
                 logging.info(f"Processando página {page_num}...")
                 try:
-                    self.wait.until(EC.presence_of_element_located((By.ID, "divResultadosInferior")))
-                    time.sleep(2)
+                    resultados_element = self.waits.wait_for_element(self.driver, By.ID, "divResultadosInferior", 'resultados')
                     
-                    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                    publicacoes_elements = soup.select('div#divResultadosInferior table tr.fundocinza1')
+                    html = self.driver.page_source
+                    self._capturar('result_page', self.driver.current_url, html, pagina=page_num)
+                    with metrics.stage('parse_pagina'):
+                        publicacoes_elements = parse_result_page(html, page_num).rows
                     
-                    if not publicacoes_elements and page_num == 1:
+                    if not publicacoes_elements and page_num == pagina_inicial:
                         logging.info("Nenhuma publicação encontrada para os critérios definidos.")
                         break
                     
                     logging.info(f"Encontradas {len(publicacoes_elements)} publicações na página {page_num}")
                     
+                    publicacoes_elements = self._descartar_conhecidas(publicacoes_elements, page_num)
+                    page_publicacoes = []
                     for idx, element in enumerate(publicacoes_elements, 1):
                         logging.info(f"Processando publicação {idx}/{len(publicacoes_elements)} da página {page_num}")
-                        publicacao_data = self._extrair_dados_publicacao(element)
+                        with metrics.stage('extracao_publicacao'):
+                            publicacao_data = self._extrair_dados_publicacao(element)
                         if publicacao_data:
                             logging.info(f"Publicação extraída com sucesso: Processo {publicacao_data['numero_processo']}")
-                            all_publicacoes.append(publicacao_data)
+                            page_publicacoes.append(publicacao_data)
                         else:
                             logging.warning(f"Falha ao extrair dados da publicação {idx} na página {page_num}")
                     
+                    total_publicacoes += len(page_publicacoes)
+                    metrics.count_pagina('ok')
+                    yield page_num, page_publicacoes
+                    
                     try:
                         next_page = self.driver.find_elements(By.LINK_TEXT, 'Próximo>')
                         if next_page:
                             logging.info(f"Navegando para página {page_num + 1}...")
-                            self.driver.execute_script("arguments[0].click();", next_page[0])
                             page_num += 1
-                            time.sleep(2)
+                            # Um timeout aqui aparece para o agendador como latência alta
+                            with self._agendar():
+                                self.driver.execute_script("arguments[0].click();", next_page[0])
+                                try:
+                                    self.waits.wait_for_staleness(self.driver, resultados_element, 'paginacao')
+                                except TimeoutException:
+                                    logging.warning(f"Página {page_num} não substituiu os resultados anteriores a tempo")
                         else:
                             logging.info("Fim da paginação alcançado.")
                             break
@@ -179,23 +253,75 @@ class DJEScraper:
                         
                 except Exception as e:
                     logging.error(f"Erro ao processar página {page_num}: {e}")
+                    metrics.count_pagina('falha')
+                    self.paginas_com_falha.append({'pagina': page_num, 'erro': str(e)})
                     break
             
-            logging.info(f"Extração concluída. Total de publicações extraídas: {len(all_publicacoes)}")
-            return all_publicacoes
+            logging.info(f"Extração concluída. Total de publicações extraídas: {total_publicacoes}")
+            logging.info(f"Tempos de espera: {self.waits.resumo()}")
             
         except Exception as e:
             logging.error(f"Erro fatal durante a extração: {e}")
-            return []
+            self.paginas_com_falha.append({'pagina': pagina_inicial, 'erro': str(e)})
     
-    def _extrair_dados_publicacao(self, element) -> Dict[str, Any]:
+    def _ir_para_pagina(self, page_num: int) -> int:
+        """Salta direto para uma página de resultados usando a função trocaDePg do DJE"""
         try:
-            texto_completo_element = element.select_one('tr.ementaClass2 td')
-            if not texto_completo_element:
+            resultados_element = self.waits.wait_for_element(self.driver, By.ID, "divResultadosInferior", 'resultados')
+            logging.info(f"Retomando a partir da página {page_num}...")
+            with self._agendar():
+                self.driver.execute_script(f"trocaDePg({int(page_num)});")
+                self.waits.wait_for_staleness(self.driver, resultados_element, 'paginacao')
+            return page_num
+        except Exception as e:
+            logging.warning(f"Não foi possível saltar para a página {page_num}, recomeçando da página 1: {e}")
+            return 1
+    
+    def _agendar(self, url: str = None):
+        """Vaga no agendador de requisições ao DJE (sem agendador, não espera)"""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(url or self.base_url)
+    
+    def _capturar(self, kind: str, uri: str, content, content_type: str = 'text/html', **meta):
+        """Grava a captura bruta no arquivo de capturas, se configurado"""
+        if self.capture_archive is None:
+            return
+        if self._periodo:
+            meta.setdefault('data_inicio', self._periodo[0].isoformat())
+            meta.setdefault('data_fim', self._periodo[1].isoformat())
+        meta.setdefault('caderno', self.caderno)
+        meta.setdefault('query', self.query)
+        self.capture_archive.write(kind, uri, content, content_type, meta)
+    
+    def _descartar_conhecidas(self, rows: List[ResultRow], page_num: int) -> List[ResultRow]:
+        """Remove as linhas de processos já armazenados antes de extrair os campos"""
+        if self.seen_set is None or not rows:
+            return rows
+        
+        numeros = [self._extrair_numero_processo(row.conteudo) if row.conteudo else None for row in rows]
+        conhecidos = self.seen_set.known(numeros)
+        # Marcar antes de persistir é seguro: um "talvez visto" sempre passa pela verificação exata
+        self.seen_set.add_many(n for n in numeros if n and n not in conhecidos)
+        if not conhecidos:
+            return rows
+        
+        novas = []
+        for row, numero in zip(rows, numeros):
+            if numero in conhecidos:
+                self.processos_conhecidos.append(numero)
+            else:
+                novas.append(row)
+        logging.info(f"{len(rows) - len(novas)} publicações da página {page_num} já armazenadas, ignoradas")
+        return novas
+    
+    def _extrair_dados_publicacao(self, row: ResultRow) -> Dict[str, Any]:
+        try:
+            if row.conteudo is None:
                 logging.warning("Elemento de texto completo não encontrado")
                 return None
                 
-            conteudo_completo = texto_completo_element.get_text(strip=True)
+            conteudo_completo = row.conteudo
             logging.debug(f"Conteúdo extraído: {conteudo_completo[:100]}...")
             
             numero_processo = self._extrair_numero_processo(conteudo_completo)
@@ -204,9 +330,8 @@ class DJEScraper:
                 return None
             
             data_str = "N/A"
-            date_element = element.select_one('tr.ementaClass a')
-            if date_element:
-                match = re.search(r'(\d{2}/\d{2}/\d{4})', date_element.get_text())
+            if row.cabecalho:
+                match = re.search(r'(\d{2}/\d{2}/\d{4})', row.cabecalho)
                 if match:
                     data_str = match.group(1)
             
@@ -267,8 +392,12 @@ class DJEScraper:
     def close(self):
         if self.driver:
             try:
-                self.driver.quit()
-                logging.info("✅ Driver do Selenium finalizado com sucesso")
+                if self.driver_pool is not None:
+                    self.driver_pool.release(self.driver)
+                    logging.info("✅ Driver do Selenium devolvido ao pool")
+                else:
+                    self.driver.quit()
+                    logging.info("✅ Driver do Selenium finalizado com sucesso")
             except Exception as e:
                 logging.warning(f"Erro ao fechar driver: {e}")
             finally:
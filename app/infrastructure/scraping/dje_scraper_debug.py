@@ -11,14 +11,23 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 import requests
-import tempfile
 import uuid
 import threading
 import subprocess
-import pdfplumber
+from contextlib import nullcontext
+from collections import deque
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
+from app.infrastructure.scraping.wait_engine import WaitEngine
+from app.infrastructure.scraping.page_fanout import calcular_ultima_pagina
+from app.infrastructure.scraping.result_page_parser import parse_result_page
+from app.infrastructure.scraping.scraper_factory import (
+    get_capture_archive, create_pdf_extractor, create_seen_set, get_politeness_scheduler
+)
+from app.infrastructure.scraping.rpv_extraction import RpvFieldExtractor, RpvFields
+from app.infrastructure.scraping.rpv_classifier import RpvClassifier
+from app.infrastructure import metrics
 
 class DJEScraperDebug:
     """
@@ -46,6 +55,14 @@ class DJEScraperDebug:
                     self.max_retries = 3
                     self.visual_mode = visual_mode
                     self.log_buffer = []  # Buffer para logs
+                    self.waits = WaitEngine()
+                    self.capture_archive = get_capture_archive()
+                    self.pdf_extractor = create_pdf_extractor()
+                    self.rpv_extractor = RpvFieldExtractor()
+                    self.rpv_classifier = RpvClassifier(self.rpv_extractor)
+                    self.seen_set = create_seen_set()
+                    self.scheduler = get_politeness_scheduler()
+                    self._periodo = None
                     logging.basicConfig(level=logging.INFO)
                     self.initialized = True
 
@@ -354,7 +371,7 @@ class DJEScraperDebug:
         if self.driver:
             try:
                 self.driver.set_page_load_timeout(45)
-                self.driver.implicitly_wait(15)
+                self.driver.implicitly_wait(0)
                 self.wait = WebDriverWait(self.driver, 30)
                 self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
                 
@@ -415,7 +432,10 @@ class DJEScraperDebug:
                 
                 # Aguardar resultados
                 self.log("  ⏳ Aguardando resultados...")
-                time.sleep(5)
+                try:
+                    self.waits.wait_for_document_ready(self.driver, 'submissao')
+                except TimeoutException:
+                    self.log("  ⚠️ Página de resultados ainda carregando")
                 
                 # Verificar se há erro na página
                 if "erro" in self.driver.page_source.lower():
@@ -441,17 +461,20 @@ class DJEScraperDebug:
 
     def extrair_publicacoes_debug(self, data_inicio: datetime, data_fim: datetime, pause_between_steps: bool = True) -> List[Dict[str, Any]]:
         """Versão debug com navegação completa em cada resultado e paginação"""
-        driver = self.get_driver()
+        with metrics.stage('driver'):
+            driver = self.get_driver()
         if not driver:
             self.log("❌ Driver não está operacional. Abortando extração.")
             return []
 
         self.log(f"🕷️ Iniciando extração COMPLETA de {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}")
+        self._periodo = (data_inicio, data_fim)
         
         try:
             # Etapa 1: Acessar o site
             self.log("📍 Etapa 1: Acessando o site do DJE...")
-            driver.get(self.base_url)
+            with self._agendar(), metrics.stage('navegacao'):
+                driver.get(self.base_url)
             
             # Aguardar carregamento completo
             self.log("  ⏳ Aguardando carregamento completo da página...")
@@ -462,7 +485,9 @@ class DJEScraperDebug:
 
             # Etapa 2: Preencher formulário
             self.log("📍 Etapa 2: Preenchendo formulário...")
-            if not self._preencher_formulario(data_inicio, data_fim):
+            with metrics.stage('formulario'):
+                formulario_ok = self._preencher_formulario(data_inicio, data_fim)
+            if not formulario_ok:
                 self.log("❌ Falha ao preencher formulário. Abortando.")
                 return []
             
@@ -472,7 +497,10 @@ class DJEScraperDebug:
             # Etapa 3: Processar TODAS as páginas de resultados
             self.log("📍 Etapa 3: Processando TODAS as páginas de resultados...")
             all_publicacoes = []
+            # PDFs em download/extração enquanto a navegação continua
+            pdfs_pendentes = deque()
             page_num = 1
+            total_paginas = None
             
             while True:
                 self.log(f"  📄 Processando página {page_num}...")
@@ -480,27 +508,29 @@ class DJEScraperDebug:
                 try:
                     # Aguardar div de resultados
                     self.log(f"    ⏳ Aguardando div de resultados da página {page_num}...")
-                    self.wait.until(EC.presence_of_element_located((By.ID, "divResultadosInferior")))
-                    time.sleep(3)
+                    resultados_element = self.waits.wait_for_element(driver, By.ID, "divResultadosInferior", 'resultados')
                     
-                    # Verificar se há erro na página
-                    page_source = driver.page_source.lower()
+                    # Um único page_source por página, reaproveitado em todas as verificações
+                    html_resultados = driver.page_source
+                    page_source = html_resultados.lower()
                     if "erro" in page_source or "error" in page_source:
                         self.log(f"    ⚠️ Possível erro detectado na página {page_num}")
                     
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
+                    self._capturar('result_page', driver.current_url, html_resultados, pagina=page_num)
+                    with metrics.stage('parse_pagina'):
+                        resultado_pagina = parse_result_page(html_resultados, page_num)
+                    metrics.count_pagina('ok')
                     
                     # DEBUG: Verificar conteúdo da página
                     self.log(f"    🔍 URL atual: {driver.current_url}")
                     self.log(f"    🔍 Título da página: {driver.title}")
                     
                     # Verificar se há div de resultados
-                    div_resultados = soup.find('div', id='divResultadosInferior')
-                    if div_resultados:
-                        self.log(f"    📋 Div divResultadosInferior encontrado com {len(div_resultados.get_text())} caracteres")
+                    if resultado_pagina.tem_resultados:
+                        self.log(f"    📋 Div divResultadosInferior encontrado com {len(resultado_pagina.texto)} caracteres")
                         
                         # Verificar se há texto "nenhum resultado"  
-                        texto_resultados = div_resultados.get_text().lower()
+                        texto_resultados = resultado_pagina.texto.lower()
                         if "nenhum" in texto_resultados or "não foram encontrados" in texto_resultados or "sem resultados" in texto_resultados:
                             self.log(f"    ℹ️ Mensagem de nenhum resultado detectada na página {page_num}")
                             if page_num == 1:
@@ -508,13 +538,10 @@ class DJEScraperDebug:
                                 break
                         
                         # Verificar quantidade de resultados
-                        total_text = driver.page_source
-                        if "Resultados 1 a" in total_text:
-                            import re
-                            match = re.search(r'Resultados \d+ a \d+ de (\d+)', total_text)
-                            if match:
-                                total = int(match.group(1))
-                                self.log(f"    📊 Total de resultados encontrados: {total}")
+                        if total_paginas is None:
+                            total_paginas = calcular_ultima_pagina(html_resultados, page_num)
+                            if total_paginas is not None:
+                                self.log(f"    📊 Resultados em {total_paginas} páginas")
                     else:
                         self.log(f"    ⚠️ Div divResultadosInferior não encontrado na página {page_num}")
                     
@@ -562,15 +589,26 @@ class DJEScraperDebug:
                                 # Clicar no link "Visualizar" para abrir o PDF
                                 self.log(f"        🖱️ Clicando em 'Visualizar' do item {i}...")
                                 
+                                # Número do processo na linha do resultado, usado para extrair só o trecho do PDF
+                                numero_processo_resultado = self._numero_processo_do_resultado(element)
+                                if self._processo_ja_armazenado(numero_processo_resultado):
+                                    self.log(f"        ⏭️ Processo {numero_processo_resultado} já armazenado, PDF não será baixado")
+                                    continue
+                                
                                 # Salvar a janela atual
                                 janela_principal = driver.current_window_handle
+                                janelas_antes = driver.window_handles
                                 
                                 # Clicar no elemento (que vai abrir nova janela/aba)
-                                if not self._safe_click(element):
-                                    self.log(f"        ❌ Falha ao clicar no link. Tentando próximo...")
-                                    continue
-                                
-                                time.sleep(3)
+                                with self._agendar(), metrics.stage('abrir_publicacao'):
+                                    if not self._safe_click(element):
+                                        self.log(f"        ❌ Falha ao clicar no link. Tentando próximo...")
+                                        continue
+                                    
+                                    try:
+                                        self.waits.wait_for_new_window(driver, janelas_antes, 'janela_publicacao')
+                                    except TimeoutException:
+                                        self.log(f"        ⚠️ Nenhuma nova janela aberta para o item {i}")
                                 
                                 # Verificar se nova janela foi aberta
                                 todas_janelas = driver.window_handles
@@ -582,7 +620,10 @@ class DJEScraperDebug:
                                             break
                                     
                                     self.log(f"        📋 Nova janela aberta: {driver.current_url}")
-                                    time.sleep(5)  # Aguardar carregamento completo
+                                    try:
+                                        self.waits.wait_for_document_ready(driver, 'carregamento_publicacao')
+                                    except TimeoutException:
+                                        self.log(f"        ⚠️ Janela da publicação ainda carregando")
                                     
                                     # Procurar pelo frame que contém o PDF
                                     try:
@@ -594,6 +635,7 @@ class DJEScraperDebug:
                                         
                                         # Tentar encontrar URL do PDF no HTML
                                         page_source = driver.page_source
+                                        self._capturar('detail_page', driver.current_url, page_source, pagina=page_num)
                                         
                                         # Procurar por URLs de PDF no código fonte
                                         import re
@@ -656,26 +698,21 @@ class DJEScraperDebug:
                                                 self.log(f"        ⚠️ Erro ao acessar frame {frame_idx}: {e}")
                                                 driver.switch_to.default_content()
                                     
-                                    # Extrair dados usando PDF ou HTML
+                                    # Extrair dados usando PDF (em segundo plano) ou HTML
                                     if pdf_url:
-                                        self.log(f"        📥 Baixando e processando PDF: {pdf_url}")
-                                        texto_pdf = self._download_pdf_text(pdf_url)
-                                        if texto_pdf:
-                                            publicacao_data = self._extrair_dados_do_texto(texto_pdf, pdf_url)
-                                            self.log(f"        ✅ Dados extraídos do PDF")
-                                        else:
-                                            self.log(f"        ⚠️ Não foi possível extrair texto do PDF, usando HTML")
-                                            publicacao_data = self._extrair_dados_do_texto(page_source, driver.current_url)
+                                        self.log(f"        📥 PDF agendado para download e extração: {pdf_url}")
+                                        future = self.pdf_extractor.submit(
+                                            pdf_url,
+                                            on_download=self._capturar_pdf,
+                                            numero_processo=numero_processo_resultado
+                                        )
+                                        pdfs_pendentes.append((future, pdf_url, page_source, driver.current_url))
                                     else:
                                         self.log(f"        ⚠️ PDF não encontrado, usando HTML da página")
                                         publicacao_data = self._extrair_dados_do_texto(page_source, driver.current_url)
+                                        self._registrar_publicacao(publicacao_data, all_publicacoes)
                                     
-                                    if publicacao_data:
-                                        all_publicacoes.append(publicacao_data)
-                                        self.log(f"        ✅ Publicação processada: {publicacao_data.get('numero_processo', 'N/A')}")
-                                        self.log(f"        📋 JSON: {publicacao_data}")
-                                    else:
-                                        self.log(f"        ⚠️ Não foi possível extrair dados desta publicação")
+                                    self._coletar_pdfs(pdfs_pendentes, all_publicacoes)
                                         
                             except Exception as e:
                                 self.log(f"        ❌ Erro ao processar publicação {i}: {e}")
@@ -691,6 +728,11 @@ class DJEScraperDebug:
                                     self.log(f"        ⚠️ Erro na limpeza: {cleanup_error}")
                                 continue
                 
+                    # Com o total conhecido, a última página dispensa a busca pelo link "Próximo"
+                    if total_paginas is not None and page_num >= total_paginas:
+                        self.log(f"    🏁 Última página ({total_paginas}) processada")
+                        break
+                    
                     # Tentar ir para a próxima página
                     self.log(f"    🔄 Procurando link para próxima página...")
                     try:
@@ -705,7 +747,7 @@ class DJEScraperDebug:
                             
                             # Clicar no botão próximo
                             if self._safe_click(next_button):
-                                time.sleep(4)
+                                self._aguardar_troca_de_pagina(resultados_element)
                                 page_num += 1
                                 next_page_found = True
                                 self.log(f"    📄 Navegou para página {page_num}")
@@ -724,7 +766,7 @@ class DJEScraperDebug:
                                 
                                 self.log(f"    📄 Link da página {next_page_num} encontrado")
                                 if self._safe_click(page_link):
-                                    time.sleep(4)
+                                    self._aguardar_troca_de_pagina(resultados_element)
                                     page_num = next_page_num
                                     next_page_found = True
                                     self.log(f"    📄 Navegou para página {page_num}")
@@ -746,7 +788,12 @@ class DJEScraperDebug:
                     self.log(f"    ❌ Erro ao processar página {page_num}: {e}")
                     break
             
+            if pdfs_pendentes:
+                self.log(f"⏳ Aguardando {len(pdfs_pendentes)} PDFs em processamento...")
+                self._coletar_pdfs(pdfs_pendentes, all_publicacoes, aguardar=True)
+            
             self.log(f"🎉 Extração concluída! Total de publicações extraídas: {len(all_publicacoes)}")
+            self.log(f"⏱️ Tempos de espera: {self.waits.resumo()}")
             
             # Log resumo final
             if all_publicacoes:
@@ -760,34 +807,65 @@ class DJEScraperDebug:
             self.log(f"❌ Erro fatal durante a extração: {e}")
             return []
 
+    def _coletar_pdfs(self, pendentes: deque, all_publicacoes: List[Dict[str, Any]], aguardar: bool = False):
+        """Processa, na ordem de agendamento, os PDFs cujo texto já foi extraído"""
+        while pendentes and (aguardar or pendentes[0][0].done()):
+            future, pdf_url, page_source, url_pagina = pendentes.popleft()
+            try:
+                texto_pdf = future.result()
+            except Exception as e:
+                self.log(f"        ⚠️ Erro ao processar PDF {pdf_url}: {e}")
+                texto_pdf = ""
+            
+            if texto_pdf:
+                publicacao_data = self._extrair_dados_do_texto(texto_pdf, pdf_url)
+                self.log(f"        ✅ Dados extraídos do PDF {pdf_url}")
+            else:
+                self.log(f"        ⚠️ Não foi possível extrair texto do PDF, usando HTML")
+                publicacao_data = self._extrair_dados_do_texto(page_source, url_pagina)
+            self._registrar_publicacao(publicacao_data, all_publicacoes)
+
+    def _registrar_publicacao(self, publicacao_data: Dict[str, Any], all_publicacoes: List[Dict[str, Any]]):
+        if publicacao_data:
+            all_publicacoes.append(publicacao_data)
+            self.log(f"        ✅ Publicação processada: {publicacao_data.get('numero_processo', 'N/A')}")
+            self.log(f"        📋 JSON: {publicacao_data}")
+        else:
+            self.log(f"        ⚠️ Não foi possível extrair dados desta publicação")
+
     def _extrair_dados_do_texto(self, texto: str, url_origem: str) -> Dict[str, Any]:
         """Extrai dados estruturados do texto (PDF ou HTML)"""
+        with metrics.stage('extracao_publicacao'):
+            return self._extrair_campos_do_texto(texto, url_origem)
+
+    def _extrair_campos_do_texto(self, texto: str, url_origem: str) -> Dict[str, Any]:
         try:
-            # Extrair número do processo com padrões mais específicos
-            numero_processo = self._extrair_numero_processo(texto)
+            # Uma única varredura extrai todos os campos
+            campos = self.rpv_extractor.extract(texto)
+            numero_processo = campos.numero_processo
             if not numero_processo:
                 self.log("⚠️ Número do processo não encontrado no texto")
                 return None
             
             # Extrair data de disponibilização
-            data_disponibilizacao = self._extrair_data_disponibilizacao(texto)
+            data_disponibilizacao = campos.data_disponibilizacao
             if not data_disponibilizacao:
                 self.log("⚠️ Data de disponibilização não encontrada, usando data atual")
                 data_disponibilizacao = datetime.now()
             
             # Extrair informações de RPV específicas
-            autor_info = self._extrair_autor_rpv(texto)
+            autor_info = campos.autor
             if not autor_info:
                 self.log("⚠️ Autor não encontrado no texto")
                 autor_info = "Autor não identificado"
             
-            advogado_info = self._extrair_advogado_rpv(texto)
+            advogado_info = campos.advogado
             if not advogado_info:
                 self.log("⚠️ Advogado não encontrado no texto")
                 advogado_info = "Advogado não identificado"
             
             # Extrair valores monetários específicos para RPV
-            valores = self._extrair_valores_rpv(texto)
+            valores = campos.valores
             
             # Log dos valores encontrados
             if any(valores.values()):
@@ -796,7 +874,7 @@ class DJEScraperDebug:
                 self.log("⚠️ Nenhum valor monetário encontrado")
             
             # Verificar se é realmente uma RPV
-            if not self._verificar_se_rpv(texto):
+            if not self._verificar_se_rpv(texto, campos):
                 self.log("⚠️ Texto não parece ser uma RPV")
                 return None
             
@@ -821,245 +899,31 @@ class DJEScraperDebug:
             self.log(f"❌ Erro ao extrair dados do texto: {e}")
             return None
 
-    def _verificar_se_rpv(self, texto: str) -> bool:
+    def _verificar_se_rpv(self, texto: str, campos: RpvFields = None) -> bool:
         """Verifica se o texto é realmente uma RPV"""
-        texto_lower = texto.lower()
-        
-        # Termos que indicam RPV
-        termos_rpv = [
-            'rpv',
-            'requisição de pequeno valor',
-            'requisitório de pequeno valor',
-            'requisição de pagamento',
-            'ofício requisitório'
-        ]
-        
-        # Termos que devem estar presentes
-        termos_obrigatorios = [
-            'inss',
-            'instituto nacional',
-            'seguro social'
-        ]
-        
-        # Termos que indicam pagamento
-        termos_pagamento = [
-            'valor',
-            'pagamento',
-            'crédito',
-            'depósito',
-            'requisitado'
-        ]
-        
-        # Verificar termos RPV (pelo menos 1)
-        tem_rpv = any(termo in texto_lower for termo in termos_rpv)
-        
-        # Verificar termos obrigatórios (pelo menos 2)
-        tem_obrigatorios = sum(1 for termo in termos_obrigatorios if termo in texto_lower) >= 2
-        
-        # Verificar termos de pagamento (pelo menos 1)
-        tem_pagamento = any(termo in texto_lower for termo in termos_pagamento)
-        
-        # Verificar se tem número de processo
-        tem_processo = bool(self._extrair_numero_processo(texto))
-        
-        # Verificar se tem algum valor monetário
-        tem_valor = any(self._extrair_valores_rpv(texto).values())
-        
-        # Verificar se tem data
-        tem_data = bool(self._extrair_data_disponibilizacao(texto))
-        
-        # Calcular pontuação
-        pontos = 0
-        if tem_rpv: pontos += 3
-        if tem_obrigatorios: pontos += 2
-        if tem_pagamento: pontos += 1
-        if tem_processo: pontos += 2
-        if tem_valor: pontos += 2
-        if tem_data: pontos += 1
-        
-        # Logar resultado
-        self.log(f"🔍 Análise do texto:")
-        self.log(f"  - Termos RPV: {'✅' if tem_rpv else '❌'}")
-        self.log(f"  - Termos obrigatórios: {'✅' if tem_obrigatorios else '❌'}")
-        self.log(f"  - Termos pagamento: {'✅' if tem_pagamento else '❌'}")
-        self.log(f"  - Número processo: {'✅' if tem_processo else '❌'}")
-        self.log(f"  - Valor monetário: {'✅' if tem_valor else '❌'}")
-        self.log(f"  - Data: {'✅' if tem_data else '❌'}")
-        self.log(f"  📊 Pontuação total: {pontos}/11")
-        
-        # Retornar true se tiver pontuação mínima
-        return pontos >= 7
+        classificacao = self.rpv_classifier.classify(texto, campos)
+        self.log(f"🔍 Análise do texto: {classificacao.resumo()}")
+        return classificacao.e_rpv
 
     def _extrair_numero_processo(self, texto: str) -> str:
         """Extrai número do processo com padrões específicos"""
-        # Padrão padrão: 0000000-00.0000.0.00.0000
-        patterns = [
-            r'\b\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4}\b',
-            r'\b\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}\b',
-            r'Processo\s+n[ºo°\.]*\s*(\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4})',
-            r'Proc\.*\s*(\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4})',
-            r'Autos\s+n[ºo°\.]*\s*(\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, texto, re.IGNORECASE)
-            if match:
-                numero = match.group(1) if len(match.groups()) > 0 else match.group(0)
-                # Validar formato
-                if re.match(r'^\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4}$', numero):
-                    return numero
-        return None
+        return self.rpv_extractor.extract(texto).numero_processo
 
     def _extrair_data_disponibilizacao(self, texto: str) -> datetime:
         """Extrai data de disponibilização"""
-        patterns = [
-            r'(\d{2}/\d{2}/\d{4})',
-            r'data[:\s]+(\d{2}/\d{2}/\d{4})',
-            r'disponibiliza[^:]*:?\s*(\d{2}/\d{2}/\d{4})',
-            r'publicad[oa]\s+em[:\s]*(\d{2}/\d{2}/\d{4})',
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, texto, re.IGNORECASE)
-            if match:
-                try:
-                    if len(match.groups()) == 3:  # Formato "1 de janeiro de 2025"
-                        dia, mes_nome, ano = match.groups()
-                        meses = {'janeiro': 1, 'fevereiro': 2, 'março': 3, 'abril': 4, 'maio': 5, 'junho': 6,
-                               'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12}
-                        mes = meses.get(mes_nome.lower())
-                        if mes:
-                            return datetime(int(ano), mes, int(dia))
-                    else:
-                        data_str = match.group(1).strip() if len(match.groups()) > 0 else match.group(0)
-                        return datetime.strptime(data_str, "%d/%m/%Y")
-                except:
-                    continue
-        return None
+        return self.rpv_extractor.extract(texto).data_disponibilizacao
 
     def _extrair_autor_rpv(self, texto: str) -> str:
         """Extrai informações do autor em casos de RPV"""
-        patterns = [
-            r'(?:Requerente|Autor|Exequente|Beneficiário)[:\s]*([^,\n\r]+?)(?:\s+(?:CPF|RG|contra)|,|\n|\r|$)',
-            r'RPV\s+em\s+favor\s+de[:\s]*([^,\n\r]+?)(?:\s+(?:CPF|RG|contra)|,|\n|\r|$)',
-            r'beneficiário[:\s]*([^,\n\r]+?)(?:\s+(?:CPF|RG|contra)|,|\n|\r|$)',
-            r'em\s+face\s+de[:\s]*([^,\n\r]+?)(?:\s+(?:CPF|RG|contra)|,|\n|\r|$)',
-            r'(?:Requerente|Autor|Exequente|Beneficiário)[:\s]*([^,\n\r]+?)(?=\s+(?:CPF|RG|contra|x|versus|vs\.?|,|\n|\r|$))',
-            r'(?<=\bde\s)([A-ZÇÁÉÍÓÚÂÊÎÔÛÃÕ][a-zçáéíóúâêîôûãõ]+(?:\s+[A-ZÇÁÉÍÓÚÂÊÎÔÛÃÕ][a-zçáéíóúâêîôûãõ]+)*)',
-            r'(?<=\ba\s)([A-ZÇÁÉÍÓÚÂÊÎÔÛÃÕ][a-zçáéíóúâêîôûãõ]+(?:\s+[A-ZÇÁÉÍÓÚÂÊÎÔÛÃÕ][a-zçáéíóúâêîôûãõ]+)*)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, texto, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                autor = match.group(1).strip()
-                # Limpar texto desnecessário
-                autor = re.sub(r'\s+', ' ', autor)
-                autor = re.sub(r'[,\.\:]$', '', autor)
-                # Validar nome próprio
-                if (len(autor.split()) >= 2 and  # Pelo menos nome e sobrenome
-                    all(word.istitle() for word in autor.split()) and  # Todas palavras capitalizadas
-                    not re.search(r'\d', autor) and  # Sem números
-                    len(autor) > 5):  # Tamanho mínimo
-                    return autor
-        return None
+        return self.rpv_extractor.extract(texto).autor
 
     def _extrair_advogado_rpv(self, texto: str) -> str:
         """Extrai informações do advogado em casos de RPV"""
-        patterns = [
-            r'Advogad[oa][:\s]*([^(\n\r]+?)\s*\(OAB[:\s]*(\d+/[A-Z]{2})\)',
-            r'Dr[aª]?\.\s*([^(\n\r]+?)\s*\(OAB[:\s]*(\d+/[A-Z]{2})\)',
-            r'([A-ZÁÊÇ][a-záêçõã]+(?:\s+[A-ZÁÊÇ][a-záêçõã]+)*)\s*\(OAB[:\s]*(\d+/[A-Z]{2})\)',
-            r'representad[oa]\s+por[:\s]*([^(\n\r]+?)\s*\(OAB[:\s]*(\d+/[A-Z]{2})\)',
-            r'Advogad[oa][:\s]*([^(\n\r]+?)\s*OAB[:\s]*(\d+/[A-Z]{2})',
-            r'Dr[aª]?\.\s*([^(\n\r]+?)\s*OAB[:\s]*(\d+/[A-Z]{2})',
-            r'([A-ZÁÊÇ][a-záêçõã]+(?:\s+[A-ZÁÊÇ][a-záêçõã]+)*)\s*OAB[:\s]*(\d+/[A-Z]{2})'
-        ]
-        
-        advogados = []
-        for pattern in patterns:
-            matches = re.finditer(pattern, texto, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                nome = match.group(1).strip()
-                oab = match.group(2).strip() if len(match.groups()) > 1 else ''
-                # Limpar nome
-                nome = re.sub(r'\s+', ' ', nome)
-                nome = re.sub(r'[,\.\:]$', '', nome)
-                # Validar nome próprio
-                if (len(nome.split()) >= 2 and  # Pelo menos nome e sobrenome
-                    all(word.istitle() for word in nome.split()) and  # Todas palavras capitalizadas
-                    not re.search(r'\d', nome) and  # Sem números
-                    len(nome) > 5):  # Tamanho mínimo
-                    advogado_info = f"{nome} (OAB: {oab})" if oab else nome
-                    if advogado_info not in advogados:
-                        advogados.append(advogado_info)
-        
-        return ', '.join(advogados) if advogados else None
+        return self.rpv_extractor.extract(texto).advogado
 
     def _extrair_valores_rpv(self, texto: str) -> Dict[str, float]:
         """Extrai valores monetários específicos para RPV"""
-        valores = {'bruto': None, 'liquido': None, 'juros': None, 'honorarios': None}
-        
-        # Padrões para valores monetários
-        patterns = {
-            'bruto': [
-                r'valor\s+principal\s+bruto[:\s]*R?\$?\s*([\d.,]+)',
-                r'principal\s+bruto[:\s]*R?\$?\s*([\d.,]+)',
-                r'valor\s+bruto[:\s]*R?\$?\s*([\d.,]+)',
-                r'montante\s+bruto[:\s]*R?\$?\s*([\d.,]+)',
-                r'valor\s+total\s+bruto[:\s]*R?\$?\s*([\d.,]+)',
-                r'total\s+bruto[:\s]*R?\$?\s*([\d.,]+)',
-                r'valor\s+da\s+execução[:\s]*R?\$?\s*([\d.,]+)',
-                r'valor\s+executado[:\s]*R?\$?\s*([\d.,]+)'
-            ],
-            'liquido': [
-                r'valor\s+principal\s+líquido[:\s]*R?\$?\s*([\d.,]+)',
-                r'principal\s+líquido[:\s]*R?\$?\s*([\d.,]+)',
-                r'valor\s+líquido[:\s]*R?\$?\s*([\d.,]+)',
-                r'montante\s+líquido[:\s]*R?\$?\s*([\d.,]+)',
-                r'valor\s+total\s+líquido[:\s]*R?\$?\s*([\d.,]+)',
-                r'total\s+líquido[:\s]*R?\$?\s*([\d.,]+)',
-                r'valor\s+final[:\s]*R?\$?\s*([\d.,]+)',
-                r'valor\s+devido[:\s]*R?\$?\s*([\d.,]+)'
-            ],
-            'juros': [
-                r'juros\s+moratórios[:\s]*R?\$?\s*([\d.,]+)',
-                r'juros[:\s]*R?\$?\s*([\d.,]+)',
-                r'moratórios[:\s]*R?\$?\s*([\d.,]+)',
-                r'correção\s+monetária[:\s]*R?\$?\s*([\d.,]+)',
-                r'juros\s+de\s+mora[:\s]*R?\$?\s*([\d.,]+)',
-                r'juros\s+legais[:\s]*R?\$?\s*([\d.,]+)',
-                r'atualização\s+monetária[:\s]*R?\$?\s*([\d.,]+)',
-                r'valor\s+dos\s+juros[:\s]*R?\$?\s*([\d.,]+)'
-            ],
-            'honorarios': [
-                r'honorários\s+advocatícios[:\s]*R?\$?\s*([\d.,]+)',
-                r'honorários[:\s]*R?\$?\s*([\d.,]+)',
-                r'advocatícios[:\s]*R?\$?\s*([\d.,]+)',
-                r'sucumbência[:\s]*R?\$?\s*([\d.,]+)',
-                r'honorários\s+sucumbenciais[:\s]*R?\$?\s*([\d.,]+)',
-                r'verba\s+honorária[:\s]*R?\$?\s*([\d.,]+)',
-                r'honorários\s+contratuais[:\s]*R?\$?\s*([\d.,]+)',
-                r'honorários\s+de\s+sucumbência[:\s]*R?\$?\s*([\d.,]+)'
-            ]
-        }
-        
-        for tipo, pattern_list in patterns.items():
-            for pattern in pattern_list:
-                matches = re.finditer(pattern, texto, re.IGNORECASE | re.MULTILINE)
-                for match in matches:
-                    try:
-                        valor_str = match.group(1).replace('.', '').replace(',', '.')
-                        valor = float(valor_str)
-                        # Validar valor
-                        if 0 < valor < 1000000:  # Entre R$ 0,01 e R$ 1.000.000,00
-                            valores[tipo] = valor
-                            break  # Parar no primeiro valor válido para cada tipo
-                    except ValueError:
-                        continue
-        
-        return valores
+        return dict(self.rpv_extractor.extract(texto).valores)
 
     def take_screenshot(self, filename: str = None):
         """Tira screenshot da página atual"""
@@ -1122,16 +986,23 @@ class DJEScraperDebug:
                         cls._instance.driver.quit()
                 except:
                     pass
+                if getattr(cls._instance, 'pdf_extractor', None):
+                    cls._instance.pdf_extractor.close()
             cls._instance = None
             print("🔄 Instância singleton resetada")
 
+    def _aguardar_troca_de_pagina(self, resultados_element):
+        """Aguarda os resultados da página anterior saírem do DOM após a paginação"""
+        try:
+            self.waits.wait_for_staleness(self.driver, resultados_element, 'paginacao')
+        except TimeoutException:
+            self.log("    ⚠️ Resultados da página anterior ainda presentes")
+
     def _wait_for_page_load(self, timeout=30):
         """Aguarda o carregamento completo da página"""
         try:
             # Aguardar documento estar pronto
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
+            self.waits.wait_for_document_ready(self.driver, 'carregamento_pagina', timeout)
             
             # Aguardar jQuery terminar (se existir)
             try:
@@ -1160,8 +1031,6 @@ class DJEScraperDebug:
             except:
                 pass  # Elementos podem não existir
             
-            # Aguardar um pouco mais
-            time.sleep(3)
             self.log("    ✅ Página carregada completamente")
             
         except Exception as e:
@@ -1194,15 +1063,14 @@ class DJEScraperDebug:
                     """, element)
                     
                     if is_ready:
-                        # Scroll para o elemento usando JavaScript
+                        # Scroll instantâneo para o elemento (dispensa aguardar animação)
                         self.driver.execute_script("""
                             arguments[0].scrollIntoView({
-                                behavior: 'smooth', 
+                                behavior: 'instant', 
                                 block: 'center',
                                 inline: 'center'
                             });
                         """, element)
-                        time.sleep(1)  # Aguardar scroll completar
                         
                         # Verificar novamente após scroll
                         element = self.driver.find_element(by, value)
@@ -1229,8 +1097,7 @@ class DJEScraperDebug:
         for i in range(retries):
             try:
                 # Scroll para o elemento
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-                time.sleep(1)
+                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", element)
                 
                 # Tentar click normal
                 try:
@@ -1269,8 +1136,7 @@ class DJEScraperDebug:
         """Envia texto de forma segura"""
         try:
             # Scroll para o elemento
-            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-            time.sleep(1)
+            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", element)
             
             # Limpar campo
             if clear_first:
@@ -1313,53 +1179,63 @@ class DJEScraperDebug:
             self.log(f"    ❌ Falha ao enviar texto para o elemento: {e}")
             return False
 
-    def _download_pdf_text(self, pdf_url: str) -> str:
-        """Baixa e extrai texto do PDF"""
+    def _capturar(self, kind: str, uri: str, content, content_type: str = 'text/html', **meta):
+        """Grava a captura bruta no arquivo de capturas, se configurado"""
+        if self.capture_archive is None:
+            return
+        if self._periodo:
+            meta.setdefault('data_inicio', self._periodo[0].isoformat())
+            meta.setdefault('data_fim', self._periodo[1].isoformat())
+        self.capture_archive.write(kind, uri, content, content_type, meta)
+
+    def _download_pdf_text(self, pdf_url: str, numero_processo: str = None) -> str:
+        """Baixa o PDF em memória e extrai o texto no pool de processos (só o trecho do processo, se informado)"""
         try:
-            # Tentar até 3 vezes
-            for attempt in range(3):
-                try:
-                    r = requests.get(pdf_url, timeout=30)
-                    if r.status_code == 200:
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                            tmp.write(r.content)
-                            tmp_path = tmp.name
-                        
-                        text = ""
-                        with pdfplumber.open(tmp_path) as pdf:
-                            pages = [p.extract_text() or "" for p in pdf.pages]
-                            text = "\n".join(pages)
-                        
-                        os.unlink(tmp_path)
-                        
-                        if text.strip():
-                            return text
-                        else:
-                            self.log(f"    ⚠️ PDF baixado mas texto vazio (tentativa {attempt + 1})")
-                    else:
-                        self.log(f"    ⚠️ Erro ao baixar PDF: Status {r.status_code} (tentativa {attempt + 1})")
-                    
-                    if attempt < 2:
-                        time.sleep(5)  # Aguardar antes da próxima tentativa
-                        
-                except Exception as e:
-                    self.log(f"    ⚠️ Erro ao processar PDF: {e} (tentativa {attempt + 1})")
-                    if attempt < 2:
-                        time.sleep(5)
-            
-            return ""
-            
+            return self.pdf_extractor.extract(pdf_url, on_download=self._capturar_pdf, numero_processo=numero_processo)
         except Exception as e:
             self.log(f"    ❌ Erro fatal ao baixar PDF: {e}")
             return ""
 
+    def _numero_processo_do_resultado(self, element) -> str:
+        """Lê o número do processo no texto da linha de resultado que contém o link"""
+        try:
+            texto = element.find_element(By.XPATH, "./ancestor::tr[contains(@class, 'fundocinza1')][1]").text
+        except Exception:
+            try:
+                texto = element.find_element(By.XPATH, "./ancestor::tr[1]").text
+            except Exception:
+                return None
+        return self._extrair_numero_processo(texto)
+
+    def _agendar(self):
+        """Vaga no agendador de requisições ao DJE (sem agendador, não espera)"""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(self.base_url)
+
+    def _processo_ja_armazenado(self, numero_processo: str) -> bool:
+        """Consulta o filtro de processos vistos antes de abrir a janela e baixar o PDF"""
+        if not numero_processo or self.seen_set is None:
+            return False
+        if numero_processo in self.seen_set.known([numero_processo]):
+            return True
+        self.seen_set.add_many([numero_processo])
+        return False
+
+    def _capturar_pdf(self, pdf_url: str, content: bytes):
+        self._capturar('pdf', pdf_url, content, 'application/pdf')
+
     def _extrair_dados_pagina_individual(self, driver) -> Dict[str, Any]:
         """Extrai dados detalhados de uma página individual de publicação"""
         try:
             # Aguardar a página carregar
-            time.sleep(3)
+            try:
+                self.waits.wait_for_document_ready(driver, 'carregamento_publicacao')
+            except TimeoutException:
+                self.log("        ⚠️ Página individual ainda carregando")
             
             html = driver.page_source
+            self._capturar('detail_page', driver.current_url, html)
             pdf_url = self._find_pdf_url(html)
             
             # Se encontrou PDF, baixar e extrair texto
@@ -0,0 +1,190 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Optional
+from app.infrastructure import metrics
+
+def process_tree_rss_mb(pid: int) -> Optional[float]:
+    """Soma o RSS (MB) de um processo e de todos os seus descendentes lendo /proc"""
+    if not pid or not os.path.exists(f'/proc/{pid}'):
+        return None
+
+    total_kb = 0
+    pending = [pid]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        break
+            task_dir = f'/proc/{current}/task'
+            for tid in os.listdir(task_dir):
+                with open(f'{task_dir}/{tid}/children') as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+class WebDriverPool:
+    """
+    Pool de drivers do Chrome por processo de worker. Os drivers são
+    emprestados às tasks, verificados antes de cada empréstimo, limpos
+    na devolução e reciclados após max_uses usos ou acima de max_rss_mb.
+    """
+
+    def __init__(self, driver_factory: Callable, max_idle: int = 1, max_uses: int = 20, max_rss_mb: float = 1024):
+        self.driver_factory = driver_factory
+        self.max_idle = max_idle
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self._idle = deque()
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'created': 0,
+            'recycled': 0,
+            'discarded': 0,
+            'startup_seconds_total': 0.0,
+            'last_startup_seconds': None,
+        }
+
+    def acquire(self):
+        """Empresta um driver saudável do pool ou cria um novo"""
+        while True:
+            with self._lock:
+                driver = self._idle.popleft() if self._idle else None
+            if driver is None:
+                break
+            if self._is_healthy(driver):
+                with self._lock:
+                    self._stats['hits'] += 1
+                metrics.count_driver_lease('hit')
+                return driver
+            logging.warning("Driver ocioso não respondeu ao health check, descartando")
+            self.discard(driver)
+
+        with self._lock:
+            self._stats['misses'] += 1
+        metrics.count_driver_lease('miss')
+        return self._create()
+
+    def release(self, driver):
+        """Devolve um driver ao pool, limpando o estado ou reciclando-o"""
+        if driver is None:
+            return
+
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+
+        rss_mb = self._driver_rss_mb(driver)
+        if uses >= self.max_uses or (rss_mb is not None and rss_mb > self.max_rss_mb):
+            logging.info(f"Reciclando driver após {uses} usos (RSS: {rss_mb if rss_mb is not None else 'n/d'} MB)")
+            with self._lock:
+                self._stats['recycled'] += 1
+            metrics.count_driver('recycled')
+            self._quit(driver)
+            return
+
+        if not self._reset_state(driver):
+            self.discard(driver)
+            return
+
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(driver)
+                return
+        self._quit(driver)
+
+    def discard(self, driver):
+        """Remove definitivamente um driver com problemas"""
+        with self._lock:
+            self._stats['discarded'] += 1
+        metrics.count_driver('discarded')
+        self._quit(driver)
+
+    def warm(self, count: int = None):
+        """Pré-inicializa drivers até preencher o pool ocioso"""
+        count = self.max_idle if count is None else min(count, self.max_idle)
+        while True:
+            with self._lock:
+                if len(self._idle) >= count:
+                    return
+            driver = self._create()
+            with self._lock:
+                self._idle.append(driver)
+
+    def close_all(self):
+        with self._lock:
+            drivers = list(self._idle)
+            self._idle.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle'] = len(self._idle)
+        leases = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / leases, 4) if leases else None
+        stats['avg_startup_seconds'] = round(stats['startup_seconds_total'] / stats['created'], 3) if stats['created'] else None
+        return stats
+
+    def _create(self):
+        inicio = time.monotonic()
+        driver = self.driver_factory()
+        elapsed = time.monotonic() - inicio
+        with self._lock:
+            self._stats['created'] += 1
+            self._stats['startup_seconds_total'] += elapsed
+            self._stats['last_startup_seconds'] = round(elapsed, 3)
+            self._uses[id(driver)] = 0
+        metrics.count_driver('created')
+        metrics.observe_driver_startup(elapsed)
+        logging.info(f"Novo driver do Chrome iniciado em {elapsed:.2f}s")
+        return driver
+
+    def _is_healthy(self, driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset_state(self, driver) -> bool:
+        """Fecha janelas extras, apaga cookies e volta para about:blank"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logging.warning(f"Falha ao limpar estado do driver: {e}")
+            return False
+
+    def _driver_rss_mb(self, driver) -> Optional[float]:
+        try:
+            return process_tree_rss_mb(driver.service.process.pid)
+        except Exception:
+            return None
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Erro ao fechar driver do pool: {e}")
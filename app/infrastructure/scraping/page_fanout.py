@@ -0,0 +1,114 @@
+import re
+import math
+import logging
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Any
+from urllib.parse import urlparse
+
+TOTAL_RESULTADOS_PATTERN = re.compile(r'Resultados\s+(\d+)\s+a\s+(\d+)\s+de\s+(\d+)', re.IGNORECASE)
+
+_host_semaphores: Dict[Tuple[str, int], threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+def parse_total_resultados(html: str) -> Optional[Tuple[int, int]]:
+    """Extrai (itens por página, total) do texto 'Resultados 1 a X de N'"""
+    match = TOTAL_RESULTADOS_PATTERN.search(html)
+    if not match:
+        return None
+    inicio, fim, total = (int(g) for g in match.groups())
+    por_pagina = fim - inicio + 1
+    if por_pagina <= 0:
+        return None
+    return por_pagina, total
+
+def calcular_ultima_pagina(html: str, page_num: int) -> Optional[int]:
+    """
+    Última página de resultados a partir de 'Resultados X a Y de N' da página
+    page_num. Conta só o que falta depois de Y: a página atual pode ser a última,
+    mais curta que as demais (retomada por checkpoint), e não serve de tamanho.
+    """
+    match = TOTAL_RESULTADOS_PATTERN.search(html)
+    if not match:
+        return None
+    inicio, fim, total = (int(g) for g in match.groups())
+    if fim >= total:
+        return page_num
+    por_pagina = fim - inicio + 1
+    if por_pagina <= 0:
+        return None
+    return page_num + math.ceil((total - fim) / por_pagina)
+
+def calcular_paginas(total: int, por_pagina: int) -> int:
+    """Quantidade de páginas de resultados para um total conhecido"""
+    if total <= 0 or por_pagina <= 0:
+        return 0
+    return math.ceil(total / por_pagina)
+
+def host_semaphore(url: str, limit: int) -> threading.BoundedSemaphore:
+    """Semáforo compartilhado no processo que limita requisições simultâneas por host"""
+    host = urlparse(url).netloc
+    key = (host, limit)
+    with _host_semaphores_lock:
+        if key not in _host_semaphores:
+            _host_semaphores[key] = threading.BoundedSemaphore(limit)
+        return _host_semaphores[key]
+
+class PageFanout:
+    """Busca páginas de resultados em paralelo com pool limitado e teto por host"""
+
+    def __init__(self, url: str, max_workers: int = 4, max_per_host: int = 2):
+        self.max_workers = max(1, max_workers)
+        self.semaphore = host_semaphore(url, max(1, max_per_host))
+
+    def fetch(self, pages: Iterable[int], fetch_page: Callable[[int], Any]) -> Tuple[Dict[int, Any], Dict[int, str]]:
+        """
+        Executa fetch_page para cada página. Retorna (resultados, falhas), ambos
+        indexados pelo número da página para permitir remontagem em ordem.
+        """
+        resultados: Dict[int, Any] = {}
+        falhas: Dict[int, str] = {}
+        for page_num, resultado, erro in self.iter_fetch(pages, fetch_page):
+            if erro is None:
+                resultados[page_num] = resultado
+            else:
+                falhas[page_num] = erro
+        return resultados, falhas
+
+    def iter_fetch(self, pages: Iterable[int], fetch_page: Callable[[int], Any]) -> Iterator[Tuple[int, Any, Optional[str]]]:
+        """
+        Gera (page_num, resultado, erro) na ordem das páginas assim que cada uma
+        fica pronta. No máximo 2 * max_workers páginas ficam em voo ou à espera
+        do consumidor, o que limita a memória em períodos longos.
+        """
+        pages = list(pages)
+        if not pages:
+            return
+
+        def _limited(page_num: int):
+            with self.semaphore:
+                return fetch_page(page_num)
+
+        # Cada página roda numa cópia do contexto do consumidor (rótulos das métricas)
+        def _submit(executor, page_num: int):
+            return executor.submit(contextvars.copy_context().run, _limited, page_num)
+
+        janela = 2 * self.max_workers
+        pendentes = deque()
+        restantes = iter(pages)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages))) as executor:
+            for page_num in islice(restantes, janela):
+                pendentes.append((page_num, _submit(executor, page_num)))
+            while pendentes:
+                page_num, future = pendentes.popleft()
+                try:
+                    resultado, erro = future.result(), None
+                except Exception as e:
+                    resultado, erro = None, str(e)
+                    logging.error(f"Falha ao buscar página {page_num}: {e}")
+                for proxima in islice(restantes, 1):
+                    pendentes.append((proxima, _submit(executor, proxima)))
+                yield page_num, resultado, erro
@@ -0,0 +1,184 @@
+import io
+import re
+import time
+import logging
+import contextvars
+import threading
+import multiprocessing
+from contextlib import nullcontext
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterator, Optional, Tuple
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+import requests
+from app.infrastructure import metrics
+
+NUMERO_PROCESSO_PATTERN = re.compile(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}')
+
+class PdfTooLargeError(Exception):
+    """PDF excede o tamanho máximo permitido para download"""
+
+def iter_pdf_pages(pdf, start: int = 0, stop: int = None) -> Iterator[Tuple[int, str]]:
+    """Extrai o texto das páginas sob demanda, liberando o cache de cada página em seguida"""
+    for index in range(start, len(pdf.pages) if stop is None else stop):
+        page = pdf.pages[index]
+        try:
+            yield index, page.extract_text() or ""
+        finally:
+            page.flush_cache()
+
+def page_mentions(page, needle: bytes) -> bool:
+    """
+    Pré-varredura barata: procura o trecho nos content streams da página sem
+    montar o layout. Só acha texto gravado literalmente no stream; fontes com
+    codificação própria (CID, hex) ou texto quebrado em vários operadores passam batido.
+    """
+    try:
+        return any(needle in resolve1(stream).get_data() for stream in page.page_obj.contents or [])
+    except Exception:
+        return False
+
+def extract_pdf_text(content: bytes, numero_processo: str = None, max_pages: int = 3) -> str:
+    """
+    Extrai o texto de um PDF em memória (executa no pool de processos). Com
+    numero_processo, extrai só as páginas a partir da que cita o processo e
+    para quando outro processo começa ou após max_pages páginas.
+    """
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        if not numero_processo:
+            return "\n".join(text for _, text in iter_pdf_pages(pdf))
+
+        needle = numero_processo.encode('latin-1')
+        inicio = next((i for i, page in enumerate(pdf.pages) if page_mentions(page, needle)), None)
+        if inicio is None:
+            logging.debug(f"Pré-varredura não achou o processo {numero_processo} nos streams, extraindo desde a primeira página")
+            inicio = 0
+
+        partes = []
+        # Páginas lidas antes de achar o processo, reaproveitadas se ele não aparecer
+        lidas = []
+        encontrado = False
+        for index, text in iter_pdf_pages(pdf, inicio):
+            posicao = 0
+            if not encontrado:
+                posicao = text.find(numero_processo)
+                if posicao < 0:
+                    lidas.append(text)
+                    continue
+                encontrado = True
+            partes.append(text)
+
+            # O bloco termina quando outro número de processo aparece depois do alvo
+            outros = [m for m in NUMERO_PROCESSO_PATTERN.finditer(text, posicao) if m.group(0) != numero_processo]
+            if outros or len(partes) >= max_pages:
+                break
+
+        if not encontrado:
+            logging.info(f"Processo {numero_processo} não encontrado no PDF, usando o texto completo")
+            anteriores = [text for _, text in iter_pdf_pages(pdf, 0, inicio)]
+            return "\n".join(anteriores + lidas)
+        return "\n".join(partes)
+
+def download_pdf(session: requests.Session, url: str, max_bytes: int, timeout: float = 30) -> bytes:
+    """Baixa o PDF em streaming para a memória, abortando acima de max_bytes"""
+    with session.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        content_length = response.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            raise PdfTooLargeError(f"PDF com {content_length} bytes excede o limite de {max_bytes}")
+
+        buffer = io.BytesIO()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            buffer.write(chunk)
+            if buffer.tell() > max_bytes:
+                raise PdfTooLargeError(f"PDF excede o limite de {max_bytes} bytes")
+        return buffer.getvalue()
+
+class PdfTextExtractor:
+    """
+    Baixa PDFs em threads e extrai o texto em um pool de processos limitado,
+    direto da memória. submit() retorna um Future para que o download e o
+    pdfplumber rodem em paralelo à navegação do Selenium.
+    """
+
+    def __init__(self, max_workers: int = 2, download_workers: int = 4, max_bytes: int = 20 * 1024 * 1024,
+                 timeout: float = 30, max_retries: int = 3, backoff: float = 0.5, session: requests.Session = None,
+                 scheduler=None):
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = session or requests.Session()
+        self.scheduler = scheduler
+        self._downloads = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix='pdf-download')
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def submit(self, url: str, on_download: Callable[[str, bytes], None] = None, numero_processo: str = None) -> Future:
+        """Agenda download + extração; o Future resolve para o texto ('' em caso de falha)"""
+        # Cópia do contexto de quem submete: as métricas do download saem com os rótulos da task
+        return self._downloads.submit(contextvars.copy_context().run, self._download_and_extract, url, on_download, numero_processo)
+
+    def extract(self, url: str, on_download: Callable[[str, bytes], None] = None, numero_processo: str = None) -> str:
+        return self.submit(url, on_download, numero_processo).result()
+
+    def close(self):
+        self._downloads.shutdown(wait=False)
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    def _download_and_extract(self, url: str, on_download=None, numero_processo: str = None) -> str:
+        content = self._download(url)
+        if not content:
+            return ""
+        if on_download:
+            try:
+                on_download(url, content)
+            except Exception as e:
+                logging.warning(f"Falha no callback de download do PDF {url}: {e}")
+
+        try:
+            with metrics.stage('extracao_pdf'):
+                text = self._executor().submit(extract_pdf_text, content, numero_processo).result()
+        except Exception as e:
+            logging.warning(f"Erro ao extrair texto do PDF {url}: {e}")
+            return ""
+        if not text.strip():
+            logging.warning(f"PDF baixado mas texto vazio: {url}")
+        return text
+
+    def _download(self, url: str) -> Optional[bytes]:
+        for attempt in range(self.max_retries):
+            try:
+                with self.scheduler.slot(url) if self.scheduler else nullcontext(), metrics.stage('download_pdf'):
+                    # PDF grande demais não é sinal de carga no site: tratado dentro da vaga
+                    try:
+                        return download_pdf(self.session, url, self.max_bytes, self.timeout)
+                    except PdfTooLargeError as e:
+                        logging.warning(f"{e}: {url}")
+                        return None
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                logging.warning(f"Erro ao baixar PDF: status {status} (tentativa {attempt + 1})")
+                # Erros 4xx não mudam com novas tentativas
+                if status is not None and status < 500:
+                    return None
+            except requests.RequestException as e:
+                logging.warning(f"Erro ao baixar PDF: {e} (tentativa {attempt + 1})")
+            if attempt < self.max_retries - 1:
+                time.sleep(self.backoff * (2 ** attempt))
+        return None
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                # Processos daemon (ex.: workers prefork do Celery) não podem criar filhos
+                if multiprocessing.current_process().daemon:
+                    logging.info("Processo daemon: extração de PDF em threads no lugar do pool de processos")
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pdf-extract')
+                else:
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
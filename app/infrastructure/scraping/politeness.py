@@ -0,0 +1,181 @@
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+import redis
+
+# Token bucket + vagas de concorrência (leases com expiração, para que um
+# worker morto não prenda a vaga). Retorna 0 quando a vaga foi concedida,
+# -1 quando a concorrência está no teto e, senão, os segundos até o próximo token.
+ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'limit', 'rate', 'tokens', 'ts')
+local limit = tonumber(state[1]) or tonumber(ARGV[3])
+local rate = tonumber(state[2]) or tonumber(ARGV[4])
+local burst = tonumber(ARGV[5])
+local tokens = tonumber(state[3]) or burst
+local ts = tonumber(state[4]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local wait = 0
+if redis.call('ZCARD', KEYS[2]) >= math.floor(limit) then
+  wait = -1
+elseif tokens < 1 then
+  wait = (1 - tokens) / rate
+else
+  tokens = tokens - 1
+  redis.call('ZADD', KEYS[2], now + tonumber(ARGV[2]), ARGV[1])
+end
+redis.call('HSET', KEYS[1], 'limit', limit, 'rate', rate, 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 86400)
+redis.call('EXPIRE', KEYS[2], 86400)
+return tostring(wait)
+"""
+
+# AIMD: cada sucesso soma increase/limit (≈ +increase por rodada completa de
+# requisições); lentidão ou erro multiplica por decrease, no máximo uma vez por cooldown.
+RELEASE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREM', KEYS[2], ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'limit', 'rate', 'last_decrease')
+local limit = tonumber(state[1]) or tonumber(ARGV[10])
+local rate = tonumber(state[2]) or tonumber(ARGV[11])
+local last_decrease = tonumber(state[3]) or 0
+local outcome = ARGV[2]
+if outcome == 'ok' then
+  limit = math.min(tonumber(ARGV[4]), limit + tonumber(ARGV[7]) / limit)
+  rate = math.min(tonumber(ARGV[6]), rate + tonumber(ARGV[7]) / rate)
+elseif (outcome == 'lento' or outcome == 'erro') and now - last_decrease >= tonumber(ARGV[9]) then
+  limit = math.max(tonumber(ARGV[3]), limit * tonumber(ARGV[8]))
+  rate = math.max(tonumber(ARGV[5]), rate * tonumber(ARGV[8]))
+  last_decrease = now
+end
+redis.call('HSET', KEYS[1], 'limit', limit, 'rate', rate, 'last_decrease', last_decrease)
+redis.call('HINCRBY', KEYS[1], 'n_' .. outcome, 1)
+redis.call('EXPIRE', KEYS[1], 86400)
+return {tostring(limit), tostring(rate)}
+"""
+
+OUTCOMES = ('ok', 'lento', 'erro', 'neutro')
+
+def classificar_erro(e: BaseException) -> str:
+    """Erros que indicam carga no site (5xx, 429, timeout, conexão) reduzem o ritmo; 4xx não"""
+    if isinstance(e, (KeyboardInterrupt, SystemExit, GeneratorExit)):
+        return 'neutro'
+    status = getattr(getattr(e, 'response', None), 'status_code', None)
+    if status is not None and status < 500 and status != 429:
+        return 'neutro'
+    return 'erro'
+
+class PolitenessScheduler:
+    """
+    Agenda as requisições e navegações ao DJE com token bucket e teto de
+    concorrência por host, ajustados por AIMD a partir da latência, dos 5xx
+    e dos timeouts observados. O estado fica no Redis, então todos os
+    workers do Celery dividem o mesmo orçamento. Sem Redis, não bloqueia.
+    """
+
+    KEY_PREFIX = 'juscash:politeness:'
+
+    def __init__(self, redis_client: redis.Redis, initial_concurrency: int = 2, min_concurrency: int = 1,
+                 max_concurrency: int = 8, initial_rate: float = 1.0, min_rate: float = 0.2,
+                 max_rate: float = 5.0, burst: int = 2, latency_target: float = 10.0,
+                 increase: float = 1.0, decrease: float = 0.5, cooldown: float = 5.0,
+                 lease_seconds: int = 120, poll_interval: float = 0.1, max_wait: float = 300.0):
+        self.redis = redis_client
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1, burst)
+        self.latency_target = latency_target
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self._acquire = redis_client.register_script(ACQUIRE_SCRIPT)
+        self._release = redis_client.register_script(RELEASE_SCRIPT)
+        self._ultimo_aviso = 0.0
+        self._aviso_lock = threading.Lock()
+
+    def _keys(self, url: str) -> List[str]:
+        base = self.KEY_PREFIX + (urlparse(url).netloc or url)
+        return [base, base + ':leases']
+
+    def _avisar_indisponivel(self, e: Exception):
+        # Um aviso por minuto basta; cada requisição cairia aqui com o Redis fora
+        with self._aviso_lock:
+            agora = time.monotonic()
+            if agora - self._ultimo_aviso < 60:
+                return
+            self._ultimo_aviso = agora
+        logging.warning(f"Agendador de requisições sem Redis, seguindo sem limite compartilhado: {e}")
+
+    def acquire(self, url: str) -> Optional[str]:
+        """Espera uma vaga para o host da URL; retorna o lease (None se seguiu sem vaga)"""
+        keys = self._keys(url)
+        lease = uuid.uuid4().hex
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            try:
+                wait = float(self._acquire(keys=keys, args=[
+                    lease, self.lease_seconds, self.initial_concurrency, self.initial_rate, self.burst
+                ]))
+            except redis.RedisError as e:
+                self._avisar_indisponivel(e)
+                return None
+            if wait == 0:
+                return lease
+            restante = deadline - time.monotonic()
+            if restante <= 0:
+                logging.warning(f"Sem vaga para {keys[0]} após {self.max_wait}s, seguindo assim mesmo")
+                return None
+            time.sleep(min(restante, self.poll_interval if wait < 0 else wait))
+
+    def release(self, url: str, lease: Optional[str], outcome: str):
+        """Libera a vaga e ajusta concorrência e taxa pelo resultado"""
+        try:
+            self._release(keys=self._keys(url), args=[
+                lease or '', outcome, self.min_concurrency, self.max_concurrency, self.min_rate,
+                self.max_rate, self.increase, self.decrease, self.cooldown,
+                self.initial_concurrency, self.initial_rate
+            ])
+        except redis.RedisError as e:
+            self._avisar_indisponivel(e)
+
+    @contextmanager
+    def slot(self, url: str):
+        """Envolve uma requisição ou navegação: exceções contam como erro, lentidão como congestionamento"""
+        lease = self.acquire(url)
+        inicio = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(url, lease, classificar_erro(e))
+            raise
+        self.release(url, lease, 'lento' if time.monotonic() - inicio > self.latency_target else 'ok')
+
+    def stats(self, url: str) -> Dict[str, float]:
+        """Estado atual do host: concorrência, taxa, vagas em uso e contagem por resultado"""
+        state_key, leases_key = self._keys(url)
+        state = {
+            (k.decode() if isinstance(k, bytes) else k): float(v)
+            for k, v in self.redis.hgetall(state_key).items()
+        }
+        stats = {
+            'concorrencia': state.get('limit', float(self.initial_concurrency)),
+            'taxa': state.get('rate', float(self.initial_rate)),
+            'em_uso': self.redis.zcount(leases_key, time.time(), '+inf'),
+        }
+        for outcome in OUTCOMES:
+            stats[outcome] = int(state.get(f'n_{outcome}', 0))
+        return stats
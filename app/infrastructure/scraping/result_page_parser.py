@@ -0,0 +1,88 @@
+import re
+from typing import List, NamedTuple, Optional, Tuple
+from lxml import etree
+from lxml import html as lxml_html
+
+RESULTADOS_ID = 'divResultadosInferior'
+
+_INICIO_RESULTADOS = re.compile(r'<div\b[^>]*\bid\s*=\s*["\']?' + RESULTADOS_ID + r'\b', re.IGNORECASE)
+_TROCA_DE_PAGINA = re.compile(r'trocaDePg\((\d+)\)')
+_TEXTO = 'descendant::text()[not(ancestor::script) and not(ancestor::style)]'
+
+def _classe(nome: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {nome} ')"
+
+# Mesmos seletores CSS usados antes com o BeautifulSoup, em XPath
+_LINHAS = etree.XPath(f".//table//tr[{_classe('fundocinza1')}]")
+_CONTEUDO = etree.XPath(f"(.//tr[{_classe('ementaClass2')}]//td)[1]")
+_CABECALHO = etree.XPath(f"(.//tr[{_classe('ementaClass')}]//a)[1]")
+_ONCLICKS = etree.XPath(".//a/@onclick")
+_LINKS = etree.XPath("//a")
+_TEXTOS = etree.XPath(_TEXTO)
+
+class ResultRow(NamedTuple):
+    """Uma publicação da lista de resultados, já reduzida a texto"""
+    cabecalho: Optional[str]
+    conteudo: Optional[str]
+    onclicks: Tuple[str, ...]
+
+class ResultPage(NamedTuple):
+    rows: List[ResultRow]
+    tem_resultados: bool
+    texto: str
+    proxima_pagina: Optional[int]
+
+def _texto(element, strip: bool = False) -> str:
+    partes = _TEXTOS(element)
+    if strip:
+        # Equivale ao get_text(strip=True) do BeautifulSoup
+        return ''.join(parte.strip() for parte in partes)
+    return ''.join(partes)
+
+def _proxima_pagina(root, page_num: int) -> Optional[int]:
+    for link in _LINKS(root):
+        if 'Próximo' not in _texto(link):
+            continue
+        match = _TROCA_DE_PAGINA.search(link.get('onclick') or link.get('href') or '')
+        return int(match.group(1)) if match else page_num + 1
+    return None
+
+def _parse(fragmento: str):
+    try:
+        return lxml_html.document_fromstring(fragmento)
+    except (etree.ParserError, ValueError):
+        return None
+
+def parse_result_page(html: str, page_num: int = 1) -> ResultPage:
+    """
+    Converte uma página de resultados do DJE em registros leves. Só o
+    trecho a partir de div#divResultadosInferior é entregue ao lxml; o
+    cabeçalho, scripts e formulário anteriores nem chegam a ser parseados.
+    """
+    inicio = _INICIO_RESULTADOS.search(html)
+    if not inicio:
+        return ResultPage([], False, '', None)
+
+    root = _parse(html[inicio.start():])
+    divs = root.xpath(f"//div[@id='{RESULTADOS_ID}']") if root is not None else []
+    if not divs:
+        return ResultPage([], False, '', None)
+
+    div = divs[0]
+    rows = []
+    for linha in _LINHAS(div):
+        conteudo = _CONTEUDO(linha)
+        cabecalho = _CABECALHO(linha)
+        rows.append(ResultRow(
+            cabecalho=_texto(cabecalho[0]) if cabecalho else None,
+            conteudo=_texto(conteudo[0], strip=True) if conteudo else None,
+            onclicks=tuple(_ONCLICKS(linha)),
+        ))
+
+    proxima = _proxima_pagina(root, page_num)
+    if proxima is None and 'Próximo' in html[:inicio.start()]:
+        # Paginação renderizada antes da div de resultados
+        anterior = _parse(html[:inicio.start()])
+        if anterior is not None:
+            proxima = _proxima_pagina(anterior, page_num)
+    return ResultPage(rows, True, _texto(div), proxima)
@@ -0,0 +1,119 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from app.infrastructure.scraping.rpv_extraction import RpvFieldExtractor, RpvFields
+
+TERMOS_RPV = {
+    # Termos que indicam RPV
+    'rpv': [
+        'rpv',
+        'requisição de pequeno valor',
+        'requisitório de pequeno valor',
+        'requisição de pagamento',
+        'ofício requisitório',
+    ],
+    # Termos que devem estar presentes (pelo menos 2)
+    'obrigatorio': [
+        'inss',
+        'instituto nacional',
+        'seguro social',
+    ],
+    # Termos que indicam pagamento
+    'pagamento': [
+        'valor',
+        'pagamento',
+        'crédito',
+        'depósito',
+        'requisitado',
+    ],
+}
+
+PONTUACAO_MINIMA = 7
+PONTUACAO_MAXIMA = 11
+
+def _trie(termos: Iterable[str]) -> Dict:
+    raiz = {}
+    for termo in termos:
+        no = raiz
+        for char in termo:
+            no = no.setdefault(char, {})
+        no[''] = True
+    return raiz
+
+def _trie_regex(no: Dict) -> str:
+    """Converte a trie em uma alternação com os prefixos comuns fatorados"""
+    ramos = [re.escape(char) + _trie_regex(filho) for char, filho in sorted(no.items()) if char]
+    if not ramos:
+        return ''
+    corpo = ramos[0] if len(ramos) == 1 else '(?:' + '|'.join(ramos) + ')'
+    return f'(?:{corpo})?' if '' in no else corpo
+
+@dataclass
+class RpvClassificacao:
+    tem_rpv: bool
+    tem_obrigatorios: bool
+    tem_pagamento: bool
+    tem_processo: bool
+    tem_valor: bool
+    tem_data: bool
+
+    @property
+    def pontos(self) -> int:
+        return (3 * self.tem_rpv + 2 * self.tem_obrigatorios + self.tem_pagamento +
+                2 * self.tem_processo + 2 * self.tem_valor + self.tem_data)
+
+    @property
+    def e_rpv(self) -> bool:
+        return self.pontos >= PONTUACAO_MINIMA
+
+    def resumo(self) -> str:
+        marcas = [
+            ('RPV', self.tem_rpv), ('obrigatórios', self.tem_obrigatorios), ('pagamento', self.tem_pagamento),
+            ('processo', self.tem_processo), ('valor', self.tem_valor), ('data', self.tem_data),
+        ]
+        return ' '.join(f"{nome}{'✅' if ok else '❌'}" for nome, ok in marcas) + f" | {self.pontos}/{PONTUACAO_MAXIMA}"
+
+class RpvClassifier:
+    """
+    Classifica textos como RPV. Os termos indicadores formam uma trie
+    compilada em um único autômato (estilo Aho-Corasick) que percorre o
+    texto uma vez e para assim que todas as categorias estão decididas;
+    número, valor e data vêm dos campos já extraídos pelo RpvFieldExtractor.
+    """
+
+    def __init__(self, extractor: RpvFieldExtractor = None):
+        self.extractor = extractor or RpvFieldExtractor()
+        self._categoria = {termo: categoria for categoria, lista in TERMOS_RPV.items() for termo in lista}
+        # Lookahead para casamentos sobrepostos ('valor' dentro de 'requisição de pequeno valor')
+        self._automato = re.compile(f'(?=({_trie_regex(_trie(self._categoria))}))')
+
+    def classify(self, texto: str, campos: Optional[RpvFields] = None) -> RpvClassificacao:
+        if campos is None:
+            campos = self.extractor.extract(texto)
+        encontrados = self._termos_encontrados(texto.lower())
+        return RpvClassificacao(
+            tem_rpv=bool(encontrados['rpv']),
+            tem_obrigatorios=len(encontrados['obrigatorio']) >= 2,
+            tem_pagamento=bool(encontrados['pagamento']),
+            tem_processo=bool(campos.numero_processo),
+            tem_valor=any(campos.valores.values()),
+            tem_data=bool(campos.data_disponibilizacao),
+        )
+
+    def classify_many(self, textos: List[str], campos: List[Optional[RpvFields]] = None) -> List[RpvClassificacao]:
+        """Classifica um lote de textos, reaproveitando os campos já extraídos quando informados"""
+        campos = campos or [None] * len(textos)
+        return [self.classify(texto, campos_texto) for texto, campos_texto in zip(textos, campos)]
+
+    def _termos_encontrados(self, texto_lower: str) -> Dict[str, set]:
+        encontrados = {categoria: set() for categoria in TERMOS_RPV}
+        for match in self._automato.finditer(texto_lower):
+            termo = match.group(1)
+            encontrados[self._categoria[termo]].add(termo)
+            if self._decidido(encontrados):
+                break
+        return encontrados
+
+    def _decidido(self, encontrados: Dict[str, set]) -> bool:
+        return (bool(encontrados['rpv']) and bool(encontrados['pagamento']) and
+                len(encontrados['obrigatorio']) >= 2)
@@ -0,0 +1,285 @@
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+MESES = {'janeiro': 1, 'fevereiro': 2, 'março': 3, 'abril': 4, 'maio': 5, 'junho': 6,
+         'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12}
+
+_VALOR = r'[:\s]*R?\$?\s*([\d.,]+)'
+_IM = re.IGNORECASE | re.MULTILINE
+
+# Gatilhos: prefixos que precisam estar presentes onde uma regra pode casar.
+# Uma única varredura localiza todos eles e as regras só são testadas nessas posições.
+TRIGGERS = {
+    'cnj': r'\d{7}-\d{2}\.',
+    'proc': r'proc',
+    'autos': r'autos\s+n',
+    'data_num': r'\d{2}/\d{2}/\d{4}',
+    'data_ext': r'\d{1,2}\s+de\s',
+    'data': r'data',
+    'disponibiliza': r'disponibiliza',
+    'publicad': r'publicad',
+    'parte': r'requerente|autor|exequente|beneficiário',
+    'rpv': r'rpv\s+em',
+    'em_face': r'em\s+face',
+    'apos_de': r'\bde\s',
+    'apos_a': r'\ba\s',
+    'advogad': r'advogad',
+    'dr': r'dr[aª]?\.',
+    'representad': r'representad',
+    'oab': r'oab',
+    'valor': r'valor',
+    'principal': r'principal',
+    'montante': r'montante',
+    'total': r'total',
+    'juros': r'juros',
+    'moratorios': r'moratórios',
+    'correcao': r'correção',
+    'atualizacao': r'atualização',
+    'honorarios': r'honorários',
+    'advocaticios': r'advocatícios',
+    'sucumbencia': r'sucumbência',
+    'verba': r'verba',
+}
+
+class _Rule:
+    """Um padrão da extração com o gatilho que antecede qualquer casamento dele"""
+
+    def __init__(self, pattern: str, flags: int, trigger: str, anchor: str = 'start'):
+        self.regex = re.compile(pattern, flags)
+        self.trigger = trigger
+        # 'start': casa no início do gatilho; 'end': logo após ele (lookbehind); 'oab': nome antes da OAB
+        self.anchor = anchor
+
+NUMERO_RULES = [
+    _Rule(r'\b\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4}\b', re.IGNORECASE, 'cnj'),
+    _Rule(r'\b\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}\b', re.IGNORECASE, 'cnj'),
+    _Rule(r'Processo\s+n[ºo°\.]*\s*(\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4})', re.IGNORECASE, 'proc'),
+    _Rule(r'Proc\.*\s*(\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4})', re.IGNORECASE, 'proc'),
+    _Rule(r'Autos\s+n[ºo°\.]*\s*(\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4})', re.IGNORECASE, 'autos'),
+]
+
+DATA_RULES = [
+    _Rule(r'(\d{2}/\d{2}/\d{4})', re.IGNORECASE, 'data_num'),
+    _Rule(r'data[:\s]+(\d{2}/\d{2}/\d{4})', re.IGNORECASE, 'data'),
+    _Rule(r'disponibiliza[^:]*:?\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE, 'disponibiliza'),
+    _Rule(r'publicad[oa]\s+em[:\s]*(\d{2}/\d{2}/\d{4})', re.IGNORECASE, 'publicad'),
+    _Rule(r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})', re.IGNORECASE, 'data_ext'),
+]
+
+AUTOR_RULES = [
+    _Rule(r'(?:Requerente|Autor|Exequente|Beneficiário)[:\s]*([^,\n\r]+?)(?:\s+(?:CPF|RG|contra)|,|\n|\r|$)', _IM, 'parte'),
+    _Rule(r'RPV\s+em\s+favor\s+de[:\s]*([^,\n\r]+?)(?:\s+(?:CPF|RG|contra)|,|\n|\r|$)', _IM, 'rpv'),
+    _Rule(r'beneficiário[:\s]*([^,\n\r]+?)(?:\s+(?:CPF|RG|contra)|,|\n|\r|$)', _IM, 'parte'),
+    _Rule(r'em\s+face\s+de[:\s]*([^,\n\r]+?)(?:\s+(?:CPF|RG|contra)|,|\n|\r|$)', _IM, 'em_face'),
+    _Rule(r'(?:Requerente|Autor|Exequente|Beneficiário)[:\s]*([^,\n\r]+?)(?=\s+(?:CPF|RG|contra|x|versus|vs\.?|,|\n|\r|$))', _IM, 'parte'),
+    _Rule(r'(?<=\bde\s)([A-ZÇÁÉÍÓÚÂÊÎÔÛÃÕ][a-zçáéíóúâêîôûãõ]+(?:\s+[A-ZÇÁÉÍÓÚÂÊÎÔÛÃÕ][a-zçáéíóúâêîôûãõ]+)*)', _IM, 'apos_de', 'end'),
+    _Rule(r'(?<=\ba\s)([A-ZÇÁÉÍÓÚÂÊÎÔÛÃÕ][a-zçáéíóúâêîôûãõ]+(?:\s+[A-ZÇÁÉÍÓÚÂÊÎÔÛÃÕ][a-zçáéíóúâêîôûãõ]+)*)', _IM, 'apos_a', 'end'),
+]
+
+ADVOGADO_RULES = [
+    _Rule(r'Advogad[oa][:\s]*([^(\n\r]+?)\s*\(OAB[:\s]*(\d+/[A-Z]{2})\)', _IM, 'advogad'),
+    _Rule(r'Dr[aª]?\.\s*([^(\n\r]+?)\s*\(OAB[:\s]*(\d+/[A-Z]{2})\)', _IM, 'dr'),
+    _Rule(r'([A-ZÁÊÇ][a-záêçõã]+(?:\s+[A-ZÁÊÇ][a-záêçõã]+)*)\s*\(OAB[:\s]*(\d+/[A-Z]{2})\)', _IM, 'oab', 'oab'),
+    _Rule(r'representad[oa]\s+por[:\s]*([^(\n\r]+?)\s*\(OAB[:\s]*(\d+/[A-Z]{2})\)', _IM, 'representad'),
+    _Rule(r'Advogad[oa][:\s]*([^(\n\r]+?)\s*OAB[:\s]*(\d+/[A-Z]{2})', _IM, 'advogad'),
+    _Rule(r'Dr[aª]?\.\s*([^(\n\r]+?)\s*OAB[:\s]*(\d+/[A-Z]{2})', _IM, 'dr'),
+    _Rule(r'([A-ZÁÊÇ][a-záêçõã]+(?:\s+[A-ZÁÊÇ][a-záêçõã]+)*)\s*OAB[:\s]*(\d+/[A-Z]{2})', _IM, 'oab', 'oab'),
+]
+
+VALOR_RULES = {
+    'bruto': [
+        _Rule(r'valor\s+principal\s+bruto' + _VALOR, _IM, 'valor'),
+        _Rule(r'principal\s+bruto' + _VALOR, _IM, 'principal'),
+        _Rule(r'valor\s+bruto' + _VALOR, _IM, 'valor'),
+        _Rule(r'montante\s+bruto' + _VALOR, _IM, 'montante'),
+        _Rule(r'valor\s+total\s+bruto' + _VALOR, _IM, 'valor'),
+        _Rule(r'total\s+bruto' + _VALOR, _IM, 'total'),
+        _Rule(r'valor\s+da\s+execução' + _VALOR, _IM, 'valor'),
+        _Rule(r'valor\s+executado' + _VALOR, _IM, 'valor'),
+    ],
+    'liquido': [
+        _Rule(r'valor\s+principal\s+líquido' + _VALOR, _IM, 'valor'),
+        _Rule(r'principal\s+líquido' + _VALOR, _IM, 'principal'),
+        _Rule(r'valor\s+líquido' + _VALOR, _IM, 'valor'),
+        _Rule(r'montante\s+líquido' + _VALOR, _IM, 'montante'),
+        _Rule(r'valor\s+total\s+líquido' + _VALOR, _IM, 'valor'),
+        _Rule(r'total\s+líquido' + _VALOR, _IM, 'total'),
+        _Rule(r'valor\s+final' + _VALOR, _IM, 'valor'),
+        _Rule(r'valor\s+devido' + _VALOR, _IM, 'valor'),
+    ],
+    'juros': [
+        _Rule(r'juros\s+moratórios' + _VALOR, _IM, 'juros'),
+        _Rule(r'juros' + _VALOR, _IM, 'juros'),
+        _Rule(r'moratórios' + _VALOR, _IM, 'moratorios'),
+        _Rule(r'correção\s+monetária' + _VALOR, _IM, 'correcao'),
+        _Rule(r'juros\s+de\s+mora' + _VALOR, _IM, 'juros'),
+        _Rule(r'juros\s+legais' + _VALOR, _IM, 'juros'),
+        _Rule(r'atualização\s+monetária' + _VALOR, _IM, 'atualizacao'),
+        _Rule(r'valor\s+dos\s+juros' + _VALOR, _IM, 'valor'),
+    ],
+    'honorarios': [
+        _Rule(r'honorários\s+advocatícios' + _VALOR, _IM, 'honorarios'),
+        _Rule(r'honorários' + _VALOR, _IM, 'honorarios'),
+        _Rule(r'advocatícios' + _VALOR, _IM, 'advocaticios'),
+        _Rule(r'sucumbência' + _VALOR, _IM, 'sucumbencia'),
+        _Rule(r'honorários\s+sucumbenciais' + _VALOR, _IM, 'honorarios'),
+        _Rule(r'verba\s+honorária' + _VALOR, _IM, 'verba'),
+        _Rule(r'honorários\s+contratuais' + _VALOR, _IM, 'honorarios'),
+        _Rule(r'honorários\s+de\s+sucumbência' + _VALOR, _IM, 'honorarios'),
+    ],
+}
+
+# O primeiro lookahead descarta rápido as posições que não iniciam nenhum gatilho
+_TRIGGER_SCAN = re.compile(
+    r'(?=[\dabcdehjmoprstv])(?=' + '|'.join(f'(?P<{nome}>{pattern})' for nome, pattern in TRIGGERS.items()) + ')',
+    re.IGNORECASE
+)
+_NOME_CHAR = re.compile(r'[\w\s(]')
+_NUMERO_VALIDO = re.compile(r'^\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4}$')
+_OAB_WINDOW = 120
+
+@dataclass
+class RpvFields:
+    numero_processo: Optional[str] = None
+    data_disponibilizacao: Optional[datetime] = None
+    autor: Optional[str] = None
+    advogado: Optional[str] = None
+    valores: Dict[str, Optional[float]] = field(default_factory=lambda: {'bruto': None, 'liquido': None, 'juros': None, 'honorarios': None})
+
+class RpvFieldExtractor:
+    """
+    Motor de extração dos campos de RPV: uma única varredura localiza os
+    gatilhos de todos os padrões e cada padrão pré-compilado só é testado
+    nas posições dos seus gatilhos, reproduzindo a prioridade e as
+    validações dos padrões originais do DJEScraperDebug.
+    """
+
+    def __init__(self):
+        # (texto, campos) da última extração, trocado atomicamente entre threads
+        self._ultimo = None
+
+    def extract(self, texto: str) -> RpvFields:
+        """Extrai todos os campos; reaproveita o resultado se o mesmo texto for pedido de novo"""
+        ultimo = self._ultimo
+        if ultimo is not None and ultimo[0] == texto:
+            return ultimo[1]
+
+        posicoes = self._scan(texto)
+        fields = RpvFields(
+            numero_processo=self._numero_processo(texto, posicoes),
+            data_disponibilizacao=self._data_disponibilizacao(texto, posicoes),
+            autor=self._autor(texto, posicoes),
+            advogado=self._advogado(texto, posicoes),
+            valores=self._valores(texto, posicoes),
+        )
+        self._ultimo = (texto, fields)
+        return fields
+
+    def _scan(self, texto: str) -> Dict[str, List[tuple]]:
+        posicoes = {nome: [] for nome in TRIGGERS}
+        for match in _TRIGGER_SCAN.finditer(texto):
+            nome = match.lastgroup
+            posicoes[nome].append((match.start(nome), match.end(nome)))
+        return posicoes
+
+    def _matches(self, rule: _Rule, texto: str, posicoes: Dict[str, List[tuple]]) -> Iterator[re.Match]:
+        """Equivalente a rule.regex.finditer(texto), mas testando só as posições dos gatilhos"""
+        proxima = 0
+        for inicio, fim in posicoes[rule.trigger]:
+            if rule.anchor == 'oab':
+                if fim <= proxima:
+                    continue
+                match = rule.regex.search(texto, max(self._inicio_do_nome(texto, inicio), proxima),
+                                          min(len(texto), fim + _OAB_WINDOW))
+            else:
+                pos = fim if rule.anchor == 'end' else inicio
+                if pos < proxima:
+                    continue
+                match = rule.regex.match(texto, pos)
+            if match:
+                yield match
+                proxima = max(match.end(), match.start() + 1)
+
+    def _inicio_do_nome(self, texto: str, oab_inicio: int) -> int:
+        """Recua da OAB até o primeiro caractere que não pode fazer parte do nome"""
+        i = oab_inicio
+        while i > 0 and _NOME_CHAR.match(texto[i - 1]):
+            i -= 1
+        return i
+
+    def _first(self, rule: _Rule, texto: str, posicoes) -> Optional[re.Match]:
+        return next(self._matches(rule, texto, posicoes), None)
+
+    def _numero_processo(self, texto: str, posicoes) -> Optional[str]:
+        for rule in NUMERO_RULES:
+            match = self._first(rule, texto, posicoes)
+            if match:
+                numero = match.group(1) if len(match.groups()) > 0 else match.group(0)
+                if _NUMERO_VALIDO.match(numero):
+                    return numero
+        return None
+
+    def _data_disponibilizacao(self, texto: str, posicoes) -> Optional[datetime]:
+        for rule in DATA_RULES:
+            match = self._first(rule, texto, posicoes)
+            if not match:
+                continue
+            try:
+                if len(match.groups()) == 3:
+                    dia, mes_nome, ano = match.groups()
+                    mes = MESES.get(mes_nome.lower())
+                    if mes:
+                        return datetime(int(ano), mes, int(dia))
+                else:
+                    return datetime.strptime(match.group(1).strip(), "%d/%m/%Y")
+            except ValueError:
+                continue
+        return None
+
+    def _autor(self, texto: str, posicoes) -> Optional[str]:
+        for rule in AUTOR_RULES:
+            for match in self._matches(rule, texto, posicoes):
+                autor = self._limpar_nome(match.group(1))
+                if self._nome_valido(autor):
+                    return autor
+        return None
+
+    def _advogado(self, texto: str, posicoes) -> Optional[str]:
+        advogados = []
+        for rule in ADVOGADO_RULES:
+            for match in self._matches(rule, texto, posicoes):
+                nome = self._limpar_nome(match.group(1))
+                oab = match.group(2).strip() if len(match.groups()) > 1 else ''
+                if self._nome_valido(nome):
+                    advogado_info = f"{nome} (OAB: {oab})" if oab else nome
+                    if advogado_info not in advogados:
+                        advogados.append(advogado_info)
+        return ', '.join(advogados) if advogados else None
+
+    def _valores(self, texto: str, posicoes) -> Dict[str, Optional[float]]:
+        valores = {'bruto': None, 'liquido': None, 'juros': None, 'honorarios': None}
+        for tipo, rules in VALOR_RULES.items():
+            # Mantém a semântica original: cada padrão contribui com seu primeiro
+            # valor válido e o último padrão com valor válido prevalece
+            for rule in rules:
+                for match in self._matches(rule, texto, posicoes):
+                    try:
+                        valor = float(match.group(1).replace('.', '').replace(',', '.'))
+                    except ValueError:
+                        continue
+                    if 0 < valor < 1000000:
+                        valores[tipo] = valor
+                        break
+        return valores
+
+    def _limpar_nome(self, nome: str) -> str:
+        nome = re.sub(r'\s+', ' ', nome.strip())
+        return re.sub(r'[,\.\:]$', '', nome)
+
+    def _nome_valido(self, nome: str) -> bool:
+        return (len(nome.split()) >= 2 and
+                all(word.istitle() for word in nome.split()) and
+                not re.search(r'\d', nome) and
+                len(nome) > 5)
@@ -0,0 +1,134 @@
+import os
+import logging
+import threading
+from flask import current_app, has_app_context
+
+SCRAPER_ENGINES = ('selenium', 'http', 'replay')
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+_capture_archives = {}
+_capture_archives_lock = threading.Lock()
+_politeness_scheduler = None
+_politeness_scheduler_lock = threading.Lock()
+
+def _config_value(key: str, default=None):
+    """Lê uma configuração do app Flask ativo ou, na falta dele, do ambiente"""
+    if has_app_context() and current_app.config.get(key) is not None:
+        return current_app.config.get(key)
+    return os.environ.get(key, default)
+
+def get_scraper_engine() -> str:
+    """Obtém o motor de scraping configurado (SCRAPER_ENGINE)"""
+    engine = (_config_value('SCRAPER_ENGINE') or 'selenium').lower()
+
+    if engine not in SCRAPER_ENGINES:
+        logging.warning(f"Motor de scraping desconhecido '{engine}', usando 'selenium'")
+        engine = 'selenium'
+    return engine
+
+def _config_flag(key: str, default: str = 'true') -> bool:
+    return str(_config_value(key, default)).lower() in ('1', 'true', 'yes', 'on')
+
+def get_driver_pool():
+    """Pool de drivers do Chrome compartilhado pelo processo (None se desabilitado)"""
+    global _driver_pool
+    if not _config_flag('DRIVER_POOL_ENABLED'):
+        return None
+
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            from app.infrastructure.scraping.driver_pool import WebDriverPool
+            from app.infrastructure.scraping.dje_scraper import build_chrome_driver
+            _driver_pool = WebDriverPool(
+                build_chrome_driver,
+                max_idle=int(_config_value('DRIVER_POOL_SIZE', 1)),
+                max_uses=int(_config_value('DRIVER_POOL_MAX_USES', 20)),
+                max_rss_mb=float(_config_value('DRIVER_POOL_MAX_RSS_MB', 1024))
+            )
+        return _driver_pool
+
+def get_capture_archive():
+    """Arquivo de capturas brutas em SCRAPER_CAPTURE_DIR (None se não configurado)"""
+    directory = _config_value('SCRAPER_CAPTURE_DIR')
+    if not directory:
+        return None
+
+    with _capture_archives_lock:
+        if directory not in _capture_archives:
+            from app.infrastructure.scraping.capture_archive import CaptureArchive
+            _capture_archives[directory] = CaptureArchive(directory)
+        return _capture_archives[directory]
+
+def get_politeness_scheduler():
+    """Agendador compartilhado das requisições ao DJE, com estado no Redis (None se desabilitado)"""
+    global _politeness_scheduler
+    if not _config_flag('POLITENESS_ENABLED'):
+        return None
+
+    with _politeness_scheduler_lock:
+        if _politeness_scheduler is None:
+            from app.infrastructure.redis_client import get_redis
+            from app.infrastructure.scraping.politeness import PolitenessScheduler
+            _politeness_scheduler = PolitenessScheduler(
+                get_redis(),
+                initial_concurrency=int(_config_value('POLITENESS_INITIAL_CONCURRENCY', 2)),
+                max_concurrency=int(_config_value('POLITENESS_MAX_CONCURRENCY', 8)),
+                initial_rate=float(_config_value('POLITENESS_INITIAL_RATE', 1.0)),
+                max_rate=float(_config_value('POLITENESS_MAX_RATE', 5.0)),
+                latency_target=float(_config_value('POLITENESS_LATENCY_TARGET', 10.0))
+            )
+        return _politeness_scheduler
+
+def create_pdf_extractor():
+    """Extrator de texto de PDFs com pool de processos dimensionado pela configuração"""
+    from app.infrastructure.scraping.pdf_extractor import PdfTextExtractor
+    return PdfTextExtractor(
+        max_workers=int(_config_value('PDF_EXTRACT_WORKERS', 2)),
+        max_bytes=int(_config_value('PDF_MAX_MB', 20)) * 1024 * 1024,
+        scheduler=get_politeness_scheduler()
+    )
+
+def create_seen_set():
+    """Filtro de processos já armazenados no Redis (None se desabilitado)"""
+    if not _config_flag('SEEN_SET_ENABLED'):
+        return None
+
+    from app.infrastructure.redis_client import get_redis
+    from app.infrastructure.repositories.sqlalchemy_publicacao_repository import SQLAlchemyPublicacaoRepository
+    from app.infrastructure.scraping.seen_set import ProcessoSeenSet
+    repository = SQLAlchemyPublicacaoRepository()
+    return ProcessoSeenSet(
+        get_redis(),
+        exact_check=repository.find_existing_numeros_processo,
+        loader=repository.iter_numeros_processo,
+        capacity=int(_config_value('SEEN_SET_CAPACITY', 1_000_000)),
+        error_rate=float(_config_value('SEEN_SET_ERROR_RATE', 0.001))
+    )
+
+def create_dje_scraper(engine: str = None, caderno: str = None, query: str = None):
+    """Cria o scraper do DJE de acordo com o motor configurado (caderno e consulta padrão se omitidos)"""
+    engine = (engine or get_scraper_engine()).lower()
+
+    if engine == 'replay':
+        archive = get_capture_archive()
+        if archive is None:
+            raise ValueError("SCRAPER_ENGINE=replay exige SCRAPER_CAPTURE_DIR configurado")
+        from app.infrastructure.scraping.replay_scraper import DJEReplayScraper
+        return DJEReplayScraper(archive, caderno=caderno, query=query)
+
+    if engine == 'http':
+        from app.infrastructure.scraping.dje_http_scraper import DJEHttpScraper
+        return DJEHttpScraper(
+            max_workers=int(_config_value('SCRAPER_PAGE_WORKERS', 4)),
+            max_per_host=int(_config_value('SCRAPER_MAX_PER_HOST', 2)),
+            capture_archive=get_capture_archive(),
+            seen_set=create_seen_set(),
+            scheduler=get_politeness_scheduler(),
+            caderno=caderno,
+            query=query
+        )
+
+    from app.infrastructure.scraping.dje_scraper import DJEScraper
+    return DJEScraper(driver_pool=get_driver_pool(), capture_archive=get_capture_archive(), seen_set=create_seen_set(),
+                      scheduler=get_politeness_scheduler(), caderno=caderno, query=query)
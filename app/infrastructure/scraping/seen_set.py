@@ -0,0 +1,145 @@
+import math
+import hashlib
+import logging
+from datetime import datetime
+from typing import Callable, Iterable, List, Set
+import redis
+
+class ProcessoSeenSet:
+    """
+    Filtro de Bloom em um bitmap do Redis com os números de processo já
+    armazenados, compartilhado por todos os workers. "Não visto" é
+    definitivo; "talvez visto" é confirmado por uma consulta exata no banco,
+    então um falso positivo custa uma query e nunca uma publicação perdida.
+    """
+
+    KEY_PREFIX = 'juscash:seen:processos'
+    PIPELINE_CHUNK = 5000
+
+    def __init__(self, redis_client: redis.Redis, exact_check: Callable[[List[str]], Set[str]],
+                 loader: Callable[[], Iterable[str]] = None, capacity: int = 1_000_000,
+                 error_rate: float = 0.001, warm_lock_seconds: int = 600):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate deve estar entre 0 e 1")
+        self.redis = redis_client
+        self.exact_check = exact_check
+        self.loader = loader
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.warm_lock_seconds = warm_lock_seconds
+        self.size, self.hashes = self.optimal_params(self.capacity, error_rate)
+        # Os parâmetros fazem parte da chave: mudar capacidade ou taxa gera um filtro novo
+        self.key = f"{self.KEY_PREFIX}:{self.size}:{self.hashes}"
+        self.meta_key = f"{self.key}:meta"
+
+    @staticmethod
+    def optimal_params(capacity: int, error_rate: float):
+        """Tamanho do bitmap (m) e número de hashes (k) para a taxa de falso positivo"""
+        size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return size, hashes
+
+    def _offsets(self, numero_processo: str) -> List[int]:
+        # Double hashing (Kirsch-Mitzenmacher) sobre um único digest
+        digest = hashlib.blake2b(numero_processo.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add_many(self, numeros: Iterable[str]) -> int:
+        """Marca os processos como vistos; falhas do Redis só custam consultas exatas depois"""
+        try:
+            return self._setbits(numeros)
+        except redis.RedisError as e:
+            logging.warning(f"Não foi possível atualizar o filtro de processos vistos: {e}")
+            return 0
+
+    def _setbits(self, numeros: Iterable[str]) -> int:
+        total = 0
+        pendentes = 0
+        pipe = self.redis.pipeline(transaction=False)
+        for numero in numeros:
+            if not numero:
+                continue
+            for offset in self._offsets(numero):
+                pipe.setbit(self.key, offset, 1)
+            total += 1
+            pendentes += self.hashes
+            if pendentes >= self.PIPELINE_CHUNK:
+                pipe.execute()
+                pendentes = 0
+        if pendentes:
+            pipe.execute()
+        return total
+
+    def might_contain_many(self, numeros: List[str]) -> List[bool]:
+        pipe = self.redis.pipeline(transaction=False)
+        for numero in numeros:
+            for offset in self._offsets(numero):
+                pipe.getbit(self.key, offset)
+        bits = pipe.execute()
+        return [all(bits[i:i + self.hashes]) for i in range(0, len(bits), self.hashes)]
+
+    def is_warm(self) -> bool:
+        return bool(self.redis.hexists(self.meta_key, 'warmed_at'))
+
+    def warm(self) -> int:
+        """Carrega todos os numero_processo armazenados no filtro"""
+        if self.loader is None:
+            raise ValueError("ProcessoSeenSet sem loader não pode ser aquecido")
+        # Aqui uma falha do Redis propaga: um filtro incompleto não pode ser marcado como aquecido
+        total = self._setbits(self.loader())
+        self.redis.hset(self.meta_key, mapping={
+            'warmed_at': datetime.utcnow().isoformat(),
+            'itens': total,
+            'capacidade': self.capacity,
+            'taxa_falso_positivo': self.error_rate,
+        })
+        if total > self.capacity:
+            logging.warning(f"Filtro de processos vistos com {total} itens acima da capacidade {self.capacity}; "
+                            f"a taxa de falso positivo vai subir (aumente SEEN_SET_CAPACITY)")
+        logging.info(f"Filtro de processos vistos aquecido com {total} processos")
+        return total
+
+    def _garantir_aquecido(self) -> bool:
+        """Aquece o filtro na primeira consulta; só um worker aquece por vez"""
+        if self.is_warm():
+            return True
+        if self.loader is None:
+            return False
+        lock_key = f"{self.key}:warming"
+        if not self.redis.set(lock_key, '1', nx=True, ex=self.warm_lock_seconds):
+            return False
+        try:
+            self.warm()
+            return True
+        except Exception as e:
+            logging.warning(f"Não foi possível aquecer o filtro de processos vistos: {e}")
+            return False
+        finally:
+            self.redis.delete(lock_key)
+
+    def known(self, numeros: Iterable[str]) -> Set[str]:
+        """Subconjunto dos processos que já estão no banco"""
+        numeros = list(dict.fromkeys(n for n in numeros if n))
+        if not numeros:
+            return set()
+
+        try:
+            if self._garantir_aquecido():
+                candidatos = [n for n, talvez in zip(numeros, self.might_contain_many(numeros)) if talvez]
+            else:
+                # Filtro ainda frio: a verificação exata decide sozinha
+                candidatos = numeros
+        except redis.RedisError as e:
+            logging.warning(f"Filtro de processos vistos indisponível, usando só o banco: {e}")
+            candidatos = numeros
+
+        if not candidatos:
+            return set()
+        try:
+            return set(self.exact_check(candidatos))
+        except Exception as e:
+            # Na dúvida o processo é tratado como novo e o detalhe é buscado
+            logging.warning(f"Verificação exata de processos falhou, nenhum será ignorado: {e}")
+            return set()
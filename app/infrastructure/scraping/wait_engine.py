@@ -0,0 +1,132 @@
+import time
+import logging
+import threading
+from typing import Callable, Dict, List
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from app.infrastructure import metrics
+
+class _WaitStats:
+    """Latências observadas de um tipo de espera (estimativa no estilo do RTO do TCP)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+        self.timeouts = 0
+        self.srtt = None
+        self.rttvar = None
+
+    def observe(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.last = elapsed
+        if self.srtt is None:
+            self.srtt = elapsed
+            self.rttvar = elapsed / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - elapsed)
+            self.srtt = 0.875 * self.srtt + 0.125 * elapsed
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total_seconds': round(self.total, 3),
+            'avg_seconds': round(self.total / self.count, 3) if self.count else None,
+            'max_seconds': round(self.max, 3),
+            'last_seconds': round(self.last, 3) if self.last is not None else None,
+            'timeouts': self.timeouts,
+        }
+
+class WaitEngine:
+    """
+    Esperas do Selenium baseadas em condições do DOM (readyState, presença,
+    staleness, novas janelas) no lugar de sleeps fixos. O timeout de cada
+    tipo de espera se adapta às latências já observadas e cada espera
+    fica registrada para análise de onde o tempo é gasto.
+    """
+
+    def __init__(self, default_timeout: float = 30, min_timeout: float = 5, max_timeout: float = 60,
+                 poll_frequency: float = 0.2, min_samples: int = 3):
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.poll_frequency = poll_frequency
+        self.min_samples = min_samples
+        self._stats: Dict[str, _WaitStats] = {}
+        self._lock = threading.Lock()
+
+    def timeout_for(self, label: str) -> float:
+        with self._lock:
+            stats = self._stats.get(label)
+            if not stats or stats.count < self.min_samples:
+                return self.default_timeout
+            estimate = (stats.srtt + 4 * stats.rttvar) * 2
+        return min(self.max_timeout, max(self.min_timeout, estimate))
+
+    def wait_for(self, driver, condition: Callable, label: str, timeout: float = None):
+        """Aguarda uma condição arbitrária e registra o tempo gasto sob label"""
+        timeout = timeout or self.timeout_for(label)
+        inicio = time.monotonic()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            elapsed = time.monotonic() - inicio
+            self._record_timeout(label, elapsed)
+            metrics.observe_stage(f'espera_{label}', elapsed, erro=True)
+            raise
+        elapsed = time.monotonic() - inicio
+        self._record(label, elapsed)
+        metrics.observe_stage(f'espera_{label}', elapsed)
+        return result
+
+    def wait_for_document_ready(self, driver, label: str = 'document_ready', timeout: float = None):
+        return self.wait_for(
+            driver,
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            label,
+            timeout
+        )
+
+    def wait_for_element(self, driver, by, value, label: str = None, clickable: bool = False, timeout: float = None):
+        condition = EC.element_to_be_clickable((by, value)) if clickable else EC.presence_of_element_located((by, value))
+        return self.wait_for(driver, condition, label or f'element:{value}', timeout)
+
+    def wait_for_staleness(self, driver, element, label: str = 'staleness', timeout: float = None):
+        """Aguarda um elemento ser descartado do DOM (ex.: após trocar de página)"""
+        return self.wait_for(driver, EC.staleness_of(element), label, timeout)
+
+    def wait_for_new_window(self, driver, handles_before: List[str], label: str = 'new_window', timeout: float = None):
+        """Aguarda a abertura de uma nova janela e retorna o handle dela"""
+        before = set(handles_before)
+        self.wait_for(driver, lambda d: len(set(d.window_handles) - before) > 0, label, timeout)
+        return next(handle for handle in driver.window_handles if handle not in before)
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {label: stats.to_dict() for label, stats in self._stats.items()}
+
+    def resumo(self) -> str:
+        """Resumo textual das esperas, da maior para a menor em tempo total"""
+        stats = sorted(self.stats().items(), key=lambda item: item[1]['total_seconds'], reverse=True)
+        return ', '.join(
+            f"{label}: {s['count']}x, total {s['total_seconds']}s, máx {s['max_seconds']}s, timeouts {s['timeouts']}"
+            for label, s in stats
+        )
+
+    def _record(self, label: str, elapsed: float):
+        with self._lock:
+            self._stats.setdefault(label, _WaitStats()).observe(elapsed)
+
+    def _record_timeout(self, label: str, elapsed: float):
+        with self._lock:
+            stats = self._stats.setdefault(label, _WaitStats())
+            stats.timeouts += 1
+            stats.total += elapsed
+            # Após um timeout, alarga a janela para as próximas esperas
+            if stats.rttvar is not None:
+                stats.rttvar *= 2
+        logging.warning(f"Timeout aguardando '{label}' após {elapsed:.1f}s")
@@ -15,6 +15,16 @@ custom_period_model = cron_ns.model('CustomPeriod', {
     'data_fim': fields.String(required=True, description='Data fim (YYYY-MM-DD)', example='2024-10-31')
 })
 
+sharded_period_model = cron_ns.inherit('ShardedPeriod', custom_period_model, {
+    'shard_days': fields.Integer(description='Dias por fatia', example=1, default=1)
+})
+
+query_plan_model = cron_ns.inherit('QueryPlanPeriod', sharded_period_model, {
+    'cadernos': fields.List(fields.String, description='Cadernos do DJE (padrão: SCRAPING_CADERNOS)', example=['-11']),
+    'queries': fields.List(fields.String, description='Expressões de busca (padrão: SCRAPING_QUERIES)',
+                           example=['"instituto nacional do seguro social" E inss'])
+})
+
 @cron_ns.route('/scraping/daily')
 class DailyScraping(Resource):
     @cron_ns.doc('trigger_daily_scraping')
@@ -98,6 +108,106 @@ class CustomPeriodScraping(Resource):
                 'message': f'Erro ao iniciar raspagem customizada: {str(e)}'
             }, 500
 
+@cron_ns.route('/scraping/sharded-period')
+class ShardedPeriodScraping(Resource):
+    @cron_ns.doc('trigger_sharded_period_scraping')
+    @cron_ns.expect(sharded_period_model)
+    @cron_ns.marshal_with(task_result_model)
+    def post(self):
+        """Executar raspagem de período dividida em fatias paralelas"""
+        try:
+            data = request.get_json()
+            data_inicio_str = data['data_inicio']
+            data_fim_str = data['data_fim']
+            shard_days = int(data.get('shard_days', 1))
+            
+            try:
+                datetime.strptime(data_inicio_str, '%Y-%m-%d')
+                datetime.strptime(data_fim_str, '%Y-%m-%d')
+            except ValueError:
+                return {
+                    'task_id': None,
+                    'status': 'error',
+                    'message': 'Formato de data inválido. Use YYYY-MM-DD'
+                }, 400
+            
+            if shard_days < 1:
+                return {
+                    'task_id': None,
+                    'status': 'error',
+                    'message': 'shard_days deve ser maior ou igual a 1'
+                }, 400
+            
+            from celery import current_app as celery_app
+            task = celery_app.send_task(
+                'app.tasks.scraping_tasks.extract_sharded_period_publicacoes',
+                args=[data_inicio_str + 'T00:00:00', data_fim_str + 'T23:59:59', shard_days]
+            )
+            
+            return {
+                'task_id': task.id,
+                'status': 'started',
+                'message': f'Raspagem em fatias de {shard_days} dia(s) iniciada para período {data_inicio_str} a {data_fim_str}'
+            }
+            
+        except Exception as e:
+            return {
+                'task_id': None,
+                'status': 'error',
+                'message': f'Erro ao iniciar raspagem em fatias: {str(e)}'
+            }, 500
+
+@cron_ns.route('/scraping/query-plan')
+class QueryPlanScraping(Resource):
+    @cron_ns.doc('trigger_query_plan_scraping')
+    @cron_ns.expect(query_plan_model)
+    @cron_ns.marshal_with(task_result_model)
+    def post(self):
+        """Executar plano de consultas (cadernos × expressões × fatias) em paralelo"""
+        try:
+            data = request.get_json()
+            data_inicio_str = data['data_inicio']
+            data_fim_str = data['data_fim']
+            shard_days = int(data.get('shard_days', 1))
+            cadernos = data.get('cadernos') or None
+            queries = data.get('queries') or None
+            
+            try:
+                datetime.strptime(data_inicio_str, '%Y-%m-%d')
+                datetime.strptime(data_fim_str, '%Y-%m-%d')
+            except ValueError:
+                return {
+                    'task_id': None,
+                    'status': 'error',
+                    'message': 'Formato de data inválido. Use YYYY-MM-DD'
+                }, 400
+            
+            if shard_days < 1:
+                return {
+                    'task_id': None,
+                    'status': 'error',
+                    'message': 'shard_days deve ser maior ou igual a 1'
+                }, 400
+            
+            from celery import current_app as celery_app
+            task = celery_app.send_task(
+                'app.tasks.scraping_tasks.extract_query_plan_publicacoes',
+                args=[data_inicio_str + 'T00:00:00', data_fim_str + 'T23:59:59', shard_days, cadernos, queries]
+            )
+            
+            return {
+                'task_id': task.id,
+                'status': 'started',
+                'message': f'Plano de consultas iniciado para período {data_inicio_str} a {data_fim_str}'
+            }
+            
+        except Exception as e:
+            return {
+                'task_id': None,
+                'status': 'error',
+                'message': f'Erro ao iniciar plano de consultas: {str(e)}'
+            }, 500
+
 @cron_ns.route('/maintenance/cleanup')
 class CleanupLogs(Resource):
     @cron_ns.doc('trigger_cleanup')
@@ -140,6 +250,27 @@ class DailyStats(Resource):
                 'message': f'Erro ao gerar estatísticas: {str(e)}'
             }, 500
 
+@cron_ns.route('/workers/driver-pool')
+class DriverPoolStats(Resource):
+    @cron_ns.doc('driver_pool_stats')
+    @cron_ns.marshal_with(task_result_model)
+    def post(self):
+        """Coletar métricas do pool de drivers (hits, misses, tempo de inicialização)"""
+        try:
+            from celery import current_app as celery_app
+            task = celery_app.send_task('app.tasks.scraping_tasks.driver_pool_stats')
+            return {
+                'task_id': task.id,
+                'status': 'started',
+                'message': 'Coleta de métricas do pool de drivers iniciada'
+            }
+        except Exception as e:
+            return {
+                'task_id': None,
+                'status': 'error',
+                'message': f'Erro ao coletar métricas do pool: {str(e)}'
+            }, 500
+
 @cron_ns.route('/health')
 class HealthCheck(Resource):
     @cron_ns.doc('health_check')
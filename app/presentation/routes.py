@@ -1,9 +1,13 @@
 from flask import request, current_app, Response
-from flask_restx import Namespace, Resource, fields
-from datetime import datetime
+from flask_restx import Namespace, Resource, fields, marshal
+from datetime import datetime, timezone
+from decimal import Decimal
+from werkzeug.http import http_date
 from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
 from app.infrastructure.repositories.sqlalchemy_publicacao_repository import SQLAlchemyPublicacaoRepository
-from app.infrastructure.scraping.dje_scraper import DJEScraper
+from app.infrastructure.repositories.keyset_cursor import InvalidCursorError
+from app.infrastructure.repositories.cached_publicacao_repository import get_read_cache, with_read_cache
+from app.infrastructure.scraping.scraper_factory import create_dje_scraper
 from app.tasks.scraping_tasks import extract_publicacoes_task
 import os
 import threading
@@ -11,6 +15,7 @@ import subprocess
 import time
 import tempfile
 import base64
+import hashlib
 import re
 import logging
 import uuid
@@ -87,6 +92,23 @@ publicacao_model = publicacoes_ns.model('Publicacao', {
     'updated_at': fields.String(description='Data da última atualização')
 })
 
+publicacao_page_model = publicacoes_ns.model('PublicacoesPage', {
+    'data': fields.List(fields.Nested(publicacao_model)),
+    'next_cursor': fields.String(description='Cursor da próxima página (nulo na última)')
+})
+
+publicacao_search_hit_model = publicacoes_ns.inherit('PublicacaoSearchHit', publicacao_model, {
+    'rank': fields.Float(description='Relevância (ts_rank) da publicação para a busca'),
+    'trecho': fields.String(description='Trechos do conteúdo com os termos destacados em <mark>')
+})
+
+# Tamanho de página da paginação por cursor
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Campos da listagem quando não há fields=; o conteúdo completo só vem se pedido
+DEFAULT_LIST_FIELDS = tuple(campo for campo in publicacao_model if campo != 'conteudo_completo')
+
 stats_model = publicacoes_ns.model('PublicacoesStats', {
     'nova': fields.Integer(description='Quantidade de publicações novas'),
     'lida': fields.Integer(description='Quantidade de publicações lidas'),
@@ -94,6 +116,71 @@ stats_model = publicacoes_ns.model('PublicacoesStats', {
     'total': fields.Integer(description='Total de publicações')
 })
 
+def _publicacao_to_dict(pub) -> dict:
+    return {
+        'id': pub.id,
+        'numero_processo': pub.numero_processo,
+        'data_disponibilizacao': pub.data_disponibilizacao.isoformat(),
+        'autores': pub.autores,
+        'advogados': pub.advogados,
+        'conteudo_completo': pub.conteudo_completo,
+        'valor_principal_bruto': pub.valor_principal_bruto,
+        'valor_principal_liquido': pub.valor_principal_liquido,
+        'valor_juros_moratorios': pub.valor_juros_moratorios,
+        'honorarios_advocaticios': pub.honorarios_advocaticios,
+        'reu': pub.reu,
+        'status': pub.status,
+        'created_at': pub.created_at.isoformat() if pub.created_at else None,
+        'updated_at': pub.updated_at.isoformat() if pub.updated_at else None
+    }
+
+def _parse_fields(raw) -> tuple:
+    """Lê o parâmetro fields= (lista separada por vírgulas); ValueError se houver campo desconhecido"""
+    if raw is None:
+        return DEFAULT_LIST_FIELDS
+    campos = tuple(dict.fromkeys(campo.strip() for campo in raw.split(',') if campo.strip()))
+    desconhecidos = [campo for campo in campos if campo not in publicacao_model]
+    if not campos:
+        raise ValueError("Parâmetro fields vazio")
+    if desconhecidos:
+        raise ValueError(f"Campos inválidos em fields: {', '.join(desconhecidos)}")
+    return campos
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def _row_to_dict(row, campos) -> dict:
+    # Linhas da projeção vão direto para JSON, sem entidade nem marshal
+    return {campo: _json_value(row[campo]) for campo in campos}
+
+def _etag(*partes) -> str:
+    return hashlib.blake2b('|'.join(map(str, partes)).encode('utf-8'), digest_size=12).hexdigest()
+
+def _utc(value: datetime) -> datetime:
+    # Colunas gravadas com datetime.utcnow podem voltar sem fuso
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def _validators(etag: str, last_modified: datetime = None) -> dict:
+    headers = {'ETag': f'"{etag}"'}
+    if last_modified:
+        headers['Last-Modified'] = http_date(_utc(last_modified))
+    return headers
+
+def _not_modified(etag: str, last_modified: datetime = None) -> bool:
+    """Avalia If-None-Match (com precedência) e If-Modified-Since da requisição"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified and request.if_modified_since:
+        return _utc(last_modified).replace(microsecond=0) <= request.if_modified_since
+    return False
+
+def _publicacao_etag(id, updated_at: datetime) -> str:
+    return _etag('publicacao', id, _utc(updated_at).isoformat())
+
 @publicacoes_ns.route('/health')
 class PublicacoesHealth(Resource):
     @publicacoes_ns.doc('publicacoes_health')
@@ -198,45 +285,46 @@ class PublicacoesList(Resource):
     @publicacoes_ns.param('search', 'Buscar por termo no conteúdo, autores ou advogados', _in='query')
     @publicacoes_ns.param('limit', 'Limitar número de resultados', _in='query', type='integer')
     @publicacoes_ns.param('offset', 'Pular número de registros (paginação)', _in='query', type='integer')
-    @publicacoes_ns.marshal_list_with(publicacao_model)
+    @publicacoes_ns.param('cursor', 'Paginação por cursor: vazio na primeira página, depois o next_cursor recebido', _in='query')
+    @publicacoes_ns.param('fields', 'Campos da resposta separados por vírgula (padrão: todos menos conteudo_completo)', _in='query')
+    @publicacoes_ns.response(200, 'Lista de publicações; com cursor, {data, next_cursor}', [publicacao_model])
+    @publicacoes_ns.response(304, 'Lista inalterada desde o ETag informado')
     def get(self):
         """Lista todas as publicações ou filtra por status"""
         try:
-            repository = SQLAlchemyPublicacaoRepository()
+            repository = with_read_cache(SQLAlchemyPublicacaoRepository())
             
             status = request.args.get('status')
             search = request.args.get('search')
             limit = request.args.get('limit', type=int)
             offset = request.args.get('offset', type=int)
+            try:
+                campos = _parse_fields(request.args.get('fields'))
+            except ValueError as e:
+                return {'error': str(e), 'status': 'error'}, 400
+            
+            # A versão é lida antes da consulta: uma escrita no meio só gera um ETag já vencido
+            etag = _etag('lista', repository.collection_version(status), sorted(request.args.items(multi=True)))
+            headers = _validators(etag)
+            if _not_modified(etag):
+                return Response(status=304, headers=headers)
+            
+            if 'cursor' in request.args:
+                if search or offset:
+                    return {'error': 'cursor não pode ser combinado com search ou offset', 'status': 'error'}, 400
+                page_size = min(max(limit or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+                rows, next_cursor = repository.find_projection(
+                    campos, status=status, limit=page_size, cursor=request.args.get('cursor')
+                )
+                return {'data': [_row_to_dict(row, campos) for row in rows], 'next_cursor': next_cursor}, 200, headers
             
-            if search:
-                publicacoes = repository.search_by_content(search, limit or 50)
-            elif status:
-                publicacoes = repository.find_by_status(status, limit, offset)
-            else:
-                publicacoes = repository.find_all(limit, offset)
-            
-            publicacoes_dict = []
-            for pub in publicacoes:
-                publicacoes_dict.append({
-                    'id': pub.id,
-                    'numero_processo': pub.numero_processo,
-                    'data_disponibilizacao': pub.data_disponibilizacao.isoformat(),
-                    'autores': pub.autores,
-                    'advogados': pub.advogados,
-                    'conteudo_completo': pub.conteudo_completo,
-                    'valor_principal_bruto': pub.valor_principal_bruto,
-                    'valor_principal_liquido': pub.valor_principal_liquido,
-                    'valor_juros_moratorios': pub.valor_juros_moratorios,
-                    'honorarios_advocaticios': pub.honorarios_advocaticios,
-                    'reu': pub.reu,
-                    'status': pub.status,
-                    'created_at': pub.created_at.isoformat() if pub.created_at else None,
-                    'updated_at': pub.updated_at.isoformat() if pub.updated_at else None
-                })
-            
-            return publicacoes_dict
-                    
+            rows, _ = repository.find_projection(
+                campos, status=status, search=search, limit=limit or (50 if search else None), offset=offset
+            )
+            return [_row_to_dict(row, campos) for row in rows], 200, headers
+        
+        except InvalidCursorError as e:
+            return {'error': str(e), 'status': 'error'}, 400
         except Exception as e:
             # Se tabela não existe, retornar array vazio com aviso
             if "does not exist" in str(e) or "relation" in str(e).lower():
@@ -254,6 +342,26 @@ class PublicacoesList(Resource):
                     'status': 'error'
                 }, 500
 
+@publicacoes_ns.route('/search')
+class PublicacoesSearch(Resource):
+    @publicacoes_ns.doc('search_publicacoes')
+    @publicacoes_ns.param('q', 'Termos da busca: palavras, "frase exata", OR e -exclusão', _in='query', required=True)
+    @publicacoes_ns.param('status', 'Filtrar por status (nova, lida, processada)', _in='query')
+    @publicacoes_ns.param('limit', 'Limitar número de resultados', _in='query', type='integer')
+    @publicacoes_ns.response(400, 'Parâmetro q é obrigatório')
+    def get(self):
+        """Busca textual nas publicações, da mais para a menos relevante"""
+        termo = (request.args.get('q') or '').strip()
+        if not termo:
+            publicacoes_ns.abort(400, 'Parâmetro q é obrigatório')
+        limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        
+        repository = SQLAlchemyPublicacaoRepository()
+        hits = repository.search(termo, request.args.get('status'), limit)
+        return marshal([
+            dict(_publicacao_to_dict(hit.publicacao), rank=hit.rank, trecho=hit.trecho) for hit in hits
+        ], publicacao_search_hit_model)
+
 @publicacoes_ns.route('/stats')
 class PublicacoesStats(Resource):
     @publicacoes_ns.doc('get_publicacoes_stats')
@@ -261,7 +369,7 @@ class PublicacoesStats(Resource):
     def get(self):
         """Obtém estatísticas das publicações por status"""
         try:
-            repository = SQLAlchemyPublicacaoRepository()
+            repository = with_read_cache(SQLAlchemyPublicacaoRepository())
             stats = repository.count_by_status()
             
             total = sum(stats.values())
@@ -288,32 +396,26 @@ class PublicacoesStats(Resource):
 @publicacoes_ns.param('id', 'ID da publicação')
 class Publicacao(Resource):
     @publicacoes_ns.doc('get_publicacao')
-    @publicacoes_ns.marshal_with(publicacao_model)
+    @publicacoes_ns.response(200, 'Publicação', publicacao_model)
+    @publicacoes_ns.response(304, 'Não modificada desde o ETag/data informados')
     @publicacoes_ns.response(404, 'Publicação não encontrada')
     def get(self, id):
         """Obtém uma publicação específica pelo ID"""
-        repository = SQLAlchemyPublicacaoRepository()
+        repository = with_read_cache(SQLAlchemyPublicacaoRepository())
+        
+        if request.if_none_match or request.if_modified_since:
+            # Revalidação: só o updated_at é lido, sem a linha inteira
+            updated_at = repository.find_updated_at(id)
+            if updated_at and _not_modified(_publicacao_etag(id, updated_at), updated_at):
+                return Response(status=304, headers=_validators(_publicacao_etag(id, updated_at), updated_at))
+        
         publicacao = repository.find_by_id(id)
         
         if not publicacao:
             publicacoes_ns.abort(404, 'Publicação não encontrada')
         
-        return {
-            'id': publicacao.id,
-            'numero_processo': publicacao.numero_processo,
-            'data_disponibilizacao': publicacao.data_disponibilizacao.isoformat(),
-            'autores': publicacao.autores,
-            'advogados': publicacao.advogados,
-            'conteudo_completo': publicacao.conteudo_completo,
-            'valor_principal_bruto': publicacao.valor_principal_bruto,
-            'valor_principal_liquido': publicacao.valor_principal_liquido,
-            'valor_juros_moratorios': publicacao.valor_juros_moratorios,
-            'honorarios_advocaticios': publicacao.honorarios_advocaticios,
-            'reu': publicacao.reu,
-            'status': publicacao.status,
-            'created_at': publicacao.created_at.isoformat() if publicacao.created_at else None,
-            'updated_at': publicacao.updated_at.isoformat() if publicacao.updated_at else None
-        }
+        headers = _validators(_publicacao_etag(publicacao.id, publicacao.updated_at), publicacao.updated_at)
+        return marshal(_publicacao_to_dict(publicacao), publicacao_model), 200, headers
 
 status_update_model = publicacoes_ns.model('PublicacaoStatusUpdate', {
     'status': fields.String(required=True, description='Novo status', enum=['nova', 'lida', 'processada'])
@@ -329,7 +431,7 @@ class PublicacaoStatus(Resource):
     @publicacoes_ns.response(400, 'Dados inválidos')
     def put(self, id):
         """Atualiza o status de uma publicação"""
-        repository = SQLAlchemyPublicacaoRepository()
+        repository = with_read_cache(SQLAlchemyPublicacaoRepository())
         publicacao = repository.find_by_id(id)
         
         if not publicacao:
@@ -416,13 +518,13 @@ class ScrapingExtract(Resource):
             else:
                 logging.info("Redis indisponível, executando de forma síncrona...")
                 repository = SQLAlchemyPublicacaoRepository()
-                scraper = DJEScraper()
-                use_case = ExtractPublicacoesUseCase(repository, scraper)
+                scraper = create_dje_scraper()
+                use_case = ExtractPublicacoesUseCase(repository, scraper, read_cache=get_read_cache())
                 
                 try:
                     logging.info(f"Iniciando extração síncrona de {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}")
-                    publicacoes = use_case.execute(data_inicio, data_fim)
-                    logging.info(f"Extração concluída: {len(publicacoes)} publicações extraídas")
+                    novas = use_case.execute(data_inicio, data_fim)['novas']
+                    logging.info(f"Extração concluída: {novas} publicações extraídas")
                     
                     import uuid
                     fake_task_id = str(uuid.uuid4())
@@ -430,9 +532,9 @@ class ScrapingExtract(Resource):
                     return {
                         'task_id': fake_task_id,
                         'status': 'Concluído (sync)',
-                        'message': f'Extração concluída com sucesso: {len(publicacoes)} publicações extraídas',
+                        'message': f'Extração concluída com sucesso: {novas} publicações extraídas',
                         'result': {
-                            'total_extraidas': len(publicacoes),
+                            'total_extraidas': novas,
                             'data_inicio': data_inicio.isoformat(),
                             'data_fim': data_fim.isoformat(),
                             'status': 'concluido'
@@ -454,13 +556,13 @@ class ScrapingExtract(Resource):
             try:
                 logging.info("Tentando fallback síncrono...")
                 repository = SQLAlchemyPublicacaoRepository()
-                scraper = DJEScraper()
-                use_case = ExtractPublicacoesUseCase(repository, scraper)
+                scraper = create_dje_scraper()
+                use_case = ExtractPublicacoesUseCase(repository, scraper, read_cache=get_read_cache())
                 
                 try:
                     logging.info(f"Iniciando extração fallback de {data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}")
-                    publicacoes = use_case.execute(data_inicio, data_fim)
-                    logging.info(f"Extração fallback concluída: {len(publicacoes)} publicações extraídas")
+                    novas = use_case.execute(data_inicio, data_fim)['novas']
+                    logging.info(f"Extração fallback concluída: {novas} publicações extraídas")
                     
                     import uuid
                     fake_task_id = str(uuid.uuid4())
@@ -468,9 +570,9 @@ class ScrapingExtract(Resource):
                     return {
                         'task_id': fake_task_id,
                         'status': 'Concluído (fallback)',
-                        'message': f'Redis indisponível. Execução síncrona: {len(publicacoes)} publicações extraídas',
+                        'message': f'Redis indisponível. Execução síncrona: {novas} publicações extraídas',
                         'result': {
-                            'total_extraidas': len(publicacoes),
+                            'total_extraidas': novas,
                             'data_inicio': data_inicio.isoformat(),
                             'data_fim': data_fim.isoformat(),
                             'status': 'concluido'
@@ -1821,7 +1923,7 @@ def run_visual_scraping_thread(data_inicio: datetime, data_fim: datetime):
         
         # Salvar no banco
         publicacoes_salvas = []
-        repository = SQLAlchemyPublicacaoRepository()
+        repository = with_read_cache(SQLAlchemyPublicacaoRepository())
         
         for publicacao_data in publicacoes:
             try:
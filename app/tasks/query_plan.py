@@ -0,0 +1,124 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import product
+from typing import Any, Dict, List, Optional
+from app.tasks.shard_planner import plan_date_shards
+
+def parse_cadernos(valor: Optional[str]) -> List[str]:
+    """Cadernos separados por vírgula (ex.: '-11,12')"""
+    return [c.strip() for c in (valor or '').split(',') if c.strip()]
+
+def parse_queries(valor: Optional[str]) -> List[str]:
+    """Expressões de busca separadas por ';' (as expressões do DJE usam vírgula, aspas e E/OU)"""
+    return [q.strip() for q in (valor or '').split(';') if q.strip()]
+
+def _unicos(valores) -> List[str]:
+    return list(dict.fromkeys(valores))
+
+@dataclass(frozen=True)
+class QueryUnit:
+    """Uma unidade independente do plano: um caderno, uma expressão e uma fatia de datas"""
+    caderno: str
+    query: str
+    data_inicio: datetime
+    data_fim: datetime
+
+    @property
+    def id(self) -> str:
+        raw = f"{self.caderno}|{self.query}|{self.data_inicio.isoformat()}|{self.data_fim.isoformat()}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            'caderno': self.caderno,
+            'query': self.query,
+            'data_inicio': self.data_inicio.isoformat(),
+            'data_fim': self.data_fim.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> 'QueryUnit':
+        return cls(
+            caderno=data['caderno'],
+            query=data['query'],
+            data_inicio=datetime.fromisoformat(data['data_inicio']),
+            data_fim=datetime.fromisoformat(data['data_fim']),
+        )
+
+@dataclass
+class QueryPlan:
+    """
+    Plano declarativo de extração: cadernos × expressões de busca × fatias
+    de data. Cada combinação vira uma QueryUnit executada em paralelo.
+    """
+    cadernos: List[str]
+    queries: List[str]
+    data_inicio: datetime
+    data_fim: datetime
+    shard_days: int = 1
+
+    def __post_init__(self):
+        self.cadernos = _unicos(self.cadernos)
+        self.queries = _unicos(self.queries)
+        if not self.cadernos:
+            raise ValueError("O plano precisa de ao menos um caderno")
+        if not self.queries:
+            raise ValueError("O plano precisa de ao menos uma expressão de busca")
+
+    def units(self) -> List[QueryUnit]:
+        shards = plan_date_shards(self.data_inicio, self.data_fim, self.shard_days)
+        return [
+            QueryUnit(caderno, query, inicio, fim)
+            for caderno, query, (inicio, fim) in product(self.cadernos, self.queries, shards)
+        ]
+
+    @property
+    def key_parts(self):
+        """(caderno, consulta) que identificam o plano no CheckpointStore"""
+        return ','.join(self.cadernos), f"{';'.join(self.queries)}|shards={self.shard_days}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'cadernos': list(self.cadernos),
+            'queries': list(self.queries),
+            'data_inicio': self.data_inicio.isoformat(),
+            'data_fim': self.data_fim.isoformat(),
+            'shard_days': self.shard_days,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QueryPlan':
+        return cls(
+            cadernos=data['cadernos'],
+            queries=data['queries'],
+            data_inicio=datetime.fromisoformat(data['data_inicio']),
+            data_fim=datetime.fromisoformat(data['data_fim']),
+            shard_days=int(data.get('shard_days', 1)),
+        )
+
+def merge_unit_results(resultados: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Consolida os resultados das unidades: soma os contadores, deduplica as
+    publicações por numero_processo e mantém as métricas de cada unidade.
+    Unidades que esgotaram as tentativas chegam com status 'falha'.
+    """
+    resumo = {'total_extraido': 0, 'novas': 0, 'existentes': 0, 'erros': 0}
+    numeros = set()
+    encontrados = 0
+    unidades = []
+    for resultado in resultados:
+        for chave in resumo:
+            resumo[chave] += resultado.get(chave, 0)
+        unit_numeros = resultado.get('numeros_processo') or []
+        numeros.update(unit_numeros)
+        encontrados += len(unit_numeros)
+        unidades.append({k: v for k, v in resultado.items() if k != 'numeros_processo'})
+
+    return dict(
+        resumo,
+        unidades_com_falha=[u.get('unidade') for u in unidades if u.get('status') == 'falha'],
+        processos_distintos=len(numeros),
+        duplicados_entre_unidades=encontrados - len(numeros),
+        unidades=unidades,
+    )
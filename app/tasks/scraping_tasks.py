@@ -1,7 +1,53 @@
+import os
+import time
 from datetime import datetime
 import logging
-from celery import current_task
+from celery import current_task, shared_task, chord
 from app import create_app
+from app.infrastructure import metrics
+from app.tasks.shard_planner import plan_date_shards, plan_missing_days
+from app.tasks.query_plan import QueryPlan, QueryUnit, merge_unit_results, parse_cadernos, parse_queries
+
+def _checkpoint_store():
+    """Checkpoints no Redis para que retries retomem a extração de onde pararam"""
+    from app.infrastructure.redis_client import get_redis
+    from app.infrastructure.scraping.checkpoint_store import CheckpointStore
+    return CheckpointStore(get_redis())
+
+def _read_cache():
+    """Cache de leitura da API, invalidado a cada lote de publicações novas"""
+    from app.infrastructure.repositories.cached_publicacao_repository import get_read_cache
+    return get_read_cache()
+
+def _extract_pending_days(use_case, scrape_run_repository, data_inicio: datetime, data_fim: datetime, logger) -> tuple:
+    """Extrai apenas os dias do período ainda não ingeridos por completo segundo o scrape_runs"""
+    cobertos = scrape_run_repository.find_completed_ranges(
+        data_inicio,
+        data_fim,
+        getattr(use_case.dje_scraper, 'caderno', None),
+        getattr(use_case.dje_scraper, 'query', None)
+    )
+    pendentes = plan_missing_days(data_inicio, data_fim, cobertos)
+    
+    total_dias = len(plan_date_shards(data_inicio, data_fim))
+    logger.info(f"{len(pendentes)} de {total_dias} dias pendentes entre {data_inicio.date()} e {data_fim.date()}")
+    
+    task_name = getattr(current_task, 'name', None) or 'local'
+    novas = 0
+    for inicio, fim in pendentes:
+        with metrics.task_labels(task_name, metrics.shard_label(inicio, fim)):
+            novas += use_case.execute(inicio, fim)['novas']
+    return novas, len(pendentes)
+
+def _shard_parent_key(data_inicio: datetime, data_fim: datetime, shard_days: int) -> str:
+    from app.infrastructure.scraping.checkpoint_store import CheckpointStore
+    from app.infrastructure.scraping.dje_scraper import DJEScraper
+    return CheckpointStore.make_key(
+        data_inicio,
+        data_fim,
+        DJEScraper.DEFAULT_CADERNO,
+        f"{DJEScraper.DEFAULT_QUERY}|shards={shard_days}"
+    )
 
 def extract_publicacoes_task(data_inicio_str: str, data_fim_str: str):
     logger = logging.getLogger(__name__)
@@ -14,15 +60,22 @@ def extract_publicacoes_task(data_inicio_str: str, data_fim_str: str):
         with app.app_context():
             from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
             from app.infrastructure.repositories.sqlalchemy_publicacao_repository import SQLAlchemyPublicacaoRepository
-            from app.infrastructure.scraping.dje_scraper import DJEScraper
+            from app.infrastructure.repositories.sqlalchemy_scrape_run_repository import SQLAlchemyScrapeRunRepository
+            from app.infrastructure.scraping.scraper_factory import create_dje_scraper
             
             data_inicio = datetime.fromisoformat(data_inicio_str)
             data_fim = datetime.fromisoformat(data_fim_str)
             
             logger.info("Inicializando componentes...")
             repository = SQLAlchemyPublicacaoRepository()
-            scraper = DJEScraper()
-            use_case = ExtractPublicacoesUseCase(repository, scraper)
+            scraper = create_dje_scraper()
+            use_case = ExtractPublicacoesUseCase(
+                repository,
+                scraper,
+                checkpoint_store=_checkpoint_store(),
+                scrape_run_repository=SQLAlchemyScrapeRunRepository(),
+                read_cache=_read_cache()
+            )
             
             if current_task:
                 current_task.update_state(
@@ -36,8 +89,9 @@ def extract_publicacoes_task(data_inicio_str: str, data_fim_str: str):
             
             try:
                 logger.info("Executando extração...")
-                publicacoes = use_case.execute(data_inicio, data_fim)
-                logger.info(f"Extração concluída com sucesso: {len(publicacoes)} publicações extraídas")
+                with metrics.task_labels('extract_publicacoes_task', metrics.shard_label(data_inicio, data_fim)):
+                    novas = use_case.execute(data_inicio, data_fim)['novas']
+                logger.info(f"Extração concluída com sucesso: {novas} publicações extraídas")
                 
                 if current_task:
                     current_task.update_state(
@@ -45,16 +99,16 @@ def extract_publicacoes_task(data_inicio_str: str, data_fim_str: str):
                         meta={
                             'current': 100,
                             'total': 100,
-                            'status': f'Concluído: {len(publicacoes)} publicações extraídas'
+                            'status': f'Concluído: {novas} publicações extraídas'
                         }
                     )
                 
                 return {
-                    'total_extraidas': len(publicacoes),
+                    'total_extraidas': novas,
                     'data_inicio': data_inicio_str,
                     'data_fim': data_fim_str,
                     'status': 'concluido',
-                    'mensagem': f'Extração concluída com sucesso: {len(publicacoes)} publicações extraídas'
+                    'mensagem': f'Extração concluída com sucesso: {novas} publicações extraídas'
                 }
                 
             except Exception as e:
@@ -102,21 +156,31 @@ def extract_daily_publicacoes():
         try:
             from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
             from app.infrastructure.repositories.sqlalchemy_publicacao_repository import SQLAlchemyPublicacaoRepository
-            from app.infrastructure.scraping.dje_scraper import DJEScraper
+            from app.infrastructure.repositories.sqlalchemy_scrape_run_repository import SQLAlchemyScrapeRunRepository
+            from app.infrastructure.scraping.scraper_factory import create_dje_scraper
             
+            # Além de ontem, recupera dias da janela que ficaram sem ingestão completa
             ontem = date.today() - timedelta(days=1)
-            data_inicio = datetime.combine(ontem, datetime.min.time())
-            data_fim = datetime.combine(ontem, datetime.max.time())
+            lookback_days = max(1, app.config.get('SCRAPING_LOOKBACK_DAYS', 7))
+            data_inicio = datetime.combine(ontem - timedelta(days=lookback_days - 1), datetime.min.time())
+            data_fim = datetime.combine(ontem, datetime.max.time()).replace(microsecond=0)
             
-            logger.info(f"Iniciando raspagem diária para {ontem}")
+            logger.info(f"Iniciando raspagem diária até {ontem} (janela de {lookback_days} dias)")
             
             repository = SQLAlchemyPublicacaoRepository()
-            scraper = DJEScraper()
-            use_case = ExtractPublicacoesUseCase(repository, scraper)
+            scrape_run_repository = SQLAlchemyScrapeRunRepository()
+            scraper = create_dje_scraper()
+            use_case = ExtractPublicacoesUseCase(
+                repository,
+                scraper,
+                checkpoint_store=_checkpoint_store(),
+                scrape_run_repository=scrape_run_repository,
+                read_cache=_read_cache()
+            )
             
             try:
-                publicacoes = use_case.execute(data_inicio, data_fim)
-                resultado = f"Raspagem diária concluída: {len(publicacoes)} publicações extraídas do dia {ontem}"
+                novas, dias = _extract_pending_days(use_case, scrape_run_repository, data_inicio, data_fim, logger)
+                resultado = f"Raspagem diária concluída: {novas} publicações extraídas de {dias} dias pendentes"
                 logger.info(resultado)
                 return resultado
             
@@ -147,7 +211,8 @@ def extract_full_period_publicacoes():
         try:
             from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
             from app.infrastructure.repositories.sqlalchemy_publicacao_repository import SQLAlchemyPublicacaoRepository
-            from app.infrastructure.scraping.dje_scraper import DJEScraper
+            from app.infrastructure.repositories.sqlalchemy_scrape_run_repository import SQLAlchemyScrapeRunRepository
+            from app.infrastructure.scraping.scraper_factory import create_dje_scraper
             
             data_inicio = datetime(2024, 10, 1)
             data_fim = datetime(2024, 11, 29, 23, 59, 59)
@@ -155,12 +220,19 @@ def extract_full_period_publicacoes():
             logger.info(f"Iniciando raspagem completa do período: {data_inicio} a {data_fim}")
             
             repository = SQLAlchemyPublicacaoRepository()
-            scraper = DJEScraper()
-            use_case = ExtractPublicacoesUseCase(repository, scraper)
+            scrape_run_repository = SQLAlchemyScrapeRunRepository()
+            scraper = create_dje_scraper()
+            use_case = ExtractPublicacoesUseCase(
+                repository,
+                scraper,
+                checkpoint_store=_checkpoint_store(),
+                scrape_run_repository=scrape_run_repository,
+                read_cache=_read_cache()
+            )
             
             try:
-                publicacoes = use_case.execute(data_inicio, data_fim)
-                resultado = f"Raspagem completa concluída: {len(publicacoes)} publicações extraídas do período"
+                novas, dias = _extract_pending_days(use_case, scrape_run_repository, data_inicio, data_fim, logger)
+                resultado = f"Raspagem completa concluída: {novas} publicações extraídas de {dias} dias pendentes"
                 logger.info(resultado)
                 return resultado
             
@@ -187,7 +259,8 @@ def extract_custom_period_publicacoes(data_inicio_str: str, data_fim_str: str):
         try:
             from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
             from app.infrastructure.repositories.sqlalchemy_publicacao_repository import SQLAlchemyPublicacaoRepository
-            from app.infrastructure.scraping.dje_scraper import DJEScraper
+            from app.infrastructure.repositories.sqlalchemy_scrape_run_repository import SQLAlchemyScrapeRunRepository
+            from app.infrastructure.scraping.scraper_factory import create_dje_scraper
             
             data_inicio = datetime.fromisoformat(data_inicio_str)
             data_fim = datetime.fromisoformat(data_fim_str)
@@ -195,12 +268,19 @@ def extract_custom_period_publicacoes(data_inicio_str: str, data_fim_str: str):
             logger.info(f"Iniciando raspagem customizada: {data_inicio} a {data_fim}")
             
             repository = SQLAlchemyPublicacaoRepository()
-            scraper = DJEScraper()
-            use_case = ExtractPublicacoesUseCase(repository, scraper)
+            scraper = create_dje_scraper()
+            use_case = ExtractPublicacoesUseCase(
+                repository,
+                scraper,
+                checkpoint_store=_checkpoint_store(),
+                scrape_run_repository=SQLAlchemyScrapeRunRepository(),
+                read_cache=_read_cache()
+            )
             
             try:
-                publicacoes = use_case.execute(data_inicio, data_fim)
-                resultado = f"Raspagem customizada concluída: {len(publicacoes)} publicações extraídas"
+                with metrics.task_labels('extract_custom_period_publicacoes', metrics.shard_label(data_inicio, data_fim)):
+                    novas = use_case.execute(data_inicio, data_fim)['novas']
+                resultado = f"Raspagem customizada concluída: {novas} publicações extraídas"
                 logger.info(resultado)
                 return resultado
             
@@ -215,4 +295,322 @@ def extract_custom_period_publicacoes(data_inicio_str: str, data_fim_str: str):
             
         except Exception as e:
             logger.error(f"Erro fatal na raspagem customizada: {str(e)}")
-            raise e 
\ No newline at end of file
+            raise e
+
+class ShardExtractionError(Exception):
+    """Falha parcial na extração de uma fatia, usada para disparar o retry da fatia"""
+
+def _esgotou_tentativas(task) -> bool:
+    """Última tentativa: a falha vira resultado para o callback do chord ainda rodar"""
+    return task.request.retries >= task.max_retries
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_backoff_max=600, max_retries=3)
+def extract_shard_task(self, data_inicio_str: str, data_fim_str: str, parent_key: str = None):
+    """Extrai publicações de uma única fatia do período; cada fatia tem seu próprio retry"""
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.INFO)
+    
+    app = create_app()
+    with app.app_context():
+        from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
+        from app.infrastructure.repositories.sqlalchemy_publicacao_repository import SQLAlchemyPublicacaoRepository
+        from app.infrastructure.repositories.sqlalchemy_scrape_run_repository import SQLAlchemyScrapeRunRepository
+        from app.infrastructure.scraping.scraper_factory import create_dje_scraper
+        
+        data_inicio = datetime.fromisoformat(data_inicio_str)
+        data_fim = datetime.fromisoformat(data_fim_str)
+        
+        logger.info(f"Iniciando fatia {data_inicio_str} a {data_fim_str} (tentativa {self.request.retries + 1})")
+        
+        scraper = None
+        use_case = None
+        try:
+            # Dentro do try: falha ao iniciar o Chrome também vira resultado na última tentativa
+            scraper = create_dje_scraper()
+            use_case = ExtractPublicacoesUseCase(
+                SQLAlchemyPublicacaoRepository(),
+                scraper,
+                checkpoint_store=_checkpoint_store(),
+                scrape_run_repository=SQLAlchemyScrapeRunRepository(),
+                read_cache=_read_cache()
+            )
+            
+            with metrics.task_labels(self.name, metrics.shard_label(data_inicio, data_fim)):
+                use_case.execute(data_inicio, data_fim)
+            
+            paginas_com_falha = getattr(scraper, 'paginas_com_falha', None)
+            if paginas_com_falha:
+                raise ShardExtractionError(
+                    f"Fatia {data_inicio_str} a {data_fim_str} com páginas com falha: {[f['pagina'] for f in paginas_com_falha]}"
+                )
+            
+            if parent_key:
+                _checkpoint_store().save_shard(parent_key, data_inicio)
+            
+            return dict(use_case.resumo, data_inicio=data_inicio_str, data_fim=data_fim_str)
+        
+        except Exception as e:
+            if not _esgotou_tentativas(self):
+                raise
+            logger.error(f"Fatia {data_inicio_str} a {data_fim_str} falhou após {self.request.retries + 1} tentativas: {e}")
+            resumo = use_case.resumo if use_case else {}
+            return dict(resumo, data_inicio=data_inicio_str, data_fim=data_fim_str, status='falha', erro=str(e))
+        
+        finally:
+            if scraper:
+                scraper.close()
+
+@shared_task
+def aggregate_shards_task(resultados, data_inicio_str: str, data_fim_str: str, parent_key: str = None):
+    """Consolida os resumos das fatias no mesmo formato registrado pelo use case"""
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.INFO)
+    
+    from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
+    
+    resumo = {'total_extraido': 0, 'novas': 0, 'existentes': 0, 'erros': 0}
+    for resultado in resultados:
+        for chave in resumo:
+            resumo[chave] += resultado.get(chave, 0)
+    falhas = [
+        {'data_inicio': r.get('data_inicio'), 'data_fim': r.get('data_fim'), 'erro': r.get('erro')}
+        for r in resultados if r.get('status') == 'falha'
+    ]
+    
+    logger.info(f"Período {data_inicio_str} a {data_fim_str} concluído em {len(resultados)} fatias")
+    logger.info(ExtractPublicacoesUseCase.formatar_resumo(resumo))
+    
+    # Com fatias falhas o checkpoint fica: um novo despacho refaz só elas
+    if falhas:
+        logger.warning(f"{len(falhas)} fatias falharam: {[f['data_inicio'] for f in falhas]}")
+    elif parent_key:
+        _checkpoint_store().clear(parent_key)
+    
+    return dict(
+        resumo,
+        data_inicio=data_inicio_str,
+        data_fim=data_fim_str,
+        fatias=len(resultados),
+        fatias_com_falha=falhas,
+        status='parcial' if falhas else 'concluido'
+    )
+
+@shared_task
+def extract_sharded_period_publicacoes(data_inicio_str: str, data_fim_str: str, shard_days: int = 1):
+    """Divide o período em fatias de shard_days dias e as despacha como um chord do Celery"""
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.INFO)
+    
+    data_inicio = datetime.fromisoformat(data_inicio_str)
+    data_fim = datetime.fromisoformat(data_fim_str)
+    shards = plan_date_shards(data_inicio, data_fim, shard_days)
+    
+    # Fatias já concluídas em um despacho anterior do mesmo período são puladas
+    parent_key = _shard_parent_key(data_inicio, data_fim, shard_days)
+    concluidas = _checkpoint_store().completed_shards(parent_key)
+    pendentes = [(inicio, fim) for inicio, fim in shards if inicio.isoformat() not in concluidas]
+    
+    logger.info(
+        f"Despachando {len(pendentes)} de {len(shards)} fatias para o período {data_inicio_str} a {data_fim_str}"
+    )
+
+    if not pendentes:
+        _checkpoint_store().clear(parent_key)
+        return {
+            'chord_id': None,
+            'fatias': 0,
+            'fatias_concluidas': len(shards),
+            'data_inicio': data_inicio_str,
+            'data_fim': data_fim_str
+        }
+
+    header = [extract_shard_task.s(inicio.isoformat(), fim.isoformat(), parent_key) for inicio, fim in pendentes]
+    result = chord(header)(aggregate_shards_task.s(data_inicio_str, data_fim_str, parent_key))
+    
+    return {
+        'chord_id': result.id,
+        'fatias': len(pendentes),
+        'fatias_concluidas': len(shards) - len(pendentes),
+        'data_inicio': data_inicio_str,
+        'data_fim': data_fim_str
+    }
+
+def _query_plan(data_inicio: datetime, data_fim: datetime, shard_days: int, cadernos=None, queries=None) -> QueryPlan:
+    """Plano com os cadernos/consultas pedidos ou, na falta deles, os de SCRAPING_CADERNOS/SCRAPING_QUERIES"""
+    from flask import current_app, has_app_context
+    from app.infrastructure.scraping.dje_scraper import DJEScraper
+    config = current_app.config if has_app_context() else os.environ
+    return QueryPlan(
+        cadernos=cadernos or parse_cadernos(config.get('SCRAPING_CADERNOS')) or [DJEScraper.DEFAULT_CADERNO],
+        queries=queries or parse_queries(config.get('SCRAPING_QUERIES')) or [DJEScraper.DEFAULT_QUERY],
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        shard_days=shard_days
+    )
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_backoff_max=600, max_retries=3)
+def extract_query_unit_task(self, unit_data: dict, parent_key: str = None):
+    """Executa uma unidade do plano (caderno × consulta × fatia) com retry próprio"""
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.INFO)
+    
+    app = create_app()
+    with app.app_context():
+        from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
+        from app.infrastructure.repositories.sqlalchemy_publicacao_repository import SQLAlchemyPublicacaoRepository
+        from app.infrastructure.repositories.sqlalchemy_scrape_run_repository import SQLAlchemyScrapeRunRepository
+        from app.infrastructure.scraping.scraper_factory import create_dje_scraper
+        
+        unit = QueryUnit.from_dict(unit_data)
+        logger.info(
+            f"Iniciando unidade {unit.id}: caderno {unit.caderno}, consulta {unit.query!r}, "
+            f"{unit.data_inicio.isoformat()} a {unit.data_fim.isoformat()} (tentativa {self.request.retries + 1})"
+        )
+        
+        scraper = None
+        use_case = None
+        try:
+            scraper = create_dje_scraper(caderno=unit.caderno, query=unit.query)
+            use_case = ExtractPublicacoesUseCase(
+                SQLAlchemyPublicacaoRepository(),
+                scraper,
+                checkpoint_store=_checkpoint_store(),
+                scrape_run_repository=SQLAlchemyScrapeRunRepository(),
+                read_cache=_read_cache(),
+                # A unidade cobre uma fatia curta; os números alimentam a deduplicação entre unidades
+                registrar_processos=True
+            )
+            
+            inicio = time.monotonic()
+            with metrics.task_labels(self.name, metrics.shard_label(unit.data_inicio, unit.data_fim)):
+                use_case.execute(unit.data_inicio, unit.data_fim)
+            duracao = time.monotonic() - inicio
+            
+            paginas_com_falha = getattr(scraper, 'paginas_com_falha', None)
+            if paginas_com_falha:
+                raise ShardExtractionError(
+                    f"Unidade {unit.id} com páginas com falha: {[f['pagina'] for f in paginas_com_falha]}"
+                )
+            
+            if parent_key:
+                _checkpoint_store().save_shard(parent_key, unit.id)
+            
+            return dict(
+                use_case.resumo,
+                **unit.to_dict(),
+                unidade=unit.id,
+                duracao_segundos=round(duracao, 2),
+                tentativas=self.request.retries + 1,
+                numeros_processo=sorted(use_case.numeros_processo)
+            )
+        
+        except Exception as e:
+            if not _esgotou_tentativas(self):
+                raise
+            logger.error(f"Unidade {unit.id} falhou após {self.request.retries + 1} tentativas: {e}")
+            return dict(
+                use_case.resumo if use_case else {},
+                **unit.to_dict(),
+                unidade=unit.id,
+                tentativas=self.request.retries + 1,
+                status='falha',
+                erro=str(e)
+            )
+        
+        finally:
+            if scraper:
+                scraper.close()
+
+@shared_task
+def aggregate_query_plan_task(resultados, plan_data: dict, parent_key: str = None):
+    """Consolida as unidades do plano, deduplicando as publicações por numero_processo"""
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.INFO)
+    
+    from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
+    
+    consolidado = merge_unit_results(resultados)
+    logger.info(
+        f"Plano {plan_data['data_inicio']} a {plan_data['data_fim']} concluído em {len(resultados)} unidades: "
+        f"{consolidado['processos_distintos']} processos distintos, "
+        f"{consolidado['duplicados_entre_unidades']} encontrados por mais de uma unidade"
+    )
+    logger.info(ExtractPublicacoesUseCase.formatar_resumo(consolidado))
+    
+    # Com unidades falhas o checkpoint fica: um novo despacho refaz só elas
+    if consolidado['unidades_com_falha']:
+        logger.warning(f"{len(consolidado['unidades_com_falha'])} unidades falharam: {consolidado['unidades_com_falha']}")
+    elif parent_key:
+        _checkpoint_store().clear(parent_key)
+    
+    return dict(consolidado, plano=plan_data, status='parcial' if consolidado['unidades_com_falha'] else 'concluido')
+
+@shared_task
+def extract_query_plan_publicacoes(data_inicio_str: str, data_fim_str: str, shard_days: int = 1,
+                                   cadernos: list = None, queries: list = None):
+    """Despacha as unidades do plano de consultas como um chord do Celery"""
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.INFO)
+    
+    plan = _query_plan(
+        datetime.fromisoformat(data_inicio_str),
+        datetime.fromisoformat(data_fim_str),
+        shard_days,
+        cadernos,
+        queries
+    )
+    units = plan.units()
+    
+    # Unidades concluídas em um despacho anterior do mesmo plano são puladas
+    from app.infrastructure.scraping.checkpoint_store import CheckpointStore
+    parent_key = CheckpointStore.make_key(plan.data_inicio, plan.data_fim, *plan.key_parts)
+    concluidas = _checkpoint_store().completed_shards(parent_key)
+    pendentes = [unit for unit in units if unit.id not in concluidas]
+    
+    logger.info(
+        f"Despachando {len(pendentes)} de {len(units)} unidades "
+        f"({len(plan.cadernos)} cadernos × {len(plan.queries)} consultas) para {data_inicio_str} a {data_fim_str}"
+    )
+    
+    resposta = {
+        'unidades': len(pendentes),
+        'unidades_concluidas': len(units) - len(pendentes),
+        'plano': plan.to_dict()
+    }
+    if not pendentes:
+        _checkpoint_store().clear(parent_key)
+        return dict(resposta, chord_id=None)
+    
+    header = [extract_query_unit_task.s(unit.to_dict(), parent_key) for unit in pendentes]
+    result = chord(header)(aggregate_query_plan_task.s(plan.to_dict(), parent_key))
+    return dict(resposta, chord_id=result.id)
+
+@shared_task
+def driver_pool_stats():
+    """Métricas do pool de drivers do Chrome no processo do worker"""
+    from app.infrastructure.scraping.scraper_factory import get_driver_pool
+    
+    pool = get_driver_pool()
+    if pool is None:
+        return {'enabled': False}
+    return dict(pool.stats(), enabled=True)
+
+@shared_task
+def warm_seen_set():
+    """Recarrega o filtro de processos vistos a partir de publicacoes.numero_processo"""
+    from app.infrastructure.scraping.scraper_factory import create_seen_set
+    
+    seen_set = create_seen_set()
+    if seen_set is None:
+        return {'enabled': False}
+    return {'enabled': True, 'itens': seen_set.warm(), 'bits': seen_set.size, 'hashes': seen_set.hashes}
+
+@shared_task
+def politeness_stats():
+    """Concorrência e taxa atuais do agendador de requisições ao DJE"""
+    from app.infrastructure.scraping.scraper_factory import get_politeness_scheduler
+    
+    scheduler = get_politeness_scheduler()
+    if scheduler is None:
+        return {'enabled': False}
+    return dict(scheduler.stats('https://dje.tjsp.jus.br'), enabled=True)
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+
+def plan_date_shards(data_inicio: datetime, data_fim: datetime, shard_days: int = 1) -> List[Tuple[datetime, datetime]]:
+    """
+    Divide o intervalo [data_inicio, data_fim] em fatias de shard_days dias.
+    Cada fatia começa às 00:00:00 e termina às 23:59:59 do seu último dia,
+    exceto nas pontas, que respeitam os horários pedidos.
+    """
+    if shard_days < 1:
+        raise ValueError("shard_days deve ser maior ou igual a 1")
+    if data_inicio > data_fim:
+        raise ValueError("Data de início deve ser anterior à data fim")
+
+    shards = []
+    inicio = data_inicio
+    while inicio <= data_fim:
+        ultimo_dia = inicio.date() + timedelta(days=shard_days - 1)
+        fim = min(datetime.combine(ultimo_dia, datetime.max.time()).replace(microsecond=0), data_fim)
+        shards.append((inicio, fim))
+        inicio = datetime.combine(ultimo_dia + timedelta(days=1), datetime.min.time())
+    return shards
+
+def plan_missing_days(data_inicio: datetime, data_fim: datetime,
+                      cobertos: Iterable[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+    """
+    Fatias diárias de [data_inicio, data_fim] que ainda não foram cobertas
+    por completo por nenhum dos intervalos já concluídos em cobertos.
+    """
+    cobertos = list(cobertos)
+    return [
+        (inicio, fim) for inicio, fim in plan_date_shards(data_inicio, data_fim)
+        if not any(cob_inicio <= inicio and cob_fim >= fim for cob_inicio, cob_fim in cobertos)
+    ]
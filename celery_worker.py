@@ -1,5 +1,8 @@
 import os
+import logging
+import threading
 from celery import Celery
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 from app import create_app
 
 def create_celery(app=None):
@@ -9,7 +12,8 @@ def create_celery(app=None):
     celery = Celery(
         app.import_name,
         backend=os.getenv('REDIS_URL', 'redis://redis:6379/0'),
-        broker=os.getenv('REDIS_URL', 'redis://redis:6379/0')
+        broker=os.getenv('REDIS_URL', 'redis://redis:6379/0'),
+        include=['app.tasks.scraping_tasks']
     )
     
     celery.conf.update(
@@ -31,6 +35,10 @@ def create_celery(app=None):
                 'task': 'app.tasks.scraping_tasks.scrape_dje_task',
                 'schedule': 3600.0,
             },
+            'warm-seen-set': {
+                'task': 'app.tasks.scraping_tasks.warm_seen_set',
+                'schedule': 86400.0,
+            },
             'cleanup-old-data': {
                 'task': 'app.tasks.maintenance_tasks.cleanup_old_data',
                 'schedule': 86400.0,
@@ -46,4 +54,58 @@ def create_celery(app=None):
     celery.Task = ContextTask
     return celery
 
-celery = create_celery() 
\ No newline at end of file
+celery = create_celery()
+
+def _metrics_port():
+    if os.environ.get('METRICS_ENABLED', 'true').lower() != 'true':
+        return None
+    return int(os.environ.get('METRICS_WORKER_PORT', 9808))
+
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    """Com PROMETHEUS_MULTIPROC_DIR, o processo principal exporta as métricas de todos os filhos"""
+    port = _metrics_port()
+    if port and os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from app.infrastructure.metrics import start_exporter
+        start_exporter(port)
+
+@worker_process_init.connect
+def start_process_metrics_exporter(**kwargs):
+    """Sem modo multiprocesso, as métricas vivem no processo filho que executa as tasks"""
+    port = _metrics_port()
+    if port and not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from app.infrastructure.metrics import start_exporter
+        start_exporter(port)
+
+def _warm_driver_pool():
+    try:
+        app = create_app()
+        with app.app_context():
+            from app.infrastructure.scraping.scraper_factory import get_driver_pool, get_scraper_engine
+            if get_scraper_engine() != 'selenium':
+                return
+            pool = get_driver_pool()
+            if pool is not None:
+                pool.warm()
+    except Exception as e:
+        logging.warning(f"Não foi possível pré-inicializar o pool de drivers: {e}")
+
+@worker_process_init.connect
+def warm_driver_pool(**kwargs):
+    """
+    Pré-inicializa o pool de drivers do Chrome em cada processo do worker, numa
+    thread: o Celery mata o filho cuja inicialização passa de worker_proc_alive_timeout
+    (4s), e baixar o driver e subir o Chrome costuma passar disso.
+    """
+    threading.Thread(target=_warm_driver_pool, name='driver-pool-warm', daemon=True).start()
+
+@worker_process_shutdown.connect
+def close_driver_pool(**kwargs):
+    from app.infrastructure.scraping import scraper_factory
+    if scraper_factory._driver_pool is not None:
+        scraper_factory._driver_pool.close_all()
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    from app.infrastructure.metrics import mark_process_dead
+    mark_process_dead(pid)
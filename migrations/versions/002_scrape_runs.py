@@ -0,0 +1,50 @@
+"""Create scrape_runs ledger table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Registro das execuções de scraping por período, usado para pular dias já ingeridos
+    op.create_table('scrape_runs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('data_inicio', sa.DateTime(), nullable=False),
+        sa.Column('data_fim', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total_extraido', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('novas', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('existentes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('erros', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('paginas_com_falha', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    
+    op.create_index('ix_scrape_runs_status', 'scrape_runs', ['status'])
+    op.create_index('idx_scrape_runs_status_periodo', 'scrape_runs', ['status', 'data_inicio', 'data_fim'])
+    
+    op.create_check_constraint(
+        'chk_scrape_runs_status',
+        'scrape_runs',
+        "status IN ('em_andamento', 'completo', 'incompleto', 'falha')"
+    )
+    
+    op.execute("COMMENT ON TABLE scrape_runs IS 'Execuções de scraping do DJE por período, com contagens e status'")
+
+
+def downgrade():
+    op.drop_index('idx_scrape_runs_status_periodo', table_name='scrape_runs')
+    op.drop_index('ix_scrape_runs_status', table_name='scrape_runs')
+    op.drop_table('scrape_runs')
@@ -0,0 +1,33 @@
+"""Record caderno and search expression on scrape_runs
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Com planos de consulta, um dia só está ingerido para o caderno/consulta que o cobriu
+    op.add_column('scrape_runs', sa.Column('caderno', sa.String(length=10), nullable=True))
+    op.add_column('scrape_runs', sa.Column('consulta', sa.Text(), nullable=True))
+    
+    # Execuções anteriores usaram sempre o caderno e a consulta padrão do scraper
+    op.execute(
+        "UPDATE scrape_runs SET caderno = '-11', "
+        "consulta = '\"instituto nacional do seguro social\" E inss' "
+        "WHERE caderno IS NULL"
+    )
+
+
+def downgrade():
+    op.drop_column('scrape_runs', 'consulta')
+    op.drop_column('scrape_runs', 'caderno')
@@ -0,0 +1,30 @@
+"""Composite indexes for keyset pagination of publicacoes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A listagem pagina por (created_at, id) decrescente; o índice é lido de trás para frente
+    op.create_index('idx_publicacoes_created_at_id', 'publicacoes', ['created_at', 'id'])
+    op.create_index('idx_publicacoes_status_created_at_id', 'publicacoes', ['status', 'created_at', 'id'])
+    
+    # Prefixo do índice composto, só custaria escrita
+    op.drop_index('idx_publicacoes_created_at', table_name='publicacoes')
+
+
+def downgrade():
+    op.create_index('idx_publicacoes_created_at', 'publicacoes', ['created_at'])
+    op.drop_index('idx_publicacoes_status_created_at_id', table_name='publicacoes')
+    op.drop_index('idx_publicacoes_created_at_id', table_name='publicacoes')
@@ -0,0 +1,47 @@
+"""Full-text search column and GIN index on publicacoes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Português sem acentos; com regconfig explícito o to_tsvector é imutável e pode gerar a coluna
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    op.execute('''
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'juscash_pt') THEN
+                CREATE TEXT SEARCH CONFIGURATION juscash_pt (COPY = portuguese);
+                ALTER TEXT SEARCH CONFIGURATION juscash_pt
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+            END IF;
+        END
+        $$;
+    ''')
+    
+    # Reescreve a tabela para preencher a coluna nas linhas existentes
+    op.execute('''
+        ALTER TABLE publicacoes ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('juscash_pt'::regconfig, coalesce(numero_processo, '')), 'A') ||
+            setweight(to_tsvector('juscash_pt'::regconfig, coalesce(autores, '') || ' ' || coalesce(advogados, '')), 'B') ||
+            setweight(to_tsvector('juscash_pt'::regconfig, coalesce(conteudo_completo, '')), 'C')
+        ) STORED
+    ''')
+    op.execute('CREATE INDEX idx_publicacoes_search_vector ON publicacoes USING gin (search_vector)')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS idx_publicacoes_search_vector')
+    op.drop_column('publicacoes', 'search_vector')
+    op.execute('DROP TEXT SEARCH CONFIGURATION IF EXISTS juscash_pt')
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Compara o parser de páginas de resultados (lxml restrito à
+div#divResultadosInferior) com o caminho anterior (BeautifulSoup com
+html.parser na página inteira) sobre as capturas gravadas.
+
+Uso: python scripts/benchmark-result-parser.py /app/captures [--repeticoes 5]
+     python scripts/benchmark-result-parser.py --sintetico 50
+"""
+import os
+import sys
+import time
+import json
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup
+from app.infrastructure.scraping.capture_archive import CaptureArchive
+from app.infrastructure.scraping.result_page_parser import parse_result_page
+
+def parse_bs4(html):
+    """Caminho anterior: parse completo e seleção por CSS"""
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    for element in soup.select('div#divResultadosInferior table tr.fundocinza1'):
+        conteudo = element.select_one('tr.ementaClass2 td')
+        rows.append(conteudo.get_text(strip=True) if conteudo else None)
+    return rows
+
+def parse_lxml(html):
+    return [row.conteudo for row in parse_result_page(html).rows]
+
+def pagina_sintetica(linhas):
+    """Página com o formato do DJE: cabeçalho e scripts pesados antes dos resultados"""
+    scripts = ''.join(f'<script>function f{i}() {{ return "{"x" * 200}"; }}</script>' for i in range(200))
+    publicacoes = ''.join(
+        f'<tr class="fundocinza1"><td><table>'
+        f'<tr class="ementaClass"><td><a onclick="consultaSimples.do?id={i}">Publicação 01/10/2024</a></td></tr>'
+        f'<tr class="ementaClass2"><td>Processo {i:07d}-56.2024.8.26.0053 - Requerente: Maria Souza, '
+        f'Advogado: Joao Lima (OAB: 12345/SP) valor principal bruto: R$ 1.234,56 {"texto " * 80}</td></tr>'
+        f'</table></td></tr>'
+        for i in range(linhas)
+    )
+    return (f'<html><head>{scripts}</head><body><form name="consultaAvancadaForm">{"<input/>" * 300}</form>'
+            f'<div id="divResultadosInferior"><table>{publicacoes}</table>'
+            f'<a onclick="trocaDePg(2);">Próximo&gt;</a></div></body></html>')
+
+def medir(func, paginas, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for html in paginas:
+            func(html)
+    segundos = time.perf_counter() - inicio
+    total = len(paginas) * repeticoes
+    return {'segundos': round(segundos, 4), 'ms_por_pagina': round(segundos * 1000 / total, 3) if total else None}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do parser de páginas de resultados do DJE')
+    parser.add_argument('diretorio', nargs='?', help='Diretório do arquivo de capturas')
+    parser.add_argument('--sintetico', type=int, help='Usa uma página sintética com N publicações')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.sintetico:
+        paginas = [pagina_sintetica(args.sintetico)]
+    elif args.diretorio:
+        archive = CaptureArchive(args.diretorio)
+        paginas = [content.decode('utf-8', errors='replace') for _, content in archive.iter_records('result_page')]
+    else:
+        parser.error('informe o diretório de capturas ou --sintetico')
+
+    if not paginas:
+        print("⚠️ Nenhuma página de resultados capturada")
+        return 1
+
+    divergentes = sum(1 for html in paginas if parse_bs4(html) != parse_lxml(html))
+    resultado = {
+        'paginas': len(paginas),
+        'bytes': sum(len(html) for html in paginas),
+        'divergentes': divergentes,
+        'beautifulsoup': medir(parse_bs4, paginas, args.repeticoes),
+        'lxml_restrito': medir(parse_lxml, paginas, args.repeticoes),
+    }
+    if resultado['lxml_restrito']['segundos']:
+        resultado['ganho'] = round(resultado['beautifulsoup']['segundos'] / resultado['lxml_restrito']['segundos'], 1)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    return 1 if divergentes else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
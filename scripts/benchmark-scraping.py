@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark ponta a ponta do scraping contra o DJE falso de tests/fake_dje.py:
+sobe o servidor local, executa o ExtractPublicacoesUseCase com o motor
+escolhido e reporta publicações por segundo. Latência, jitter e falhas são
+sorteados com semente fixa, então duas execuções são comparáveis.
+
+Uso: python scripts/benchmark-scraping.py [--publicacoes 200] [--latencia 0.05] [--motor http|selenium]
+     python scripts/benchmark-scraping.py --pdfs --taxa-erro 0.02 --repeticoes 3
+     python scripts/benchmark-scraping.py --capturas /app/captures
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.domain.entities.upsert_result import UpsertResult
+from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
+from app.infrastructure.scraping.pdf_extractor import PdfTextExtractor
+from tests.fake_dje import create_fake_dje_app, gerar_publicacoes, publicacoes_de_capturas, servir
+
+class RepositorioEmMemoria:
+    """Só o create_many usado pelo caso de uso, para medir o scraping sem o banco"""
+
+    def __init__(self):
+        self.numeros = set()
+
+    def create_many(self, publicacoes):
+        resultado = UpsertResult()
+        for publicacao in publicacoes:
+            if publicacao.numero_processo in self.numeros:
+                resultado.existentes += 1
+            else:
+                self.numeros.add(publicacao.numero_processo)
+                resultado.novas.append(publicacao)
+        return resultado
+
+def criar_scraper(motor: str, base_url: str, args):
+    if motor == 'selenium':
+        from app.infrastructure.scraping.dje_scraper import DJEScraper
+        return DJEScraper(base_url=f"{base_url}/cdje/index.do")
+    from app.infrastructure.scraping.dje_http_scraper import DJEHttpScraper
+    return DJEHttpScraper(base_url=f"{base_url}/cdje/index.do", max_workers=args.page_workers,
+                          max_per_host=args.max_per_host)
+
+def baixar_pdfs(base_url: str, publicacoes, numeros, workers: int) -> int:
+    """Baixa e extrai o PDF de cada publicação salva, como a etapa de detalhes faz"""
+    por_numero = {p.numero_processo: p for p in publicacoes}
+    extractor = PdfTextExtractor(max_workers=workers, download_workers=workers * 2)
+    try:
+        futures = [
+            extractor.submit(
+                f"{base_url}/cdje/getPaginaDoDiario.do?cdCaderno={por_numero[n].caderno}&nuSeqpagina={por_numero[n].id}",
+                numero_processo=n
+            )
+            for n in numeros if n in por_numero
+        ]
+        return sum(1 for future in futures if future.result())
+    finally:
+        extractor.close()
+
+def rodada(base_url: str, publicacoes, data_inicio, data_fim, args) -> dict:
+    scraper = criar_scraper(args.motor, base_url, args)
+    use_case = ExtractPublicacoesUseCase(RepositorioEmMemoria(), scraper, registrar_processos=args.pdfs)
+    try:
+        inicio = time.perf_counter()
+        use_case.execute(data_inicio, data_fim)
+        scraping = time.perf_counter() - inicio
+        pdfs = baixar_pdfs(base_url, publicacoes, use_case.numeros_processo, args.pdf_workers) if args.pdfs else 0
+        segundos = time.perf_counter() - inicio
+    finally:
+        scraper.close()
+
+    return {
+        'publicacoes': use_case.resumo['novas'],
+        'paginas_com_falha': len(scraper.paginas_com_falha),
+        'pdfs': pdfs,
+        'segundos_scraping': round(scraping, 3),
+        'segundos': round(segundos, 3),
+        'publicacoes_por_segundo': round(use_case.resumo['novas'] / segundos, 2) if segundos else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do scraping contra o DJE falso')
+    parser.add_argument('--motor', choices=['http', 'selenium'], default='http')
+    parser.add_argument('--publicacoes', type=int, default=200)
+    parser.add_argument('--dias', type=int, default=5)
+    parser.add_argument('--por-pagina', type=int, default=10)
+    parser.add_argument('--latencia', type=float, default=0.05, help='Segundos por resposta')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Atraso extra aleatório até N segundos')
+    parser.add_argument('--taxa-erro', type=float, default=0.0, help='Probabilidade de responder 503')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--pdfs', action='store_true', help='Baixa e extrai o PDF de cada publicação')
+    parser.add_argument('--page-workers', type=int, default=4)
+    parser.add_argument('--max-per-host', type=int, default=2)
+    parser.add_argument('--pdf-workers', type=int, default=2)
+    parser.add_argument('--repeticoes', type=int, default=1)
+    parser.add_argument('--capturas', help='Usa as publicações das páginas de um arquivo de capturas')
+    args = parser.parse_args()
+
+    if args.capturas:
+        publicacoes = publicacoes_de_capturas(args.capturas)
+        if not publicacoes:
+            print("⚠️ Nenhuma publicação encontrada nas capturas")
+            return 1
+        data_inicio = min(p.data for p in publicacoes)
+        data_fim = max(p.data for p in publicacoes)
+    else:
+        data_inicio = datetime(2024, 10, 1)
+        data_fim = datetime(2024, 10, args.dias)
+        publicacoes = gerar_publicacoes(args.publicacoes, data_inicio, data_fim)
+
+    rodadas = []
+    for numero in range(1, args.repeticoes + 1):
+        # Um servidor por rodada: a sequência de latências e falhas recomeça da semente
+        app = create_fake_dje_app(publicacoes, por_pagina=args.por_pagina, latencia=args.latencia,
+                                  jitter=args.jitter, taxa_erro=args.taxa_erro, seed=args.seed)
+        with servir(app) as base_url:
+            resultado = rodada(base_url, publicacoes, data_inicio, data_fim, args)
+        resultado['erros_injetados'] = sum(app.extensions['fake_dje']['erros'].values())
+        print(f"📋 Rodada {numero}/{args.repeticoes}: {json.dumps(resultado)}", file=sys.stderr)
+        rodadas.append(resultado)
+
+    taxas = [r['publicacoes_por_segundo'] for r in rodadas if r['publicacoes_por_segundo']]
+    print(json.dumps({
+        'motor': args.motor,
+        'publicacoes_no_servidor': len(publicacoes),
+        'latencia': args.latencia,
+        'taxa_erro': args.taxa_erro,
+        'pdfs': args.pdfs,
+        'rodadas': rodadas,
+        'publicacoes_por_segundo_mediana': round(statistics.median(taxas), 2) if taxas else None,
+    }, indent=2, ensure_ascii=False))
+    return 1 if any(r['paginas_com_falha'] for r in rodadas) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
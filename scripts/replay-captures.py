@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Reprocessa offline as capturas do DJE gravadas em SCRAPER_CAPTURE_DIR,
+sem navegador nem rede, e mede a vazão do pipeline de parsing.
+
+Uso: python scripts/replay-captures.py /app/captures [--tipo resultados|detalhes|todos] [--repeticoes 3]
+"""
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.infrastructure.scraping.capture_archive import CaptureArchive
+from app.infrastructure.scraping.replay_scraper import DJEReplayScraper
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay offline das capturas do DJE')
+    parser.add_argument('diretorio', help='Diretório do arquivo de capturas')
+    parser.add_argument('--tipo', choices=['resultados', 'detalhes', 'todos'], default='todos')
+    parser.add_argument('--repeticoes', type=int, default=1)
+    parser.add_argument('--saida', help='Grava as publicações extraídas (JSON) neste arquivo')
+    args = parser.parse_args()
+
+    archive = CaptureArchive(args.diretorio)
+    scraper = DJEReplayScraper(archive)
+    publicacoes = []
+
+    for rodada in range(1, args.repeticoes + 1):
+        print(f"\n📋 Rodada {rodada}/{args.repeticoes}")
+        if args.tipo in ('resultados', 'todos'):
+            publicacoes, stats = scraper.replay_result_pages()
+            print(f"  📄 Páginas de resultados: {json.dumps(stats)}")
+        if args.tipo in ('detalhes', 'todos'):
+            detalhes, stats = scraper.replay_detail_pages()
+            publicacoes = publicacoes + detalhes if args.tipo == 'todos' else detalhes
+            print(f"  📑 Detalhes e PDFs: {json.dumps(stats)}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(publicacoes, f, ensure_ascii=False, indent=2, default=str)
+        print(f"\n✅ {len(publicacoes)} publicações gravadas em {args.saida}")
+
+if __name__ == '__main__':
+    main()
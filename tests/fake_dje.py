@@ -0,0 +1,299 @@
+"""
+DJE falso para testes e benchmarks: serve o consultaAvancadaForm, as
+páginas de resultados com paginação, os detalhes (consultaSimples.do) e os
+PDFs (getPaginaDoDiario.do) a partir de fixtures gravadas, com latência e
+falhas configuráveis. Nada aqui acessa o site real.
+"""
+import os
+import re
+import json
+import time
+import random
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from html import escape
+from typing import Iterable, List, NamedTuple, Optional
+from flask import Flask, Response, abort, jsonify, request
+from werkzeug.serving import make_server
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'dje_publicacoes.json')
+TODOS_OS_CADERNOS = '-11'
+
+class FakePublicacao(NamedTuple):
+    id: int
+    numero_processo: str
+    data: datetime
+    caderno: str
+    cabecalho: str
+    conteudo: str
+
+def carregar_fixtures(path: str = FIXTURES) -> List[dict]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def gerar_publicacoes(total: int, data_inicio: datetime, data_fim: datetime, caderno: str = '12',
+                      fixtures: List[dict] = None) -> List[FakePublicacao]:
+    """Multiplica as fixtures em `total` publicações distintas, distribuídas entre os dias do período"""
+    fixtures = fixtures or carregar_fixtures()
+    dias = max(1, (data_fim.date() - data_inicio.date()).days + 1)
+    publicacoes = []
+    for i in range(total):
+        modelo = fixtures[i % len(fixtures)]
+        data = datetime.combine(data_inicio.date() + timedelta(days=i % dias), datetime.min.time())
+        numero = f"{i + 1:07d}-{(i * 7) % 100:02d}.{data.year}.8.26.0053"
+        campos = {'numero_processo': numero, 'data': data.strftime('%d/%m/%Y')}
+        publicacoes.append(FakePublicacao(
+            id=i + 1,
+            numero_processo=numero,
+            data=data,
+            caderno=caderno,
+            cabecalho=modelo['cabecalho'].format(**campos),
+            conteudo=modelo['conteudo'].format(**campos),
+        ))
+    return publicacoes
+
+def publicacoes_de_capturas(directory: str, caderno: str = '12') -> List[FakePublicacao]:
+    """Publicações reais a partir das páginas de resultados de um arquivo de capturas (SCRAPER_CAPTURE_DIR)"""
+    from app.infrastructure.scraping.capture_archive import CaptureArchive
+    from app.infrastructure.scraping.result_page_parser import parse_result_page
+
+    publicacoes = []
+    vistos = set()
+    for _, content in CaptureArchive(directory).iter_records('result_page'):
+        for row in parse_result_page(content.decode('utf-8', errors='replace')).rows:
+            numero = re.search(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}', row.conteudo or '')
+            data = re.search(r'(\d{2}/\d{2}/\d{4})', row.cabecalho or '')
+            if not numero or not data or numero.group(0) in vistos:
+                continue
+            vistos.add(numero.group(0))
+            publicacoes.append(FakePublicacao(
+                id=len(publicacoes) + 1,
+                numero_processo=numero.group(0),
+                data=datetime.strptime(data.group(1), '%d/%m/%Y'),
+                caderno=caderno,
+                cabecalho=row.cabecalho,
+                conteudo=row.conteudo,
+            ))
+    return publicacoes
+
+def _quebrar(texto: str, largura: int = 95) -> List[str]:
+    linhas, atual = [], ''
+    for palavra in texto.split():
+        if atual and len(atual) + 1 + len(palavra) > largura:
+            linhas.append(atual)
+            atual = palavra
+        else:
+            atual = f"{atual} {palavra}" if atual else palavra
+    if atual:
+        linhas.append(atual)
+    return linhas
+
+def montar_pdf(textos: Iterable[str], linhas_por_pagina: int = 60) -> bytes:
+    """PDF mínimo (Helvetica, WinAnsi, sem compressão) com o texto das publicações"""
+    linhas = []
+    for texto in textos:
+        linhas.extend(_quebrar(texto))
+        linhas.append('')
+    paginas = [linhas[i:i + linhas_por_pagina] for i in range(0, len(linhas), linhas_por_pagina)] or [[]]
+
+    objetos = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    kids = []
+    for pagina in paginas:
+        comandos = ['BT /F1 9 Tf 11 TL 40 800 Td']
+        for linha in pagina:
+            linha = linha.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            comandos.append(f'({linha}) Tj T*')
+        comandos.append('ET')
+        stream = '\n'.join(comandos).encode('latin-1', errors='replace')
+        objetos.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objetos.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (len(objetos))
+        )
+        kids.append(len(objetos))
+    objetos[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % kid for kid in kids), len(kids)
+    )
+
+    saida = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for numero, corpo in enumerate(objetos, 1):
+        offsets.append(len(saida))
+        saida += b'%d 0 obj\n%s\nendobj\n' % (numero, corpo)
+    xref = len(saida)
+    saida += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objetos) + 1)
+    for offset in offsets:
+        saida += b'%010d 00000 n \n' % offset
+    saida += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objetos) + 1, xref)
+    return bytes(saida)
+
+PAGINA_INICIAL = """<html><head><title>DJE - Consulta Avançada</title>
+<script>function trocaDePg(p) {{ document.getElementsByName('pagina')[0].value = p; document.forms['consultaAvancadaForm'].submit(); }}</script>
+</head><body>
+<form name="consultaAvancadaForm" action="/cdje/consultaAvancada.do" method="post">
+<input type="hidden" name="dadosConsulta.tipoData" value="DISPONIBILIZACAO">
+<input type="hidden" name="pagina" value="{pagina}">
+<input type="text" id="dtInicioString" name="dadosConsulta.dtInicio" value="{dt_inicio}">
+<input type="text" id="dtFimString" name="dadosConsulta.dtFim" value="{dt_fim}">
+<select name="dadosConsulta.cdCaderno">{opcoes}</select>
+<textarea id="procura" name="dadosConsulta.pesquisaLivre">{procura}</textarea>
+<input type="submit" value="Pesquisar">
+</form>
+{resultados}
+</body></html>"""
+
+LINHA = """<tr class="fundocinza1"><td><table>
+<tr class="ementaClass"><td><a href="#" onclick="return popup('/cdje/consultaSimples.do?cdVolume=19&amp;nuDiario=4092&amp;cdCaderno={caderno}&amp;nuSeqpagina={id}');">{cabecalho}</a></td></tr>
+<tr class="ementaClass2"><td>{conteudo}</td></tr>
+</table></td></tr>"""
+
+DETALHE = """<html><head><title>DJE - Publicação</title></head><body>
+<iframe id="pdf" src="/cdje/getPaginaDoDiario.do?cdVolume=19&amp;nuDiario=4092&amp;cdCaderno={caderno}&amp;nuSeqpagina={id}"></iframe>
+<div class="conteudo">{conteudo}</div>
+</body></html>"""
+
+def _data_form(valor: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime((valor or '').strip(), '%d/%m/%Y')
+    except ValueError:
+        return None
+
+def create_fake_dje_app(publicacoes: List[FakePublicacao] = None, por_pagina: int = 10, latencia: float = 0.0,
+                        jitter: float = 0.0, taxa_erro: float = 0.0, seed: int = 0,
+                        publicacoes_por_pdf: int = 2) -> Flask:
+    """
+    App Flask com o mesmo contrato do DJE usado pelos scrapers. latencia e
+    jitter (segundos) atrasam cada resposta; taxa_erro é a probabilidade
+    de responder 503. A semente torna latências e falhas reproduzíveis.
+    """
+    if publicacoes is None:
+        hoje = datetime.now()
+        publicacoes = gerar_publicacoes(40, hoje - timedelta(days=3), hoje)
+    por_id = {p.id: p for p in publicacoes}
+    ordenadas = sorted(publicacoes, key=lambda p: p.id)
+    cadernos = sorted({p.caderno for p in publicacoes})
+
+    app = Flask(__name__)
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    stats = {'requisicoes': Counter(), 'erros': Counter()}
+    pdfs = {}
+
+    def _sortear():
+        with rng_lock:
+            return (latencia + rng.uniform(0, jitter) if latencia or jitter else 0.0), rng.random() < taxa_erro
+
+    @app.before_request
+    def _simular_rede():
+        if request.path == '/_stats':
+            return None
+        atraso, falha = _sortear()
+        stats['requisicoes'][request.path] += 1
+        if atraso:
+            time.sleep(atraso)
+        if falha:
+            stats['erros'][request.path] += 1
+            return Response('Serviço indisponível', status=503)
+        return None
+
+    def _formulario(form, resultados: str = '') -> str:
+        caderno = form.get('dadosConsulta.cdCaderno', TODOS_OS_CADERNOS)
+        opcoes = ''.join(
+            f'<option value="{c}"{" selected" if c == caderno else ""}>Caderno {c}</option>'
+            for c in [TODOS_OS_CADERNOS] + cadernos
+        )
+        return PAGINA_INICIAL.format(
+            pagina=escape(form.get('pagina', '')),
+            dt_inicio=escape(form.get('dadosConsulta.dtInicio', '')),
+            dt_fim=escape(form.get('dadosConsulta.dtFim', '')),
+            opcoes=opcoes,
+            procura=escape(form.get('dadosConsulta.pesquisaLivre', '')),
+            resultados=resultados,
+        )
+
+    @app.route('/cdje/index.do')
+    def index():
+        return _formulario({})
+
+    @app.route('/cdje/consultaAvancada.do', methods=['GET', 'POST'])
+    def consulta_avancada():
+        form = request.form if request.method == 'POST' else request.args
+        inicio = _data_form(form.get('dadosConsulta.dtInicio'))
+        fim = _data_form(form.get('dadosConsulta.dtFim'))
+        caderno = form.get('dadosConsulta.cdCaderno', TODOS_OS_CADERNOS)
+        pagina = max(1, int(form.get('pagina') or 1))
+
+        # A expressão de busca não é interpretada: todas as fixtures atendem à consulta padrão
+        encontradas = [
+            p for p in ordenadas
+            if (inicio is None or p.data >= inicio)
+            and (fim is None or p.data <= fim)
+            and caderno in (TODOS_OS_CADERNOS, p.caderno)
+        ]
+        if not encontradas:
+            return _formulario(form, '<div id="divResultadosInferior"><p>Não foram encontrados resultados.</p></div>')
+
+        total = len(encontradas)
+        primeira = (pagina - 1) * por_pagina
+        trecho = encontradas[primeira:primeira + por_pagina]
+        linhas = ''.join(
+            LINHA.format(caderno=p.caderno, id=p.id, cabecalho=escape(p.cabecalho), conteudo=escape(p.conteudo))
+            for p in trecho
+        )
+        proxima = ''
+        if primeira + por_pagina < total:
+            proxima = f'<a href="#" onclick="trocaDePg({pagina + 1}); return false;">Próximo&gt;</a>'
+        resultados = (
+            f'<div id="divResultadosSuperior">Resultados {primeira + 1} a {primeira + len(trecho)} de {total}</div>'
+            f'<div id="divResultadosInferior"><table>{linhas}</table>{proxima}</div>'
+        )
+        return _formulario(form, resultados)
+
+    def _publicacao():
+        try:
+            publicacao = por_id.get(int(request.args.get('nuSeqpagina', '')))
+        except ValueError:
+            publicacao = None
+        if publicacao is None:
+            abort(404)
+        return publicacao
+
+    @app.route('/cdje/consultaSimples.do')
+    def consulta_simples():
+        publicacao = _publicacao()
+        return DETALHE.format(caderno=publicacao.caderno, id=publicacao.id, conteudo=escape(publicacao.conteudo))
+
+    @app.route('/cdje/getPaginaDoDiario.do')
+    def pagina_do_diario():
+        publicacao = _publicacao()
+        if publicacao.id not in pdfs:
+            # Como no diário real, a página traz a publicação e as seguintes
+            indice = ordenadas.index(publicacao)
+            vizinhas = ordenadas[indice:indice + publicacoes_por_pdf]
+            pdfs[publicacao.id] = montar_pdf(f"{p.cabecalho} {p.conteudo}" for p in vizinhas)
+        return Response(pdfs[publicacao.id], mimetype='application/pdf')
+
+    @app.route('/_stats')
+    def estatisticas():
+        return jsonify({'requisicoes': dict(stats['requisicoes']), 'erros': dict(stats['erros'])})
+
+    app.extensions['fake_dje'] = stats
+    return app
+
+@contextmanager
+def servir(app: Flask, host: str = '127.0.0.1', port: int = 0):
+    """Sobe o app em uma thread e entrega a URL base (porta 0 escolhe uma livre)"""
+    server = make_server(host, port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name='fake-dje', daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_port}"
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
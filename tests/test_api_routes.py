@@ -17,6 +17,21 @@ def test_get_publicacoes_with_data(client, sample_publicacao_model):
     assert len(data) == 1
     assert data[0]['numero_processo'] == "1234567-89.2024.1.01.0001"
 
+def test_get_publicacoes_com_cursor(client, sample_publicacao_model):
+    db.session.add(sample_publicacao_model)
+    db.session.commit()
+    
+    response = client.get('/api/publicacoes/?cursor=&limit=1')
+    assert response.status_code == 200
+    
+    data = json.loads(response.data)
+    assert [p['numero_processo'] for p in data['data']] == ["1234567-89.2024.1.01.0001"]
+    assert data['next_cursor'] is None
+
+def test_get_publicacoes_cursor_invalido(client):
+    response = client.get('/api/publicacoes/?cursor=invalido')
+    assert response.status_code == 400
+
 def test_get_publicacao_by_id(client, sample_publicacao_model):
     db.session.add(sample_publicacao_model)
     db.session.commit()
@@ -74,4 +89,53 @@ def test_extract_publicacoes_without_dates(client):
         content_type='application/json'
     )
     
-    assert response.status_code == 400 
\ No newline at end of file
+    assert response.status_code == 400
+
+
+def test_get_publicacoes_sem_conteudo_por_padrao(client, sample_publicacao_model):
+    db.session.add(sample_publicacao_model)
+    db.session.commit()
+    
+    data = json.loads(client.get('/api/publicacoes/').data)
+    assert 'conteudo_completo' not in data[0]
+    assert data[0]['valor_principal_bruto'] == 10000.00
+
+def test_get_publicacoes_com_fields(client, sample_publicacao_model):
+    db.session.add(sample_publicacao_model)
+    db.session.commit()
+    
+    response = client.get('/api/publicacoes/?fields=numero_processo,conteudo_completo')
+    assert response.status_code == 200
+    assert json.loads(response.data) == [{
+        'numero_processo': "1234567-89.2024.1.01.0001",
+        'conteudo_completo': "Conteúdo da publicação teste"
+    }]
+
+def test_get_publicacoes_fields_invalido(client):
+    response = client.get('/api/publicacoes/?fields=numero_processo,senha')
+    assert response.status_code == 400
+
+def test_get_publicacao_if_none_match_retorna_304(client, sample_publicacao_model):
+    db.session.add(sample_publicacao_model)
+    db.session.commit()
+    
+    response = client.get(f'/api/publicacoes/{sample_publicacao_model.id}')
+    assert response.status_code == 200
+    assert response.headers['Last-Modified']
+    
+    etag = response.headers['ETag']
+    response = client.get(f'/api/publicacoes/{sample_publicacao_model.id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+def test_get_publicacoes_etag_muda_com_escrita(client, sample_publicacao_model):
+    db.session.add(sample_publicacao_model)
+    db.session.commit()
+    
+    etag = client.get('/api/publicacoes/?status=nova').headers['ETag']
+    assert client.get('/api/publicacoes/?status=nova', headers={'If-None-Match': etag}).status_code == 304
+    # Outro formato de consulta tem outro ETag
+    assert client.get('/api/publicacoes/?status=nova&limit=1', headers={'If-None-Match': etag}).status_code == 200
+    
+    client.put(f'/api/publicacoes/{sample_publicacao_model.id}/status', json={'status': 'lida'})
+    assert client.get('/api/publicacoes/?status=nova', headers={'If-None-Match': etag}).status_code == 200
@@ -0,0 +1,58 @@
+from datetime import datetime
+from unittest.mock import Mock
+from app.infrastructure.scraping.capture_archive import CaptureArchive
+from app.infrastructure.scraping.dje_http_scraper import DJEHttpScraper
+from app.infrastructure.scraping.replay_scraper import DJEReplayScraper
+from tests.test_dje_http_scraper import INDEX_HTML, _result_page, _response
+
+def test_write_e_read_preservam_o_conteudo(tmp_path):
+    archive = CaptureArchive(str(tmp_path))
+    
+    archive.write('result_page', 'https://dje/consulta', '<html>página 1</html>', meta={'pagina': 1})
+    archive.write('pdf', 'https://dje/doc.pdf', b'%PDF-1.4 bytes', 'application/pdf')
+    
+    entries = archive.entries()
+    assert [e['kind'] for e in entries] == ['result_page', 'pdf']
+    assert archive.read(entries[0]).decode('utf-8') == '<html>página 1</html>'
+    assert archive.read(entries[1]) == b'%PDF-1.4 bytes'
+    assert archive.entries('pdf')[0]['meta'] == {}
+
+def test_segmentos_sao_rotacionados_pelo_tamanho(tmp_path):
+    archive = CaptureArchive(str(tmp_path), max_segment_bytes=1)
+    
+    archive.write('result_page', 'u1', 'a')
+    archive.write('result_page', 'u2', 'b')
+    
+    assert len({e['segment'] for e in archive.entries()}) == 2
+
+def test_replay_reproduz_extracao_capturada(tmp_path):
+    archive = CaptureArchive(str(tmp_path))
+    scraper = DJEHttpScraper(capture_archive=archive)
+    scraper.session = Mock()
+    scraper.session.request.side_effect = [
+        _response(INDEX_HTML),
+        _response(_result_page('1234567-89.2024.8.26.0001', next_page=2)),
+        _response(_result_page('7654321-89.2024.8.26.0001')),
+    ]
+    data_inicio, data_fim = datetime(2024, 10, 1), datetime(2024, 10, 2)
+    capturadas = list(scraper.extrair_publicacoes(data_inicio, data_fim))
+    
+    replay = DJEReplayScraper(archive)
+    reproduzidas = list(replay.extrair_publicacoes(data_inicio, data_fim))
+    
+    assert reproduzidas == capturadas
+    assert list(replay.extrair_publicacoes(data_inicio, data_fim, pagina_inicial=2))[0]['numero_processo'] == '7654321-89.2024.8.26.0001'
+    assert list(replay.extrair_publicacoes(datetime(2024, 11, 1), datetime(2024, 11, 2))) == []
+
+def test_replay_separa_capturas_do_mesmo_dia_por_caderno(tmp_path):
+    archive = CaptureArchive(str(tmp_path))
+    data_inicio, data_fim = datetime(2024, 10, 1), datetime(2024, 10, 1)
+    for caderno, numero_processo in (('12', '1234567-89.2024.8.26.0001'), ('13', '7654321-89.2024.8.26.0001')):
+        scraper = DJEHttpScraper(capture_archive=archive, caderno=caderno)
+        scraper.session = Mock()
+        scraper.session.request.side_effect = [_response(INDEX_HTML), _response(_result_page(numero_processo))]
+        list(scraper.extrair_publicacoes(data_inicio, data_fim))
+    
+    reproduzidas = list(DJEReplayScraper(archive, caderno='12').extrair_publicacoes(data_inicio, data_fim))
+    
+    assert [p['numero_processo'] for p in reproduzidas] == ['1234567-89.2024.8.26.0001']
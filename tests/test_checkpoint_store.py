@@ -0,0 +1,39 @@
+from datetime import datetime
+from unittest.mock import Mock
+import redis
+from app.infrastructure.scraping.checkpoint_store import CheckpointStore
+
+def test_make_key_depende_do_periodo_e_da_consulta():
+    key = CheckpointStore.make_key(datetime(2024, 10, 1), datetime(2024, 10, 2), '-11', 'inss')
+    
+    assert key.startswith(CheckpointStore.KEY_PREFIX)
+    assert key == CheckpointStore.make_key(datetime(2024, 10, 1), datetime(2024, 10, 2), '-11', 'inss')
+    assert key != CheckpointStore.make_key(datetime(2024, 10, 1), datetime(2024, 10, 3), '-11', 'inss')
+
+def test_last_page_sem_checkpoint_retorna_zero():
+    client = Mock()
+    client.hget.return_value = None
+    
+    assert CheckpointStore(client).last_page('k') == 0
+
+def test_last_page_com_redis_indisponivel_retorna_zero():
+    client = Mock()
+    client.hget.side_effect = redis.ConnectionError('down')
+    
+    assert CheckpointStore(client).last_page('k') == 0
+
+def test_completed_shards_le_apenas_campos_de_fatia():
+    client = Mock()
+    client.hkeys.return_value = [b'last_page', b'updated_at', b'shard:2024-10-01T00:00:00']
+    
+    assert CheckpointStore(client).completed_shards('k') == {'2024-10-01T00:00:00'}
+
+def test_save_page_grava_com_ttl():
+    client = Mock()
+    pipe = client.pipeline.return_value
+    
+    CheckpointStore(client, ttl_seconds=60).save_page('k', 4)
+    
+    assert pipe.hset.call_args.kwargs['mapping']['last_page'] == 4
+    pipe.expire.assert_called_once_with('k', 60)
+    pipe.execute.assert_called_once()
@@ -0,0 +1,177 @@
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from flask import Flask, current_app
+from app.infrastructure.scraping.dje_http_scraper import DJEHttpScraper
+from app.infrastructure.scraping.seen_set import ProcessoSeenSet
+
+INDEX_HTML = """
+<html><body>
+<form name="consultaAvancadaForm" action="/cdje/consultaAvancada.do" method="post">
+  <input type="hidden" name="dadosConsulta.tipoPesquisa" value="avancada"/>
+  <input type="text" id="dtInicioString" name="dadosConsulta.dtInicio"/>
+  <input type="text" id="dtFimString" name="dadosConsulta.dtFim"/>
+  <select name="dadosConsulta.cdCaderno"><option value="-11">Judicial</option></select>
+  <input type="text" id="procura" name="dadosConsulta.pesquisaLivre"/>
+</form>
+</body></html>
+"""
+
+def _result_page(numero_processo, next_page=None):
+    proximo = f'<a href="#" onclick="trocaDePg({next_page});">Próximo&gt;</a>' if next_page else ''
+    return f"""
+<html><body><div id="divResultadosInferior"><table>
+  <tr class="fundocinza1"><td><table>
+    <tr class="ementaClass"><td><a>Publicação 01/10/2024</a></td></tr>
+    <tr class="ementaClass2"><td>Processo {numero_processo} - Requerente: Maria Souza, Advogado: Joao Lima (OAB: 12345/SP)
+    valor principal bruto: R$ 1.234,56</td></tr>
+  </table></td></tr>
+</table>{proximo}</div></body></html>
+"""
+
+def _response(text):
+    response = Mock()
+    response.text = text
+    response.raise_for_status.return_value = None
+    return response
+
+@pytest.fixture
+def scraper():
+    scraper = DJEHttpScraper()
+    scraper.session = Mock()
+    return scraper
+
+def test_extrair_publicacoes_percorre_paginacao(scraper):
+    scraper.session.request.side_effect = [
+        _response(INDEX_HTML),
+        _response(_result_page('1234567-89.2024.8.26.0001', next_page=2)),
+        _response(_result_page('7654321-89.2024.8.26.0001')),
+    ]
+
+    result = list(scraper.extrair_publicacoes(datetime(2024, 10, 1), datetime(2024, 10, 2)))
+
+    assert [p['numero_processo'] for p in result] == ['1234567-89.2024.8.26.0001', '7654321-89.2024.8.26.0001']
+    assert result[0]['valor_principal_bruto'] == 1234.56
+
+    post_call = scraper.session.request.call_args_list[1]
+    assert post_call.args == ('POST', 'https://dje.tjsp.jus.br/cdje/consultaAvancada.do')
+    payload = post_call.kwargs['data']
+    assert payload['dadosConsulta.dtInicio'] == '01/10/2024'
+    assert payload['dadosConsulta.cdCaderno'] == '-11'
+    assert payload['dadosConsulta.tipoPesquisa'] == 'avancada'
+    assert scraper.session.request.call_args_list[2].kwargs['data']['pagina'] == '2'
+
+def test_extrair_publicacoes_sem_resultados(scraper):
+    scraper.session.request.side_effect = [
+        _response(INDEX_HTML),
+        _response('<html><body><div id="divResultadosInferior">Nenhum resultado</div></body></html>'),
+    ]
+
+    assert list(scraper.extrair_publicacoes(datetime(2024, 10, 1), datetime(2024, 10, 2))) == []
+
+def test_erro_fatal_registra_pagina_com_falha(scraper):
+    scraper.session.request.side_effect = [
+        _response(INDEX_HTML),
+        _response(_result_page('1234567-89.2024.8.26.0001', next_page=2)),
+        _response('<html><body>'),
+    ]
+    scraper._extrair_pagina = Mock(side_effect=[
+        ([{'numero_processo': '1234567-89.2024.8.26.0001'}], Mock(rows=[1], proxima_pagina=2)),
+        RuntimeError('layout inesperado'),
+    ])
+
+    result = list(scraper.iterar_paginas(datetime(2024, 10, 1), datetime(2024, 10, 2)))
+
+    assert [page_num for page_num, _ in result] == [1]
+    assert scraper.paginas_com_falha == [{'pagina': 2, 'erro': 'layout inesperado'}]
+
+def test_extrair_publicacoes_busca_paginas_em_paralelo_na_ordem(scraper):
+    processos = {
+        '1': '1000000-89.2024.8.26.0001',
+        '2': '2000000-89.2024.8.26.0001',
+        '3': '3000000-89.2024.8.26.0001',
+        '4': '4000000-89.2024.8.26.0001',
+    }
+
+    def _request(method, url, **kwargs):
+        if method == 'GET':
+            return _response(INDEX_HTML)
+        pagina = kwargs['data'].get('pagina', '1')
+        if pagina == '3':
+            raise RuntimeError('timeout')
+        html = _result_page(processos[pagina]).replace('<table>', 'Resultados 1 a 1 de 4<table>', 1)
+        return _response(html)
+
+    scraper.max_retries = 1
+    scraper.session.request.side_effect = _request
+
+    result = list(scraper.extrair_publicacoes(datetime(2024, 10, 1), datetime(2024, 10, 2)))
+
+    assert [p['numero_processo'] for p in result] == [processos['1'], processos['2'], processos['4']]
+    assert scraper.paginas_com_falha == [{'pagina': 3, 'erro': 'timeout'}]
+
+def test_iterar_paginas_entrega_cada_pagina_antes_de_buscar_a_proxima(scraper):
+    scraper.session.request.side_effect = [
+        _response(INDEX_HTML),
+        _response(_result_page('1234567-89.2024.8.26.0001', next_page=2)),
+        _response(_result_page('7654321-89.2024.8.26.0001')),
+    ]
+
+    paginas = scraper.iterar_paginas(datetime(2024, 10, 1), datetime(2024, 10, 2))
+    page_num, publicacoes = next(paginas)
+
+    assert page_num == 1
+    assert publicacoes[0]['numero_processo'] == '1234567-89.2024.8.26.0001'
+    assert scraper.session.request.call_count == 2
+    assert [num for num, _ in paginas] == [2]
+
+def test_processos_ja_armazenados_sao_ignorados_sem_encerrar_a_paginacao(scraper):
+    scraper.seen_set = Mock()
+    scraper.seen_set.known.side_effect = lambda numeros: {n for n in numeros if n.startswith('1234567')}
+    scraper.session.request.side_effect = [
+        _response(INDEX_HTML),
+        _response(_result_page('1234567-89.2024.8.26.0001', next_page=2)),
+        _response(_result_page('7654321-89.2024.8.26.0001')),
+    ]
+
+    result = list(scraper.extrair_publicacoes(datetime(2024, 10, 1), datetime(2024, 10, 2)))
+
+    assert [p['numero_processo'] for p in result] == ['7654321-89.2024.8.26.0001']
+    assert scraper.processos_conhecidos == ['1234567-89.2024.8.26.0001']
+
+def test_paginas_em_paralelo_consultam_seen_set_com_contexto_da_aplicacao(scraper):
+    armazenados = {'2000000-89.2024.8.26.0001', '3000000-89.2024.8.26.0001'}
+
+    def exact_check(numeros):
+        # Como a consulta ao banco: fora do contexto da aplicação levanta RuntimeError
+        assert current_app.name
+        return {n for n in numeros if n in armazenados}
+
+    redis_client = Mock()
+    redis_client.hexists.return_value = False
+    scraper.seen_set = ProcessoSeenSet(redis_client, exact_check)
+
+    def _request(method, url, **kwargs):
+        if method == 'GET':
+            return _response(INDEX_HTML)
+        pagina = kwargs['data'].get('pagina', '1')
+        html = _result_page(f'{pagina}000000-89.2024.8.26.0001').replace('<table>', 'Resultados 1 a 1 de 4<table>', 1)
+        return _response(html)
+
+    scraper.session.request.side_effect = _request
+
+    with Flask(__name__).app_context():
+        result = list(scraper.extrair_publicacoes(datetime(2024, 10, 1), datetime(2024, 10, 2)))
+
+    assert [p['numero_processo'] for p in result] == ['1000000-89.2024.8.26.0001', '4000000-89.2024.8.26.0001']
+    assert sorted(scraper.processos_conhecidos) == sorted(armazenados)
+
+def test_formulario_usa_caderno_e_consulta_do_scraper():
+    scraper = DJEHttpScraper(caderno='12', query='fazenda E rpv')
+    scraper.session = Mock()
+    scraper.session.request.return_value = _response(INDEX_HTML)
+
+    _, payload = scraper._montar_formulario(datetime(2024, 10, 1), datetime(2024, 10, 2))
+
+    assert payload['dadosConsulta.cdCaderno'] == '12'
+    assert payload['dadosConsulta.pesquisaLivre'] == 'fazenda E rpv'
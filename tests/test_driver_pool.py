@@ -0,0 +1,58 @@
+from unittest.mock import Mock
+from app.infrastructure.scraping.driver_pool import WebDriverPool
+
+def _driver():
+    driver = Mock()
+    driver.execute_script.return_value = 1
+    driver.window_handles = ['main']
+    driver.service.process.pid = None
+    return driver
+
+def test_reutiliza_driver_devolvido():
+    pool = WebDriverPool(_driver, max_idle=1, max_uses=10)
+
+    primeiro = pool.acquire()
+    pool.release(primeiro)
+    segundo = pool.acquire()
+
+    assert segundo is primeiro
+    primeiro.delete_all_cookies.assert_called_once()
+    primeiro.get.assert_called_with("about:blank")
+    stats = pool.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['created'] == 1
+
+def test_recicla_driver_apos_max_usos():
+    pool = WebDriverPool(_driver, max_idle=1, max_uses=2)
+
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    pool.release(driver)
+
+    driver.quit.assert_called_once()
+    assert pool.acquire() is not driver
+    assert pool.stats()['recycled'] == 1
+
+def test_descarta_driver_que_falha_no_health_check():
+    pool = WebDriverPool(_driver, max_idle=1)
+
+    driver = pool.acquire()
+    pool.release(driver)
+    driver.execute_script.side_effect = Exception('chrome not reachable')
+
+    novo = pool.acquire()
+
+    assert novo is not driver
+    driver.quit.assert_called_once()
+    assert pool.stats()['discarded'] == 1
+
+def test_warm_preenche_pool():
+    pool = WebDriverPool(_driver, max_idle=2)
+
+    pool.warm()
+
+    assert pool.stats()['idle'] == 2
+    pool.acquire()
+    assert pool.stats()['hits'] == 1
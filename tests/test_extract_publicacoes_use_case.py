@@ -2,6 +2,7 @@ import pytest
 from datetime import datetime
 from unittest.mock import Mock, MagicMock
 from app.domain.entities.publicacao import Publicacao
+from app.domain.entities.upsert_result import UpsertResult
 from app.domain.use_cases.extract_publicacoes_use_case import ExtractPublicacoesUseCase
 
 @pytest.fixture
@@ -34,43 +35,149 @@ def test_execute_with_new_publicacao(use_case, mock_repository, mock_scraper, sa
     data_inicio = datetime(2024, 10, 1)
     data_fim = datetime(2024, 10, 31)
     
-    mock_scraper.extrair_publicacoes.return_value = [sample_publicacao_data]
-    mock_repository.find_by_numero_processo.return_value = None
+    mock_scraper.iterar_paginas.return_value = iter([(1, [sample_publicacao_data])])
     
     created_publicacao = Publicacao(**sample_publicacao_data)
     created_publicacao.id = 1
-    mock_repository.create.return_value = created_publicacao
+    mock_repository.create_many.return_value = UpsertResult(novas=[created_publicacao])
     
     result = use_case.execute(data_inicio, data_fim)
     
-    assert len(result) == 1
-    mock_scraper.extrair_publicacoes.assert_called_once_with(data_inicio, data_fim)
-    mock_repository.find_by_numero_processo.assert_called_once_with('1234567-89.2024.1.01.0001')
-    mock_repository.create.assert_called_once()
+    assert result['novas'] == 1
+    mock_scraper.iterar_paginas.assert_called_once_with(data_inicio, data_fim)
+    mock_repository.find_by_numero_processo.assert_not_called()
+    lote = mock_repository.create_many.call_args.args[0]
+    assert [p.numero_processo for p in lote] == ['1234567-89.2024.1.01.0001']
 
 def test_execute_with_existing_publicacao(use_case, mock_repository, mock_scraper, sample_publicacao_data):
     data_inicio = datetime(2024, 10, 1)
     data_fim = datetime(2024, 10, 31)
     
-    mock_scraper.extrair_publicacoes.return_value = [sample_publicacao_data]
+    mock_scraper.iterar_paginas.return_value = iter([(1, [sample_publicacao_data])])
     
-    existing_publicacao = Publicacao(**sample_publicacao_data)
-    existing_publicacao.id = 1
-    mock_repository.find_by_numero_processo.return_value = existing_publicacao
+    mock_repository.create_many.return_value = UpsertResult(existentes=1)
     
     result = use_case.execute(data_inicio, data_fim)
     
-    assert len(result) == 0
-    mock_repository.create.assert_not_called()
+    assert result['novas'] == 0
+    assert use_case.resumo['existentes'] == 1
 
 def test_execute_with_empty_results(use_case, mock_repository, mock_scraper):
     data_inicio = datetime(2024, 10, 1)
     data_fim = datetime(2024, 10, 31)
     
-    mock_scraper.extrair_publicacoes.return_value = []
+    mock_scraper.iterar_paginas.return_value = iter([])
     
     result = use_case.execute(data_inicio, data_fim)
     
-    assert len(result) == 0
-    mock_repository.find_by_numero_processo.assert_not_called()
-    mock_repository.create.assert_not_called() 
\ No newline at end of file
+    assert result['novas'] == 0
+    mock_repository.create_many.assert_not_called()
+
+def test_execute_persiste_cada_pagina_assim_que_chega(use_case, mock_repository, mock_scraper, sample_publicacao_data):
+    segunda = dict(sample_publicacao_data, numero_processo='7654321-89.2024.1.01.0001')
+    mock_repository.create_many.side_effect = lambda publicacoes: UpsertResult(novas=publicacoes)
+    
+    def iterar(inicio, fim):
+        yield 1, [sample_publicacao_data]
+        # A primeira página já foi salva antes da segunda ser raspada
+        assert mock_repository.create_many.call_count == 1
+        yield 2, [segunda]
+    
+    mock_scraper.iterar_paginas.side_effect = iterar
+    
+    result = use_case.execute(datetime(2024, 10, 1), datetime(2024, 10, 31))
+    
+    assert result['novas'] == 2
+    assert [c.args[0][0].numero_processo for c in mock_repository.create_many.call_args_list] == [
+        '1234567-89.2024.1.01.0001', '7654321-89.2024.1.01.0001'
+    ]
+    assert use_case.resumo['total_extraido'] == 2
+
+def test_execute_contabiliza_erros_do_lote(use_case, mock_repository, mock_scraper, sample_publicacao_data):
+    sem_autores = {k: v for k, v in sample_publicacao_data.items() if k != 'autores'}
+    sem_numero = dict(sample_publicacao_data, numero_processo=None)
+    mock_scraper.iterar_paginas.return_value = iter([(1, [sample_publicacao_data, sem_autores, sem_numero])])
+    mock_repository.create_many.return_value = UpsertResult(erros=1)
+    
+    use_case.execute(datetime(2024, 10, 1), datetime(2024, 10, 31))
+    
+    assert len(mock_repository.create_many.call_args.args[0]) == 1
+    assert use_case.resumo == {'total_extraido': 3, 'novas': 0, 'existentes': 0, 'erros': 2}
+
+def test_execute_com_checkpoint_retoma_da_ultima_pagina(mock_repository, mock_scraper, sample_publicacao_data):
+    data_inicio = datetime(2024, 10, 1)
+    data_fim = datetime(2024, 10, 31)
+    
+    checkpoint_store = Mock()
+    checkpoint_store.last_page.return_value = 2
+    mock_scraper.paginas_com_falha = []
+    
+    def iterar(inicio, fim, pagina_inicial=1):
+        yield pagina_inicial, [sample_publicacao_data]
+    
+    mock_scraper.iterar_paginas.side_effect = iterar
+    mock_repository.create_many.return_value = UpsertResult(novas=[Publicacao(**sample_publicacao_data)])
+    
+    use_case = ExtractPublicacoesUseCase(mock_repository, mock_scraper, checkpoint_store=checkpoint_store)
+    result = use_case.execute(data_inicio, data_fim)
+    
+    assert result['novas'] == 1
+    assert mock_scraper.iterar_paginas.call_args.kwargs['pagina_inicial'] == 3
+    checkpoint_store.save_page.assert_called_once()
+    assert checkpoint_store.save_page.call_args.args[1] == 3
+    checkpoint_store.clear.assert_called_once()
+
+def test_execute_com_checkpoint_mantem_checkpoint_com_paginas_com_falha(mock_repository, mock_scraper):
+    checkpoint_store = Mock()
+    checkpoint_store.last_page.return_value = 0
+    mock_scraper.paginas_com_falha = [{'pagina': 2, 'erro': 'timeout'}]
+    mock_scraper.iterar_paginas.return_value = iter([])
+    
+    use_case = ExtractPublicacoesUseCase(mock_repository, mock_scraper, checkpoint_store=checkpoint_store)
+    use_case.execute(datetime(2024, 10, 1), datetime(2024, 10, 31))
+    
+    checkpoint_store.clear.assert_not_called()
+
+def test_execute_registra_execucao_completa_no_ledger(mock_repository, mock_scraper):
+    scrape_run_repository = Mock()
+    scrape_run_repository.start.return_value = Mock(id=7)
+    mock_scraper.paginas_com_falha = []
+    mock_scraper.iterar_paginas.return_value = iter([])
+    
+    use_case = ExtractPublicacoesUseCase(mock_repository, mock_scraper, scrape_run_repository=scrape_run_repository)
+    use_case.execute(datetime(2024, 10, 1), datetime(2024, 10, 1, 23, 59, 59))
+    
+    scrape_run_repository.finish.assert_called_once_with(7, 'completo', use_case.resumo, 0)
+
+def test_execute_registra_falha_no_ledger(mock_repository, mock_scraper):
+    scrape_run_repository = Mock()
+    scrape_run_repository.start.return_value = Mock(id=7)
+    mock_scraper.paginas_com_falha = []
+    mock_scraper.iterar_paginas.side_effect = RuntimeError('DJE indisponível')
+    
+    use_case = ExtractPublicacoesUseCase(mock_repository, mock_scraper, scrape_run_repository=scrape_run_repository)
+    with pytest.raises(RuntimeError):
+        use_case.execute(datetime(2024, 10, 1), datetime(2024, 10, 1, 23, 59, 59))
+    
+    assert scrape_run_repository.finish.call_args.args[1] == 'falha'
+
+def test_execute_invalida_cache_de_leitura_so_com_novas(mock_repository, mock_scraper, sample_publicacao_data):
+    read_cache = Mock()
+    use_case = ExtractPublicacoesUseCase(mock_repository, mock_scraper, read_cache=read_cache)
+    
+    mock_scraper.iterar_paginas.return_value = iter([(1, [sample_publicacao_data]), (2, [sample_publicacao_data])])
+    nova = Publicacao(**sample_publicacao_data)
+    mock_repository.create_many.side_effect = [UpsertResult(novas=[nova]), UpsertResult(existentes=1)]
+    
+    use_case.execute(datetime(2024, 10, 1), datetime(2024, 10, 1))
+    
+    read_cache.invalidate.assert_called_once_with({'nova'})
+
+def test_execute_so_registra_processos_quando_pedido(mock_repository, mock_scraper, sample_publicacao_data):
+    mock_repository.create_many.return_value = UpsertResult(existentes=1)
+    
+    for registrar, esperado in ((False, set()), (True, {'1234567-89.2024.1.01.0001'})):
+        mock_scraper.iterar_paginas.return_value = iter([(1, [sample_publicacao_data])])
+        use_case = ExtractPublicacoesUseCase(mock_repository, mock_scraper, registrar_processos=registrar)
+        use_case.execute(datetime(2024, 10, 1), datetime(2024, 10, 1))
+        assert use_case.numeros_processo == esperado
@@ -0,0 +1,58 @@
+import pytest
+import requests
+from datetime import datetime
+from app.infrastructure.scraping.dje_http_scraper import DJEHttpScraper
+from app.infrastructure.scraping.pdf_extractor import extract_pdf_text
+from tests.fake_dje import create_fake_dje_app, gerar_publicacoes, montar_pdf, servir
+
+INICIO = datetime(2024, 10, 1)
+FIM = datetime(2024, 10, 3)
+
+@pytest.fixture
+def publicacoes():
+    return gerar_publicacoes(25, INICIO, FIM)
+
+def test_scraper_http_percorre_todas_as_paginas_do_dje_falso(publicacoes):
+    app = create_fake_dje_app(publicacoes, por_pagina=10)
+
+    with servir(app) as base_url:
+        scraper = DJEHttpScraper(base_url=f"{base_url}/cdje/index.do", max_workers=2)
+        extraidas = list(scraper.extrair_publicacoes(INICIO, FIM))
+
+    assert sorted(p['numero_processo'] for p in extraidas) == sorted(p.numero_processo for p in publicacoes)
+    assert scraper.paginas_com_falha == []
+    assert app.extensions['fake_dje']['requisicoes']['/cdje/consultaAvancada.do'] == 3
+
+def test_filtra_pelo_periodo_do_formulario(publicacoes):
+    client = create_fake_dje_app(publicacoes).test_client()
+
+    html = client.post('/cdje/consultaAvancada.do', data={
+        'dadosConsulta.dtInicio': '02/10/2024',
+        'dadosConsulta.dtFim': '02/10/2024',
+        'dadosConsulta.cdCaderno': '-11',
+    }).get_data(as_text=True)
+
+    assert 'Resultados 1 a 8 de 8' in html
+    assert 'Próximo&gt;' not in html
+
+def test_injecao_de_falhas():
+    client = create_fake_dje_app(taxa_erro=1.0).test_client()
+
+    assert client.get('/cdje/index.do').status_code == 503
+
+def test_detalhe_aponta_para_pdf_com_o_texto_da_publicacao(publicacoes):
+    client = create_fake_dje_app(publicacoes).test_client()
+    alvo = publicacoes[3]
+
+    detalhe = client.get(f'/cdje/consultaSimples.do?nuSeqpagina={alvo.id}').get_data(as_text=True)
+    assert 'getPaginaDoDiario.do' in detalhe
+
+    pdf = client.get(f'/cdje/getPaginaDoDiario.do?nuSeqpagina={alvo.id}')
+    assert pdf.mimetype == 'application/pdf'
+    texto = extract_pdf_text(pdf.data, alvo.numero_processo)
+    assert alvo.numero_processo in texto
+
+def test_montar_pdf_preserva_acentos():
+    texto = extract_pdf_text(montar_pdf(['Honorários advocatícios (RPV) - INSS']))
+
+    assert 'Honorários advocatícios (RPV)' in texto
@@ -0,0 +1,18 @@
+import pytest
+from datetime import datetime, timezone
+from app.infrastructure.repositories.keyset_cursor import InvalidCursorError, decode_cursor, encode_cursor
+
+def test_cursor_preserva_microssegundos_e_fuso():
+    created_at = datetime(2024, 10, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+def test_cursor_e_seguro_para_url():
+    cursor = encode_cursor(datetime(2024, 10, 1), 7)
+
+    assert '=' not in cursor and '+' not in cursor and '/' not in cursor
+
+@pytest.mark.parametrize('cursor', ['invalido', 'bm8', encode_cursor(datetime(2024, 10, 1), 1)[:-4]])
+def test_cursor_malformado(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime
+from app.infrastructure import metrics
+
+pytestmark = pytest.mark.skipif(not metrics.PROMETHEUS_AVAILABLE, reason="prometheus_client não instalado")
+
+def _amostra(nome, **labels):
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(nome, labels) or 0
+
+def test_stage_observa_duracao_com_rotulos_da_task():
+    labels = dict(stage='teste_ok', task='extract_shard_task', shard='2024-10-01')
+    antes = _amostra('juscash_scraping_stage_seconds_count', **labels)
+
+    with metrics.task_labels('extract_shard_task', metrics.shard_label(datetime(2024, 10, 1), datetime(2024, 10, 1, 23, 59))):
+        with metrics.stage('teste_ok'):
+            pass
+
+    assert _amostra('juscash_scraping_stage_seconds_count', **labels) == antes + 1
+    assert _amostra('juscash_scraping_stage_errors_total', **labels) == 0
+    assert metrics.current_labels() == {'task': '', 'shard': ''}
+
+def test_stage_conta_erro_e_propaga_excecao():
+    labels = dict(stage='teste_erro', task='', shard='')
+    antes = _amostra('juscash_scraping_stage_errors_total', **labels)
+
+    with pytest.raises(RuntimeError):
+        with metrics.stage('teste_erro'):
+            raise RuntimeError('timeout')
+
+    assert _amostra('juscash_scraping_stage_errors_total', **labels) == antes + 1
+
+def test_shard_label_de_intervalo():
+    assert metrics.shard_label(datetime(2024, 10, 1), datetime(2024, 10, 7)) == '2024-10-01_2024-10-07'
+
+def test_render_latest_expoe_formato_prometheus():
+    metrics.count_publicacoes('nova', 2)
+    body, content_type = metrics.render_latest()
+
+    assert content_type.startswith('text/plain')
+    assert b'juscash_scraping_publicacoes_total' in body
+
+def test_pool_de_drivers_exporta_emprestimos_e_inicializacao():
+    from unittest.mock import Mock
+    from app.infrastructure.scraping.driver_pool import WebDriverPool
+    driver = Mock()
+    driver.execute_script.return_value = 1
+    driver.window_handles = ['main']
+    driver.service.process.pid = None
+    antes = {
+        'miss': _amostra('juscash_driver_pool_leases_total', resultado='miss'),
+        'hit': _amostra('juscash_driver_pool_leases_total', resultado='hit'),
+        'startup': _amostra('juscash_driver_pool_startup_seconds_count'),
+    }
+
+    pool = WebDriverPool(lambda: driver, max_idle=1)
+    pool.release(pool.acquire())
+    pool.acquire()
+
+    assert _amostra('juscash_driver_pool_leases_total', resultado='miss') == antes['miss'] + 1
+    assert _amostra('juscash_driver_pool_leases_total', resultado='hit') == antes['hit'] + 1
+    assert _amostra('juscash_driver_pool_startup_seconds_count') == antes['startup'] + 1
+
+def test_rotulos_de_extracoes_concorrentes_nao_se_misturam():
+    import threading
+    entrou = threading.Barrier(2)
+    vistos = {}
+
+    def extracao(task):
+        with metrics.task_labels(task, '2024-10-01'):
+            entrou.wait()
+            vistos[task] = metrics.current_labels()['task']
+            entrou.wait()
+        vistos[task + ':depois'] = metrics.current_labels()['task']
+
+    threads = [threading.Thread(target=extracao, args=(task,)) for task in ('visual', 'celery')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert vistos == {'visual': 'visual', 'celery': 'celery', 'visual:depois': '', 'celery:depois': ''}
+
+def test_rotulos_chegam_as_threads_do_fanout():
+    from app.infrastructure.scraping.page_fanout import PageFanout
+
+    fanout = PageFanout('https://metricas-test.local/cdje', max_workers=2, max_per_host=2)
+    with metrics.task_labels('extract_shard_task', '2024-10-01'):
+        rotulos = [resultado for _, resultado, _ in fanout.iter_fetch([1, 2], lambda page_num: metrics.current_labels())]
+
+    assert rotulos == [{'task': 'extract_shard_task', 'shard': '2024-10-01'}] * 2
@@ -0,0 +1,43 @@
+import threading
+import time
+from app.infrastructure.scraping.page_fanout import PageFanout, parse_total_resultados, calcular_paginas, calcular_ultima_pagina
+
+def test_parse_total_resultados():
+    assert parse_total_resultados('<td>Resultados 1 a 10 de 95</td>') == (10, 95)
+    assert parse_total_resultados('<td>Nenhum resultado</td>') is None
+
+def test_calcular_paginas():
+    assert calcular_paginas(95, 10) == 10
+    assert calcular_paginas(10, 10) == 1
+    assert calcular_paginas(0, 10) == 0
+
+def test_calcular_ultima_pagina_retomando_da_pagina_curta():
+    assert calcular_ultima_pagina('<td>Resultados 1 a 10 de 95</td>', 1) == 10
+    assert calcular_ultima_pagina('<td>Resultados 31 a 40 de 95</td>', 4) == 10
+    # Última página mais curta: nada a buscar depois dela
+    assert calcular_ultima_pagina('<td>Resultados 81 a 83 de 83</td>', 9) == 9
+    assert calcular_ultima_pagina('<td>Nenhum resultado</td>', 1) is None
+
+def test_fetch_respeita_limite_por_host_e_reporta_falhas():
+    ativos = []
+    pico = []
+    lock = threading.Lock()
+
+    def fetch_page(page_num):
+        with lock:
+            ativos.append(page_num)
+            pico.append(len(ativos))
+        time.sleep(0.01)
+        with lock:
+            ativos.remove(page_num)
+        if page_num == 5:
+            raise ValueError('erro na página')
+        return page_num * 10
+
+    fanout = PageFanout('https://fanout-test.local/cdje', max_workers=8, max_per_host=2)
+    resultados, falhas = fanout.fetch(range(2, 9), fetch_page)
+
+    assert max(pico) <= 2
+    assert sorted(resultados) == [2, 3, 4, 6, 7, 8]
+    assert resultados[4] == 40
+    assert falhas == {5: 'erro na página'}
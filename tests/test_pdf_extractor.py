@@ -0,0 +1,113 @@
+import pytest
+from unittest.mock import MagicMock, Mock
+import pdfplumber
+import requests
+from app.infrastructure.scraping import pdf_extractor
+from app.infrastructure.scraping.pdf_extractor import (
+    PdfTextExtractor, PdfTooLargeError, download_pdf, extract_pdf_text
+)
+
+def _minimal_pdf(*pages):
+    """PDF mínimo com uma página (Helvetica) por texto informado"""
+    n = len(pages)
+    kids = ' '.join(f'{4 + 2 * i} 0 R' for i in range(n))
+    objs = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * i} 0 R "
+                    f"/Resources << /Font << /F1 3 0 R >> >> >>".encode())
+        objs.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+def _session(content, headers=None, status_code=200):
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.headers = headers or {}
+    response.iter_content.return_value = [content[i:i + 10] for i in range(0, len(content), 10)]
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=Mock(status_code=status_code))
+    session = Mock()
+    session.get.return_value = response
+    return session
+
+def test_extract_pdf_text_le_da_memoria():
+    assert extract_pdf_text(_minimal_pdf("RPV INSS")) == "RPV INSS"
+
+def test_extract_pdf_text_extrai_apenas_o_bloco_do_processo():
+    conteudo = _minimal_pdf(
+        "Processo 1111111-11.2024.8.26.0001 outro",
+        "Processo 1234567-89.2024.8.26.0001 RPV INSS",
+        "Valor principal bruto R$ 1.000,00 Processo 2222222-22.2024.8.26.0001",
+        "Processo 3333333-33.2024.8.26.0001 fim",
+    )
+    
+    texto = extract_pdf_text(conteudo, numero_processo='1234567-89.2024.8.26.0001')
+    
+    assert '1234567-89.2024.8.26.0001 RPV INSS' in texto
+    assert 'Valor principal bruto' in texto
+    assert '1111111-11' not in texto
+    assert '3333333-33' not in texto
+
+def test_extract_pdf_text_sem_o_processo_usa_texto_completo():
+    conteudo = _minimal_pdf("pagina um", "pagina dois")
+    
+    assert extract_pdf_text(conteudo, numero_processo='1234567-89.2024.8.26.0001') == "pagina um\npagina dois"
+
+def test_extract_pdf_text_sem_o_processo_le_cada_pagina_uma_vez(monkeypatch):
+    conteudo = _minimal_pdf("pagina um", "pagina dois", "pagina tres")
+    original = pdfplumber.page.Page.extract_text
+    extraidas = []
+    
+    def extract_text(page, *args, **kwargs):
+        extraidas.append(page.page_number)
+        return original(page, *args, **kwargs)
+    
+    monkeypatch.setattr(pdfplumber.page.Page, 'extract_text', extract_text)
+    # Pré-varredura com falso positivo na página 2: o texto dela não tem o processo
+    monkeypatch.setattr(pdf_extractor, 'page_mentions', lambda page, needle: page.page_number == 2)
+    texto = extract_pdf_text(conteudo, numero_processo='1234567-89.2024.8.26.0001')
+    
+    assert texto == "pagina um\npagina dois\npagina tres"
+    assert sorted(extraidas) == [1, 2, 3]
+
+def test_download_pdf_respeita_limite_de_tamanho():
+    with pytest.raises(PdfTooLargeError):
+        download_pdf(_session(b"x" * 100), 'https://dje/doc.pdf', max_bytes=50)
+    with pytest.raises(PdfTooLargeError):
+        download_pdf(_session(b"x", headers={'Content-Length': '1000'}), 'https://dje/doc.pdf', max_bytes=50)
+
+def test_extractor_extrai_texto_e_notifica_download():
+    conteudo = _minimal_pdf("Requisicao de Pequeno Valor")
+    baixados = []
+    extractor = PdfTextExtractor(max_workers=1, session=_session(conteudo))
+    try:
+        texto = extractor.submit('https://dje/doc.pdf', on_download=lambda url, c: baixados.append(url)).result()
+    finally:
+        extractor.close()
+    
+    assert texto == "Requisicao de Pequeno Valor"
+    assert baixados == ['https://dje/doc.pdf']
+
+def test_extractor_nao_repete_erros_4xx():
+    session = _session(b"", status_code=404)
+    extractor = PdfTextExtractor(session=session, backoff=0)
+    try:
+        assert extractor.extract('https://dje/doc.pdf') == ""
+    finally:
+        extractor.close()
+    
+    assert session.get.call_count == 1
@@ -0,0 +1,71 @@
+from unittest.mock import Mock, patch
+import pytest
+import redis
+import requests
+from app.infrastructure.scraping.politeness import PolitenessScheduler, classificar_erro
+
+URL = 'https://dje.tjsp.jus.br/cdje/consultaAvancada.do'
+
+def _scheduler(acquire_results=('0',), **kwargs):
+    client = Mock()
+    acquire, release = Mock(side_effect=list(acquire_results)), Mock()
+    client.register_script.side_effect = [acquire, release]
+    return PolitenessScheduler(client, **kwargs), acquire, release
+
+def _http_error(status):
+    response = Mock(status_code=status)
+    return requests.HTTPError(f'{status}', response=response)
+
+def test_classificar_erro():
+    assert classificar_erro(_http_error(503)) == 'erro'
+    assert classificar_erro(_http_error(429)) == 'erro'
+    assert classificar_erro(_http_error(404)) == 'neutro'
+    assert classificar_erro(requests.Timeout('lento demais')) == 'erro'
+
+def test_estado_por_host():
+    scheduler, acquire, _ = _scheduler()
+
+    scheduler.acquire(URL)
+
+    assert acquire.call_args.kwargs['keys'] == ['juscash:politeness:dje.tjsp.jus.br', 'juscash:politeness:dje.tjsp.jus.br:leases']
+
+@patch('app.infrastructure.scraping.politeness.time.sleep')
+def test_acquire_espera_token_e_vaga(sleep):
+    scheduler, acquire, _ = _scheduler(['0.5', '-1', '0'], poll_interval=0.1)
+
+    assert scheduler.acquire(URL)
+    assert acquire.call_count == 3
+    assert [c.args[0] for c in sleep.call_args_list] == [0.5, 0.1]
+
+def test_slot_sucesso_aumenta_e_erro_reduz():
+    scheduler, _, release = _scheduler(['0', '0'])
+
+    with scheduler.slot(URL):
+        pass
+    with pytest.raises(requests.HTTPError):
+        with scheduler.slot(URL):
+            raise _http_error(502)
+
+    assert [c.kwargs['args'][1] for c in release.call_args_list] == ['ok', 'erro']
+
+@patch('app.infrastructure.scraping.politeness.time.monotonic')
+def test_slot_lento_conta_como_congestionamento(monotonic):
+    monotonic.side_effect = [0, 100, 130]
+    scheduler, _, release = _scheduler(latency_target=10.0, max_wait=300.0)
+
+    with scheduler.slot(URL):
+        pass
+
+    assert release.call_args.kwargs['args'][1] == 'lento'
+
+def test_sem_redis_segue_sem_limite():
+    client = Mock()
+    script = Mock(side_effect=redis.ConnectionError('down'))
+    client.register_script.return_value = script
+    scheduler = PolitenessScheduler(client)
+    executou = []
+
+    with scheduler.slot(URL):
+        executou.append(True)
+
+    assert executou == [True]
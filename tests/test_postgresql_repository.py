@@ -69,6 +69,30 @@ def test_search_by_content(repository, sample_publicacoes):
     assert len(results) == 1
     assert results[0].numero_processo == "1234567-89.2024.1.01.0002"
 
+def test_search_ranked_with_headline(repository, sample_publicacoes):
+    """Testa busca full-text: acentos, radicais, relevância e trechos destacados"""
+    for pub in sample_publicacoes:
+        repository.create(pub)
+    
+    # Sem acento e no plural ainda encontra "benefício previdenciário"
+    hits = repository.search("beneficios previdenciarios")
+    assert len(hits) == 1
+    assert hits[0].publicacao.numero_processo == "1234567-89.2024.1.01.0003"
+    assert "<mark>" in hits[0].trecho
+    
+    # Resultados vêm da maior para a menor relevância
+    hits = repository.search("Silva")
+    assert {hit.publicacao.numero_processo for hit in hits} == {
+        "1234567-89.2024.1.01.0001",
+        "1234567-89.2024.1.01.0002",
+    }
+    assert hits[0].rank >= hits[1].rank > 0
+    
+    # Número do processo exato e filtro de status
+    assert len(repository.search("1234567-89.2024.1.01.0002")) == 1
+    assert repository.search("Instituto", status="lida")[0].publicacao.status == "lida"
+    assert repository.search("Instituto -INSS")[0].publicacao.numero_processo == "1234567-89.2024.1.01.0002"
+
 def test_find_by_date_range(repository, sample_publicacoes):
     """Testa busca por intervalo de datas"""
     for pub in sample_publicacoes:
@@ -116,6 +140,45 @@ def test_pagination(repository, sample_publicacoes):
     results = repository.find_by_status('nova', limit=3)
     assert len(results) == 3
 
+def test_keyset_pagination(repository, sample_publicacoes):
+    """Percorre todas as páginas pelo cursor sem repetir nem pular linhas"""
+    for i, pub in enumerate(sample_publicacoes * 4):  # 12 publicações
+        pub.numero_processo = f"proc-{i:03d}"
+        repository.create(pub)
+    
+    vistos = []
+    cursor = None
+    while True:
+        pagina, cursor = repository.find_page(limit=5, cursor=cursor)
+        vistos.extend(p.id for p in pagina)
+        if cursor is None:
+            break
+    
+    assert len(vistos) == 12
+    assert vistos == [p.id for p in repository.find_all()]
+    
+    pagina, cursor = repository.find_page(status='nova', limit=10)
+    assert len(pagina) == 4
+    assert cursor is None
+
+def test_find_projection(repository, sample_publicacoes):
+    """Testa listagem só com as colunas pedidas"""
+    for pub in sample_publicacoes:
+        repository.create(pub)
+    
+    rows, next_cursor = repository.find_projection(('numero_processo', 'status'), status="nova")
+    assert next_cursor is None
+    assert [row['numero_processo'] for row in rows] == ["1234567-89.2024.1.01.0001"]
+    assert 'conteudo_completo' not in rows[0]
+    
+    rows, next_cursor = repository.find_projection(('numero_processo',), limit=2, cursor='')
+    assert len(rows) == 2 and next_cursor
+    rows, next_cursor = repository.find_projection(('numero_processo',), limit=2, cursor=next_cursor)
+    assert len(rows) == 1 and next_cursor is None
+    
+    with pytest.raises(ValueError):
+        repository.find_projection(('numero_processo', 'search_vector'))
+
 def test_numeric_precision(repository):
     """Testa precisão dos valores monetários no PostgreSQL"""
     publicacao = Publicacao(
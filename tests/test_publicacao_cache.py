@@ -0,0 +1,141 @@
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import Mock
+import redis
+from app.domain.entities.publicacao import Publicacao
+from app.domain.entities.upsert_result import UpsertResult
+from app.infrastructure.repositories.cached_publicacao_repository import CachedPublicacaoRepository, PublicacaoReadCache
+
+def _redis_em_memoria():
+    store = {}
+    client = Mock()
+    client.get.side_effect = lambda key: store.get(key)
+    
+    def set(key, value, ex=None, nx=False):
+        if not (nx and key in store):
+            store[key] = value
+    
+    client.set.side_effect = set
+    pipe = client.pipeline.return_value
+    pipe.set.side_effect = set
+    pipe.incr.side_effect = lambda key: store.__setitem__(key, int(store.get(key, 0)) + 1)
+    pipe.delete.side_effect = lambda key: store.pop(key, None)
+    return client, store
+
+def _publicacao(**kwargs):
+    dados = dict(
+        id=1,
+        numero_processo="1234567-89.2024.1.01.0001",
+        data_disponibilizacao=datetime(2024, 10, 1),
+        autores="João da Silva",
+        advogados="Dr. José Santos",
+        conteudo_completo="Conteúdo",
+        valor_principal_bruto=10000.5,
+        status="nova",
+        created_at=datetime(2024, 10, 1, 10, 30),
+        updated_at=datetime(2024, 10, 1, 10, 30)
+    )
+    dados.update(kwargs)
+    return Publicacao(**dados)
+
+def _repositorio():
+    client, store = _redis_em_memoria()
+    banco = Mock()
+    banco.collection_version.return_value = '1:2024-10-01T10:30:00'
+    return CachedPublicacaoRepository(banco, PublicacaoReadCache(client)), banco, store
+
+def test_find_by_id_le_do_banco_uma_vez():
+    repository, banco, _ = _repositorio()
+    banco.find_by_id.return_value = _publicacao()
+
+    primeira = repository.find_by_id(1)
+    segunda = repository.find_by_id(1)
+
+    assert banco.find_by_id.call_count == 1
+    assert segunda == primeira
+
+def test_projecao_volta_do_cache_com_tipos_originais():
+    repository, banco, store = _repositorio()
+    linha = {'id': 1, 'created_at': datetime(2024, 10, 1), 'valor_principal_bruto': Decimal('10.50')}
+    banco.find_projection.return_value = ([linha], 'cursor')
+
+    repository.find_projection(('valor_principal_bruto',), status='nova', limit=10)
+    rows, next_cursor = repository.find_projection(('valor_principal_bruto',), status='nova', limit=10)
+
+    assert banco.find_projection.call_count == 1
+    assert rows == [linha] and next_cursor == 'cursor'
+    # Outro formato de consulta é outra chave
+    repository.find_projection(('valor_principal_bruto',), status='nova', limit=20)
+    assert banco.find_projection.call_count == 2
+
+def test_payload_grande_e_comprimido():
+    cache = PublicacaoReadCache(Mock())
+    raw = cache._dumps({'texto': 'x' * 5000})
+
+    assert raw[:1] == b'z' and len(raw) < 500
+    assert cache._loads(raw) == {'texto': 'x' * 5000}
+
+def test_update_invalida_status_antigo_e_novo_e_o_id():
+    repository, banco, _ = _repositorio()
+    banco.count_by_status.return_value = {'nova': 1}
+    banco.find_projection.return_value = ([], None)
+    banco.find_by_id.return_value = _publicacao(status='nova')
+    banco.update.return_value = _publicacao(status='lida')
+
+    repository.count_by_status()
+    repository.find_projection(('id',), status='nova')
+    repository.find_projection(('id',), status='processada')
+    repository.find_by_id(1)
+    repository.update(_publicacao(status='lida'))
+    repository.count_by_status()
+    repository.find_projection(('id',), status='nova')
+    repository.find_projection(('id',), status='processada')
+    repository.find_by_id(1)
+
+    assert banco.count_by_status.call_count == 2
+    # Só a listagem de 'nova' foi afetada
+    assert [c.kwargs['status'] for c in banco.find_projection.call_args_list] == ['nova', 'processada', 'nova']
+    # Uma leitura para o status anterior no update e outra depois da invalidação
+    assert banco.find_by_id.call_count == 3
+
+def test_create_many_sem_novas_nao_invalida():
+    repository, banco, store = _repositorio()
+    banco.create_many.return_value = UpsertResult(existentes=2)
+
+    repository.create_many([_publicacao(), _publicacao()])
+
+    assert store == {}
+
+def test_versao_do_escopo_muda_so_com_escrita_no_escopo():
+    client, _ = _redis_em_memoria()
+    cache = PublicacaoReadCache(client)
+    nova, lida = cache.scope_version('nova'), cache.scope_version('lida')
+
+    assert cache.scope_version('nova') == nova
+    cache.invalidate(['nova'])
+    assert cache.scope_version('nova') == nova + 1
+    assert cache.scope_version('lida') == lida
+
+def test_lista_em_cache_acompanha_a_versao_do_banco():
+    repository, banco, _ = _repositorio()
+    banco.find_projection.return_value = ([], None)
+
+    repository.find_projection(('id',), status='nova')
+    # Escrita fora do repositório com cache: só o banco percebe
+    banco.collection_version.return_value = '2:2024-10-02T08:00:00'
+    assert repository.collection_version('nova') == '2:2024-10-02T08:00:00'
+    repository.find_projection(('id',), status='nova')
+
+    assert banco.find_projection.call_count == 2
+
+def test_redis_indisponivel_le_do_banco():
+    client = Mock()
+    client.get.side_effect = redis.ConnectionError('down')
+    banco = Mock()
+    banco.count_by_status.return_value = {'nova': 3}
+
+    repository = CachedPublicacaoRepository(banco, PublicacaoReadCache(client))
+
+    assert repository.count_by_status() == {'nova': 3}
+    assert repository.count_by_status() == {'nova': 3}
+    assert banco.count_by_status.call_count == 2
@@ -75,4 +75,35 @@ def test_delete_publicacao(repository, sample_publicacao):
     assert result is True
     
     found = repository.find_by_id(created.id)
-    assert found is None 
\ No newline at end of file
+    assert found is None
+
+
+def test_create_many_ignora_existentes(repository, sample_publicacao):
+    repository.create(sample_publicacao)
+    nova = Publicacao(
+        numero_processo="7654321-89.2024.1.01.0001",
+        data_disponibilizacao=datetime(2024, 10, 1),
+        autores="Maria Souza",
+        advogados="Dr. José Santos",
+        conteudo_completo="Outra publicação"
+    )
+    
+    resultado = repository.create_many([sample_publicacao, nova, nova])
+    
+    assert [p.numero_processo for p in resultado.novas] == [nova.numero_processo]
+    assert resultado.existentes == 2
+    assert resultado.erros == 0
+
+def test_upsert_many_atualiza_sem_mudar_status(repository, sample_publicacao):
+    created = repository.create(sample_publicacao)
+    created.status = "lida"
+    repository.update(created)
+    sample_publicacao.autores = "João da Silva Filho"
+    
+    resultado = repository.upsert_many([sample_publicacao])
+    
+    assert resultado.novas == []
+    assert len(resultado.atualizadas) == 1
+    atualizada = repository.find_by_numero_processo(sample_publicacao.numero_processo)
+    assert atualizada.autores == "João da Silva Filho"
+    assert atualizada.status == "lida"
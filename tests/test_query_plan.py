@@ -0,0 +1,58 @@
+from datetime import datetime
+import pytest
+from app.tasks.query_plan import QueryPlan, QueryUnit, merge_unit_results, parse_cadernos, parse_queries
+
+def test_units_combina_cadernos_consultas_e_fatias():
+    plan = QueryPlan(['-11', '12', '-11'], ['inss', 'fazenda'], datetime(2024, 10, 1), datetime(2024, 10, 2, 23, 59, 59))
+
+    units = plan.units()
+
+    assert len(units) == 2 * 2 * 2
+    assert units[0] == QueryUnit('-11', 'inss', datetime(2024, 10, 1), datetime(2024, 10, 1, 23, 59, 59))
+    assert len({unit.id for unit in units}) == len(units)
+
+def test_plano_sem_consultas_e_invalido():
+    with pytest.raises(ValueError):
+        QueryPlan(['-11'], [], datetime(2024, 10, 1), datetime(2024, 10, 1))
+
+def test_plano_e_unidade_sobrevivem_a_serializacao():
+    plan = QueryPlan(['-11'], ['inss'], datetime(2024, 10, 1), datetime(2024, 10, 3), shard_days=2)
+    unit = plan.units()[1]
+
+    assert QueryPlan.from_dict(plan.to_dict()).units() == plan.units()
+    assert QueryUnit.from_dict(unit.to_dict()) == unit
+
+def test_parse_de_cadernos_e_consultas():
+    assert parse_cadernos(' -11, 12 ,') == ['-11', '12']
+    assert parse_queries('"instituto nacional do seguro social" E inss; rpv ') == [
+        '"instituto nacional do seguro social" E inss', 'rpv'
+    ]
+    assert parse_queries(None) == []
+
+def test_merge_deduplica_por_numero_processo():
+    resultados = [
+        {'total_extraido': 2, 'novas': 2, 'existentes': 0, 'erros': 0, 'unidade': 'a',
+         'numeros_processo': ['0001', '0002']},
+        {'total_extraido': 2, 'novas': 1, 'existentes': 1, 'erros': 0, 'unidade': 'b',
+         'numeros_processo': ['0002', '0003']},
+    ]
+
+    consolidado = merge_unit_results(resultados)
+
+    assert consolidado['total_extraido'] == 4
+    assert consolidado['novas'] == 3
+    assert consolidado['processos_distintos'] == 3
+    assert consolidado['duplicados_entre_unidades'] == 1
+    assert [u['unidade'] for u in consolidado['unidades']] == ['a', 'b']
+    assert 'numeros_processo' not in consolidado['unidades'][0]
+
+def test_merge_lista_unidades_com_falha():
+    resultados = [
+        {'total_extraido': 1, 'novas': 1, 'existentes': 0, 'erros': 0, 'unidade': 'a', 'numeros_processo': ['0001']},
+        {'total_extraido': 0, 'novas': 0, 'existentes': 0, 'erros': 0, 'unidade': 'b', 'status': 'falha', 'erro': 'timeout'},
+    ]
+
+    consolidado = merge_unit_results(resultados)
+
+    assert consolidado['unidades_com_falha'] == ['b']
+    assert consolidado['novas'] == 1
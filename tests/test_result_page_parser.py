@@ -0,0 +1,53 @@
+from bs4 import BeautifulSoup
+from app.infrastructure.scraping.result_page_parser import parse_result_page
+
+PAGINA = """
+<html><head><script>document.getElementById('divResultadosInferior');</script></head><body>
+<div id="divResultadosSuperior"><a onclick="trocaDePg(3);">Próximo&gt;</a></div>
+<div id="divResultadosInferior"><table>
+  <tr class="fundocinza1"><td><table>
+    <tr class="ementaClass"><td><a onclick="consultaSimples.do?cdVolume=1">Publicação 01/10/2024</a></td></tr>
+    <tr class="ementaClass2"><td>Processo 0001234-56.2024.8.26.0053 -
+      <b>Requerente:</b> Maria Souza <!-- comentário --></td></tr>
+  </table></td></tr>
+  <tr class="fundocinza1 destaque"><td><table>
+    <tr class="ementaClass"><td>sem link</td></tr>
+  </table></td></tr>
+</table></div>
+</body></html>
+"""
+
+def test_extrai_linhas_como_registros():
+    pagina = parse_result_page(PAGINA, 2)
+
+    assert pagina.tem_resultados
+    assert len(pagina.rows) == 2
+    assert pagina.rows[0].cabecalho == 'Publicação 01/10/2024'
+    assert pagina.rows[0].onclicks == ('consultaSimples.do?cdVolume=1',)
+    assert pagina.rows[1].cabecalho is None
+    assert pagina.rows[1].conteudo is None
+
+def test_conteudo_igual_ao_get_text_do_beautifulsoup():
+    soup = BeautifulSoup(PAGINA, 'html.parser')
+    esperado = [
+        element.select_one('tr.ementaClass2 td').get_text(strip=True)
+        for element in soup.select('div#divResultadosInferior table tr.fundocinza1')
+        if element.select_one('tr.ementaClass2 td')
+    ]
+
+    assert [row.conteudo for row in parse_result_page(PAGINA).rows if row.conteudo] == esperado
+
+def test_paginacao_antes_da_div_de_resultados():
+    assert parse_result_page(PAGINA, 2).proxima_pagina == 3
+
+def test_proxima_pagina_sem_troca_de_pagina():
+    html = '<div id="divResultadosInferior"><a href="#">Próximo&gt;</a></div>'
+
+    assert parse_result_page(html, 4).proxima_pagina == 5
+
+def test_pagina_sem_div_de_resultados():
+    pagina = parse_result_page('<html><body>Nenhum resultado</body></html>')
+
+    assert not pagina.tem_resultados
+    assert pagina.rows == []
+    assert pagina.proxima_pagina is None
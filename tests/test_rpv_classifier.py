@@ -0,0 +1,51 @@
+from unittest.mock import Mock
+from app.infrastructure.scraping.rpv_classifier import RpvClassifier
+from app.infrastructure.scraping.rpv_extraction import RpvFields
+
+TEXTO_RPV = (
+    "Processo 0001234-56.2024.8.26.0053. Expeça-se Requisição de Pequeno Valor em face do "
+    "Instituto Nacional do Seguro Social - INSS. Valor bruto: R$ 1.000,00. Data: 15/03/2024"
+)
+
+def test_classifica_rpv_completa():
+    classificacao = RpvClassifier().classify(TEXTO_RPV)
+
+    assert classificacao.tem_rpv
+    assert classificacao.tem_obrigatorios
+    assert classificacao.tem_pagamento
+    assert classificacao.tem_processo
+    assert classificacao.tem_valor
+    assert classificacao.tem_data
+    assert classificacao.pontos == 11
+    assert classificacao.e_rpv
+
+def test_termo_contido_em_outro_tambem_conta():
+    # 'valor' só aparece dentro de 'requisição de pequeno valor'
+    classificacao = RpvClassifier().classify("requisição de pequeno valor", RpvFields())
+
+    assert classificacao.tem_rpv
+    assert classificacao.tem_pagamento
+
+def test_exige_dois_termos_obrigatorios():
+    classificacao = RpvClassifier().classify("RPV contra o INSS", RpvFields())
+
+    assert not classificacao.tem_obrigatorios
+    assert classificacao.pontos == 3
+    assert not classificacao.e_rpv
+
+def test_reaproveita_campos_ja_extraidos():
+    extractor = Mock()
+    campos = RpvFields(numero_processo='0001234-56.2024.8.26.0053', valores={'bruto': 10.0})
+
+    classificacao = RpvClassifier(extractor).classify("rpv inss seguro social", campos)
+
+    extractor.extract.assert_not_called()
+    assert classificacao.tem_processo
+    assert classificacao.tem_valor
+    assert classificacao.e_rpv
+
+def test_classifica_lote():
+    classificacoes = RpvClassifier().classify_many([TEXTO_RPV, "Despacho de mero expediente"])
+
+    assert [c.e_rpv for c in classificacoes] == [True, False]
+    assert classificacoes[0].resumo().endswith('| 11/11')
@@ -0,0 +1,63 @@
+from datetime import datetime
+from app.infrastructure.scraping.rpv_extraction import RpvFieldExtractor
+
+TEXTO_RPV = (
+    "Processo nº 0001234-56.2024.8.26.0053 - Requisição de Pequeno Valor\n"
+    "Disponibilizado em: 15/03/2024\n"
+    "Requerente: Maria Silva Santos, CPF 123.456.789-00\n"
+    "Advogado: João Pereira Lima (OAB: 123456/SP)\n"
+    "Valor principal bruto: R$ 12.345,67\n"
+    "Valor líquido: R$ 11.000,00\n"
+    "Juros moratórios: R$ 345,67\n"
+    "Honorários advocatícios: R$ 1.234,56\n"
+    "em face do Instituto Nacional do Seguro Social - INSS"
+)
+
+def test_extrai_todos_os_campos_em_uma_varredura():
+    campos = RpvFieldExtractor().extract(TEXTO_RPV)
+
+    assert campos.numero_processo == '0001234-56.2024.8.26.0053'
+    assert campos.data_disponibilizacao == datetime(2024, 3, 15)
+    assert campos.autor == 'Maria Silva Santos'
+    assert campos.advogado == 'João Pereira Lima (OAB: 123456/SP)'
+    assert campos.valores == {'bruto': 12345.67, 'liquido': 11000.0, 'juros': 345.67, 'honorarios': 1234.56}
+
+def test_texto_sem_campos():
+    campos = RpvFieldExtractor().extract("Despacho sem dados relevantes.")
+
+    assert campos.numero_processo is None
+    assert campos.data_disponibilizacao is None
+    assert campos.autor is None
+    assert campos.advogado is None
+    assert campos.valores == {'bruto': None, 'liquido': None, 'juros': None, 'honorarios': None}
+
+def test_data_invalida_passa_para_o_proximo_padrao():
+    campos = RpvFieldExtractor().extract("Prazo 31/02/2024. Publicado em 1 de abril de 2024")
+
+    assert campos.data_disponibilizacao == datetime(2024, 4, 1)
+
+def test_ultimo_padrao_com_valor_valido_prevalece():
+    # Mesma prioridade dos padrões originais: 'valor executado' vem depois de 'valor bruto'
+    campos = RpvFieldExtractor().extract("Valor bruto: R$ 100,00. Valor executado: R$ 200,00. Total bruto: R$ 2.000.000,00")
+
+    assert campos.valores['bruto'] == 200.0
+
+def test_advogados_por_nome_antes_da_oab_sem_duplicatas():
+    texto = "Ana Paula Souza (OAB: 1111/SP) e Carlos Dias OAB 2222/RJ; Ana Paula Souza (OAB: 1111/SP)"
+
+    campos = RpvFieldExtractor().extract(texto)
+
+    assert campos.advogado == 'Ana Paula Souza (OAB: 1111/SP), Carlos Dias (OAB: 2222/RJ)'
+
+def test_autor_apos_em_favor_de():
+    campos = RpvFieldExtractor().extract("Expeça-se RPV em favor de José Carlos Almeida contra o INSS")
+
+    assert campos.autor == 'José Carlos Almeida'
+
+def test_reaproveita_resultado_do_mesmo_texto():
+    extractor = RpvFieldExtractor()
+
+    primeiro = extractor.extract(TEXTO_RPV)
+
+    assert extractor.extract(TEXTO_RPV) is primeiro
+    assert extractor.extract("outro texto") is not primeiro
@@ -0,0 +1,26 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from app.tasks.query_plan import QueryPlan
+from app.tasks.scraping_tasks import extract_query_unit_task, extract_shard_task
+
+def _chrome_indisponivel():
+    return patch('app.infrastructure.scraping.scraper_factory.create_dje_scraper', side_effect=RuntimeError('Chrome não iniciou'))
+
+@patch('app.tasks.scraping_tasks.create_app', return_value=MagicMock())
+def test_fatia_sem_driver_na_ultima_tentativa_devolve_falha(_create_app):
+    with _chrome_indisponivel():
+        resultado = extract_shard_task.apply(args=('2024-10-01T00:00:00', '2024-10-01T23:59:59'), retries=3).get()
+    
+    assert resultado['status'] == 'falha'
+    assert resultado['erro'] == 'Chrome não iniciou'
+    assert resultado['data_inicio'] == '2024-10-01T00:00:00'
+
+@patch('app.tasks.scraping_tasks.create_app', return_value=MagicMock())
+def test_unidade_sem_driver_na_ultima_tentativa_devolve_falha(_create_app):
+    unit = QueryPlan(cadernos=['12'], queries=['RPV'], data_inicio=datetime(2024, 10, 1), data_fim=datetime(2024, 10, 1)).units()[0]
+    
+    with _chrome_indisponivel():
+        resultado = extract_query_unit_task.apply(args=(unit.to_dict(),), retries=3).get()
+    
+    assert resultado['status'] == 'falha'
+    assert resultado['unidade'] == unit.id
@@ -0,0 +1,102 @@
+from unittest.mock import Mock
+import redis
+from app.infrastructure.scraping.seen_set import ProcessoSeenSet
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.comandos = []
+
+    def setbit(self, key, offset, value):
+        self.comandos.append(('setbit', key, offset, value))
+
+    def getbit(self, key, offset):
+        self.comandos.append(('getbit', key, offset))
+
+    def execute(self):
+        resultados = []
+        for comando in self.comandos:
+            bits = self.client.bits.setdefault(comando[1], set())
+            if comando[0] == 'setbit':
+                bits.add(comando[2])
+                resultados.append(0)
+            else:
+                resultados.append(int(comando[2] in bits))
+        self.comandos = []
+        return resultados
+
+class FakeRedis:
+    """Só os comandos usados pelo filtro, em memória"""
+
+    def __init__(self):
+        self.bits = {}
+        self.hashes = {}
+        self.strings = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hexists(self, key, field):
+        return field in self.hashes.get(key, {})
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    def delete(self, key):
+        self.strings.pop(key, None)
+
+def _seen_set(armazenados, **kwargs):
+    exact_check = Mock(side_effect=lambda numeros: set(numeros) & set(armazenados))
+    return ProcessoSeenSet(FakeRedis(), exact_check, loader=lambda: iter(armazenados), **kwargs), exact_check
+
+def test_parametros_seguem_a_taxa_de_falso_positivo():
+    size, hashes = ProcessoSeenSet.optimal_params(1000, 0.01)
+
+    assert 9500 < size < 9700
+    assert hashes == 7
+
+def test_known_aquece_na_primeira_consulta_e_confirma_no_banco():
+    seen_set, exact_check = _seen_set(['0001234-56.2024.8.26.0053'])
+
+    conhecidos = seen_set.known(['0001234-56.2024.8.26.0053', '0009999-56.2024.8.26.0053'])
+
+    assert conhecidos == {'0001234-56.2024.8.26.0053'}
+    assert seen_set.is_warm()
+    # Só o "talvez visto" vai ao banco; o processo novo é descartado pelo filtro
+    assert exact_check.call_args.args[0] == ['0001234-56.2024.8.26.0053']
+
+def test_known_sem_candidatos_nao_consulta_o_banco():
+    seen_set, exact_check = _seen_set([f'{i:07d}-56.2024.8.26.0053' for i in range(100)])
+    seen_set.warm()
+
+    assert seen_set.known([f'{i:07d}-56.2024.8.26.0001' for i in range(100, 110)]) == set()
+    exact_check.assert_not_called()
+
+def test_taxa_de_falso_positivo_observada():
+    armazenados = [f'{i:07d}-56.2024.8.26.0053' for i in range(2000)]
+    seen_set, _ = _seen_set(armazenados, capacity=2000, error_rate=0.01)
+    seen_set.warm()
+    novos = [f'{i:07d}-56.2024.8.26.0100' for i in range(5000)]
+
+    assert all(seen_set.might_contain_many(armazenados))
+    assert sum(seen_set.might_contain_many(novos)) / len(novos) < 0.03
+
+def test_known_com_redis_indisponivel_usa_so_o_banco():
+    client = Mock()
+    client.hexists.side_effect = redis.ConnectionError('down')
+    exact_check = Mock(return_value={'0001234-56.2024.8.26.0053'})
+    seen_set = ProcessoSeenSet(client, exact_check)
+
+    assert seen_set.known(['0001234-56.2024.8.26.0053', None]) == {'0001234-56.2024.8.26.0053'}
+    exact_check.assert_called_once_with(['0001234-56.2024.8.26.0053'])
+
+def test_known_com_banco_indisponivel_trata_todos_como_novos():
+    seen_set = ProcessoSeenSet(FakeRedis(), Mock(side_effect=RuntimeError('db down')))
+
+    assert seen_set.known(['0001234-56.2024.8.26.0053']) == set()
@@ -0,0 +1,38 @@
+import pytest
+from datetime import datetime
+from app.tasks.shard_planner import plan_date_shards, plan_missing_days
+
+def test_plan_date_shards_por_dia():
+    shards = plan_date_shards(datetime(2024, 10, 1), datetime(2024, 10, 3, 23, 59, 59))
+
+    assert shards == [
+        (datetime(2024, 10, 1), datetime(2024, 10, 1, 23, 59, 59)),
+        (datetime(2024, 10, 2), datetime(2024, 10, 2, 23, 59, 59)),
+        (datetime(2024, 10, 3), datetime(2024, 10, 3, 23, 59, 59)),
+    ]
+
+def test_plan_date_shards_com_varios_dias():
+    shards = plan_date_shards(datetime(2024, 10, 1), datetime(2024, 11, 29, 23, 59, 59), shard_days=7)
+
+    assert len(shards) == 9
+    assert shards[0] == (datetime(2024, 10, 1), datetime(2024, 10, 7, 23, 59, 59))
+    assert shards[-1] == (datetime(2024, 11, 26), datetime(2024, 11, 29, 23, 59, 59))
+
+def test_plan_date_shards_intervalo_invalido():
+    with pytest.raises(ValueError):
+        plan_date_shards(datetime(2024, 10, 2), datetime(2024, 10, 1))
+    with pytest.raises(ValueError):
+        plan_date_shards(datetime(2024, 10, 1), datetime(2024, 10, 2), shard_days=0)
+
+def test_plan_missing_days_ignora_dias_ja_cobertos():
+    cobertos = [
+        (datetime(2024, 10, 1), datetime(2024, 10, 2, 23, 59, 59)),
+        (datetime(2024, 10, 4, 8), datetime(2024, 10, 4, 18)),
+    ]
+
+    pendentes = plan_missing_days(datetime(2024, 10, 1), datetime(2024, 10, 4, 23, 59, 59), cobertos)
+
+    assert pendentes == [
+        (datetime(2024, 10, 3), datetime(2024, 10, 3, 23, 59, 59)),
+        (datetime(2024, 10, 4), datetime(2024, 10, 4, 23, 59, 59)),
+    ]
@@ -0,0 +1,47 @@
+import pytest
+from unittest.mock import Mock
+from selenium.common.exceptions import TimeoutException
+from app.infrastructure.scraping.wait_engine import WaitEngine
+
+def test_wait_for_registra_tempos_por_label():
+    engine = WaitEngine()
+    driver = Mock()
+    driver.execute_script.return_value = "complete"
+
+    engine.wait_for_document_ready(driver, 'carregamento')
+    engine.wait_for_document_ready(driver, 'carregamento')
+
+    stats = engine.stats()['carregamento']
+    assert stats['count'] == 2
+    assert stats['timeouts'] == 0
+    assert 'carregamento: 2x' in engine.resumo()
+
+def test_timeout_adaptativo_apos_amostras():
+    engine = WaitEngine(default_timeout=30, min_timeout=5, max_timeout=60, min_samples=3)
+    assert engine.timeout_for('resultados') == 30
+
+    for _ in range(3):
+        engine._record('resultados', 0.5)
+
+    assert engine.timeout_for('resultados') == 5
+
+    for _ in range(20):
+        engine._record('resultados', 20)
+
+    assert 30 < engine.timeout_for('resultados') <= 60
+
+def test_wait_for_timeout_e_contabilizado():
+    engine = WaitEngine(poll_frequency=0.01)
+    driver = Mock()
+
+    with pytest.raises(TimeoutException):
+        engine.wait_for(driver, lambda d: False, 'nunca', timeout=0.05)
+
+    assert engine.stats()['nunca']['timeouts'] == 1
+
+def test_wait_for_new_window_retorna_handle_novo():
+    engine = WaitEngine()
+    driver = Mock()
+    driver.window_handles = ['principal', 'nova']
+
+    assert engine.wait_for_new_window(driver, ['principal']) == 'nova'